@@ -1,27 +1,61 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError
 from uuid import UUID
 from app.database import get_db
-from app.core.security import decode_access_token
+from app.core.security import decode_access_token, decode_profiling_token
+from app.core.tracing import span
 from app.models.user import User, UserRole
+from app.services.auth_service import AuthService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
-    credentials_exception = HTTPException(
+    return _get_user_from_token(db, token)
+
+
+def get_current_user_for_stream(
+    db: Session = Depends(get_db),
+    header_token: Optional[str] = Depends(oauth2_scheme_optional),
+    ticket: Optional[str] = Query(None, description="Single-use ticket from POST /bookings/events/ticket (EventSource cannot send headers)")
+) -> User:
+    # Access tokens are never accepted in the URL, where they end up in
+    # proxy logs and browser history; EventSource clients use a ticket
+    if header_token or not ticket:
+        user = _get_user_from_token(db, header_token)
+    else:
+        with span("auth.ticket"):
+            user = AuthService(db).redeem_stream_ticket(ticket)
+        if user is None:
+            raise _credentials_exception()
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _get_user_from_token(db: Session, token: Optional[str]) -> User:
+    credentials_exception = _credentials_exception()
+    
+    if not token:
+        raise credentials_exception
     
-    payload = decode_access_token(token)
+    with span("auth.jwt"):
+        payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
     
@@ -34,7 +68,8 @@ def get_current_user(
     except (ValueError, TypeError):
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_uuid).first()
+    with span("auth.user"):
+        user = db.query(User).filter(User.id == user_uuid).first()
     if user is None:
         raise credentials_exception
     
@@ -56,3 +91,15 @@ def require_role(required_role: UserRole):
             )
         return current_user
     return role_checker
+
+
+def require_profiling_token(
+    token: Optional[str] = Header(None, alias="X-Profile-Token", description="Token from profile_token.py")
+) -> dict:
+    payload = decode_profiling_token(token) if token else None
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid X-Profile-Token is required"
+        )
+    return payload
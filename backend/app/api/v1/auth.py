@@ -8,33 +8,38 @@ from app.schemas.token import Token, TokenRefresh
 from app.services.auth_service import AuthService
 from app.services.demo_service import DemoService
 from app.core.config import settings
+from app.core.compression import no_compression
+from app.core.threadpool import cpu_bound
+from app.core.tracing import TracedRoute
 import logging
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TracedRoute)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@cpu_bound
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user (Customer or Maid)
     """
     try:
-        logger.info(f"Registration attempt: email={user_data.email}, role={user_data.role}")
         auth_service = AuthService(db)
         user = auth_service.register_user(user_data)
-        logger.info(f"Registration successful: user_id={user.id}, email={user.email}")
         return user
     except ValueError as e:
-        logger.error(f"Registration error: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Unexpected error during registration: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during registration: %s", e, exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Registration failed")
 
 
 @router.post("/login", response_model=Token)
+@no_compression
+@cpu_bound
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -86,6 +91,8 @@ def get_demo_credentials(db: Session = Depends(get_db)):
 
 
 @router.post("/demo/login", response_model=Token)
+@no_compression
+@cpu_bound
 def demo_login(
     role: str = "customer",
     db: Session = Depends(get_db)
@@ -119,7 +126,7 @@ def demo_login(
     user = auth_service.authenticate_user(email, password)
     
     if not user:
-        logger.error(f"Demo login failed for role: {role}")
+        logger.error("Demo login failed for role: %s", role)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Demo account authentication failed"
@@ -131,7 +138,7 @@ def demo_login(
         expires_delta=access_token_expires
     )
     
-    logger.info(f"Demo login successful: role={role}, email={email}")
+    logger.info("Demo login successful: role=%s, email=%s", role, email)
     
     return {
         "access_token": access_token,
@@ -141,6 +148,7 @@ def demo_login(
 
 
 @router.post("/refresh", response_model=Token)
+@no_compression
 def refresh_token(
     token_data: TokenRefresh,
     db: Session = Depends(get_db)
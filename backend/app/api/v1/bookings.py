@@ -1,14 +1,26 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 from app.database import get_db
-from app.schemas.booking import BookingCreate, BookingResponse, BookingUpdate
+from app.schemas.booking import (
+    BookingBulkStatusResponse,
+    BookingBulkStatusUpdate,
+    BookingCreate,
+    BookingResponse,
+    BookingUpdate,
+)
+from app.schemas.token import StreamTicketResponse
+from app.services.auth_service import AuthService
 from app.services.booking_service import BookingService
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, get_current_user_for_stream
+from app.core.config import settings
+from app.core.events import booking_events
+from app.core.idempotency import IdempotentRoute
 from app.models.user import User
 
-router = APIRouter(prefix="/bookings", tags=["Bookings"])
+router = APIRouter(prefix="/bookings", tags=["Bookings"], route_class=IdempotentRoute)
 
 
 @router.post("", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
@@ -27,17 +39,83 @@ def create_booking(
 
 @router.get("/my-bookings", response_model=List[BookingResponse])
 def get_my_bookings(
+    include_archived: bool = Query(False, description="Include completed and canceled bookings older than the archive horizon"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get all bookings for current user (Customer or Maid)
+    Get bookings for current user (Customer or Maid).
+    Completed and canceled bookings older than the archive horizon are left
+    out unless include_archived is set.
     """
     booking_service = BookingService(db)
-    bookings = booking_service.get_user_bookings(current_user.id, current_user.role)
+    bookings = booking_service.get_user_bookings(
+        current_user.id, current_user.role, include_archived=include_archived
+    )
     return bookings
 
 
+@router.post("/events/ticket", response_model=StreamTicketResponse)
+def create_stream_ticket(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Single-use ticket for opening GET /bookings/events with EventSource,
+    which cannot send the Authorization header. Request a new ticket for
+    every (re)connection.
+    """
+    ticket = AuthService(db).issue_stream_ticket(current_user)
+    return {"ticket": ticket, "expires_in": settings.SSE_TICKET_TTL_SECONDS}
+
+
+@router.get("/events")
+async def stream_booking_events(
+    request: Request,
+    last_event_id: Optional[str] = Query(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_user_for_stream),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-Sent Events stream of booking changes for the current user.
+    Authenticates with the Authorization header or, for EventSource clients,
+    a `ticket` query parameter from POST /bookings/events/ticket, and resumes
+    from `Last-Event-ID` (header or query) after a reconnect.
+    """
+    # Release the pooled connection before the long-lived stream starts
+    db.close()
+    
+    return StreamingResponse(
+        booking_events.stream(
+            str(current_user.id),
+            last_event_id_header or last_event_id,
+            request.is_disconnected,
+            heartbeat_seconds=settings.SSE_HEARTBEAT_SECONDS,
+            retry_ms=settings.SSE_RETRY_MS,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/bulk-status", response_model=BookingBulkStatusResponse)
+def bulk_update_booking_status(
+    bulk_update: BookingBulkStatusUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Accept, decline or complete several bookings at once (Maid only).
+    Returns a per-booking result instead of failing the whole batch.
+    """
+    booking_service = BookingService(db)
+    results = booking_service.bulk_update_status(
+        current_user, bulk_update.booking_ids, bulk_update.status
+    )
+    return {"results": results}
+
+
 @router.get("/{booking_id}", response_model=BookingResponse)
 def get_booking_detail(
     booking_id: UUID,
@@ -1,14 +1,17 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from app.database import get_db
-from app.schemas.user import UserResponse
+from app.schemas.user import UserPublicProfile, UserResponse
+from app.schemas.maid_stats import MaidStatsResponse
 from app.services.maid_service import MaidService
+from app.services.maid_stats_service import MaidStatsService
 from app.api.deps import get_current_active_user
 from app.models.user import User, UserRole
+from app.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/maids", tags=["Maids"])
+router = APIRouter(prefix="/maids", tags=["Maids"], route_class=TracedRoute)
 
 
 @router.get("", response_model=List[UserResponse])
@@ -30,15 +33,34 @@ def browse_maids(
         )
     
     maid_service = MaidService(db)
-    maids = maid_service.search_maids(
+    payload = maid_service.search_maids_json(
         skill=skill,
         min_experience=min_experience,
         max_rate=max_rate
     )
-    return maids
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get("/{maid_id}", response_model=UserResponse)
+@router.get("/me/stats", response_model=MaidStatsResponse)
+def get_my_stats(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Booking totals, earnings by week/month, acceptance rate and
+    average response time for the current maid
+    """
+    if current_user.role != UserRole.MAID:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only maids can view booking stats"
+        )
+    
+    stats_service = MaidStatsService(db)
+    return stats_service.get_stats(current_user.id)
+
+
+@router.get("/{maid_id}", response_model=UserPublicProfile)
 def get_maid_profile(
     maid_id: UUID,
     current_user: User = Depends(get_current_active_user),
@@ -55,5 +77,4 @@ def get_maid_profile(
         )
     
     maid_service = MaidService(db)
-    maid = maid_service.get_maid_by_id(maid_id)
-    return maid
+    return maid_service.get_maid_profile(maid_id)
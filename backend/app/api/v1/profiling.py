@@ -0,0 +1,50 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from app.api.deps import require_profiling_token
+from app.core.profiling import request_profiler
+
+# Only mounted when PROFILING_ENABLED is set
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["Admin"],
+    dependencies=[Depends(require_profiling_token)],
+)
+
+
+@router.get("")
+def get_profiles(top: int = Query(20, ge=1, le=200)):
+    """
+    Profiled routes with their request counts and top functions,
+    by self samples and by total (inclusive) samples
+    """
+    return {
+        "stats": request_profiler.get_stats(),
+        "routes": request_profiler.get_summary(top),
+    }
+
+
+@router.get("/collapsed", response_class=PlainTextResponse)
+def download_collapsed_stacks(
+    route: Optional[str] = Query(None, description='e.g. "GET /api/v1/bookings/my-bookings"; all routes if omitted')
+):
+    """
+    Collapsed stacks for flamegraph.pl, speedscope or inferno
+    """
+    if route is not None and route not in request_profiler.routes():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No profiles for this route"
+        )
+    return PlainTextResponse(
+        request_profiler.collapsed(route),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed.txt"'},
+    )
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+def reset_profiles():
+    """
+    Drop all collected profiles
+    """
+    request_profiler.reset()
@@ -1,14 +1,21 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from app.database import get_db
-from app.schemas.review import ReviewCreate, ReviewResponse
+from app.schemas.review import (
+    MaidReviewsPage,
+    ReviewCheckBatch,
+    ReviewCheckBatchResponse,
+    ReviewCreate,
+    ReviewResponse,
+)
 from app.services.review_service import ReviewService
 from app.api.deps import get_current_active_user
+from app.core.idempotency import IdempotentRoute
 from app.models.user import User
 
-router = APIRouter(prefix="/reviews", tags=["Reviews"])
+router = APIRouter(prefix="/reviews", tags=["Reviews"], route_class=IdempotentRoute)
 
 
 @router.post("", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
@@ -25,14 +32,20 @@ def create_review(
     return review
 
 
-@router.get("/maid/{maid_id}", response_model=List[ReviewResponse])
-def get_maid_reviews(maid_id: UUID, db: Session = Depends(get_db)):
+@router.get("/maid/{maid_id}", response_model=MaidReviewsPage)
+def get_maid_reviews(
+    maid_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_db)
+):
     """
-    Get all reviews for a specific maid
+    Get reviews for a specific maid, newest first.
+    The first page includes the rating summary (count, average, star histogram).
     """
     review_service = ReviewService(db)
-    reviews = review_service.get_maid_reviews(maid_id)
-    return reviews
+    payload = review_service.get_maid_reviews_json(maid_id, limit, cursor)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/check/{booking_id}")
@@ -46,11 +59,21 @@ def check_review_exists(
     This endpoint returns 200 status to avoid console errors
     """
     review_service = ReviewService(db)
-    try:
-        review_service.get_booking_review(booking_id, current_user)
-        return {"exists": True}
-    except HTTPException:
-        return {"exists": False}
+    return {"exists": review_service.review_exists(booking_id, current_user.id)}
+
+
+@router.post("/check-batch", response_model=ReviewCheckBatchResponse)
+def check_reviews_exist(
+    check: ReviewCheckBatch,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Check which of up to 100 bookings the current user has reviewed, in one query
+    """
+    review_service = ReviewService(db)
+    reviewed = review_service.get_reviewed_booking_ids(check.booking_ids, current_user.id)
+    return {"exists": {booking_id: booking_id in reviewed for booking_id in check.booking_ids}}
 
 
 @router.get("/booking/{booking_id}", response_model=ReviewResponse)
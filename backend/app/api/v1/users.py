@@ -2,12 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from app.database import get_db
-from app.schemas.user import UserResponse, UserUpdate
+from app.schemas.user import UserBatchRequest, UserBatchResponse, UserPublicProfile, UserResponse, UserUpdate
 from app.services.user_service import UserService
 from app.api.deps import get_current_active_user
 from app.models.user import User
+from app.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=TracedRoute)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -32,13 +33,28 @@ def update_current_user_profile(
     return updated_user
 
 
-@router.get("/{user_id}", response_model=UserResponse)
+@router.post("/batch", response_model=UserBatchResponse)
+def get_users_batch(
+    batch: UserBatchRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get up to 100 public profiles in one request, in the order requested.
+    Unknown ids are listed in `missing`. Contact details are not included.
+    """
+    user_service = UserService(db)
+    users, missing = user_service.get_public_profiles(batch.ids)
+    return {"users": users, "missing": missing}
+
+
+@router.get("/{user_id}", response_model=UserPublicProfile)
 def get_user_by_id(user_id: UUID, db: Session = Depends(get_db)):
     """
-    Get user profile by ID (public view)
+    Get user profile by ID (public view, without contact details)
     """
     user_service = UserService(db)
-    user = user_service.get_user_by_id(user_id)
+    user = user_service.get_public_profile(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -0,0 +1,82 @@
+"""
+Bounded per-worker LRU cache with TTL.
+Used for read models that are hot, small and cheap to invalidate, such as
+public profiles. Entries are not shared between workers; the TTL bounds
+how stale another worker's copy can get after an invalidation.
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+import threading
+import time
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    LRU cache with a per-entry TTL and hit/miss counters.
+    Thread-safe: services call it from the threadpool.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics for monitoring."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else None,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+# Public profile cache (GET /users/{id}, GET /maids/{id})
+profile_cache = TTLCache(
+    max_entries=settings.PROFILE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PROFILE_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,214 @@
+"""
+Circuit breaker around the database engine.
+
+While the database (e.g. the Supabase pooler) is unreachable, every
+request would otherwise wait out pre-ping, the connect timeout and
+DB_POOL_TIMEOUT before failing. The breaker watches connection and
+statement outcomes on the engine and stops handing out connections once
+too many fail:
+
+- closed: normal operation. Outcomes are counted over the last
+  DB_BREAKER_WINDOW_SECONDS; at least DB_BREAKER_MIN_CALLS outcomes with a
+  failure rate of DB_BREAKER_FAILURE_RATE or more opens the breaker.
+- open: pool checkout raises DatabaseUnavailable (503 with Retry-After)
+  immediately, for DB_BREAKER_OPEN_SECONDS.
+- half-open: one checkout per DB_BREAKER_PROBE_INTERVAL is let through
+  as a trial. DB_BREAKER_PROBE_SUCCESSES successful statements close the
+  breaker; a failure opens it again.
+
+Only infrastructure errors count as failures (OperationalError and
+InterfaceError, including disconnects), not integrity errors or
+statements cancelled by a request deadline.
+"""
+from collections import deque
+from typing import Optional
+import logging
+import math
+import threading
+import time
+
+from fastapi import HTTPException, status
+from sqlalchemy import event, exc
+from app.core.config import settings
+from app.core.deadlines import QUERY_CANCELED, DeadlineQueuePool
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class DatabaseUnavailable(HTTPException):
+    def __init__(self, retry_after: float):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open breaker fed by engine events."""
+
+    def __init__(self, enabled: bool = True, failure_rate: float = 0.5, min_calls: int = 10,
+                 window_seconds: float = 10.0, open_seconds: float = 15.0,
+                 probe_interval: float = 1.0, probe_successes: int = 2):
+        self.enabled = enabled
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.probe_interval = probe_interval
+        self.probe_successes = probe_successes
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        # One [second, calls, failures] bucket per second of the window
+        self._buckets: deque = deque()
+        self._opened_at = 0.0
+        self._last_probe = 0.0
+        self._probe_ok = 0
+        self._times_opened = 0
+        self._rejected = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    # Admission
+
+    def before_call(self) -> None:
+        """Raise DatabaseUnavailable unless a connection may be used now."""
+        if not self.enabled or self._state == CLOSED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and now - self._last_probe >= self.probe_interval:
+                self._last_probe = now
+                return
+            self._rejected += 1
+            retry_after = (
+                self._opened_at + self.open_seconds - now
+                if self._state == OPEN else self.probe_interval
+            )
+        raise DatabaseUnavailable(retry_after)
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_ok = 0
+            self._last_probe = 0.0
+            logger.info("Database circuit breaker half-open; probing")
+
+    # Outcomes
+
+    def record_success(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_ok += 1
+                if self._probe_ok >= self.probe_successes:
+                    self._state = CLOSED
+                    self._buckets.clear()
+                    logger.warning("Database circuit breaker closed; database is reachable again")
+            elif self._state == CLOSED:
+                self._bucket(time.monotonic())[1] += 1
+
+    def record_failure(self, error: BaseException) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            message = str(error).strip().splitlines()
+            self._last_error = f"{type(error).__name__}: {message[0] if message else ''}"
+            if self._state == HALF_OPEN:
+                self._open(now)
+            elif self._state == CLOSED:
+                bucket = self._bucket(now)
+                bucket[1] += 1
+                bucket[2] += 1
+                calls, failures = self._totals()
+                if calls >= self.min_calls and failures / calls >= self.failure_rate:
+                    self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._times_opened += 1
+        self._buckets.clear()
+        logger.error(
+            "Database circuit breaker open for %ss after: %s", self.open_seconds, self._last_error
+        )
+
+    def _bucket(self, now: float) -> list:
+        second = int(now)
+        while self._buckets and self._buckets[0][0] <= second - self.window_seconds:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        return self._buckets[-1]
+
+    def _totals(self) -> tuple:
+        return sum(b[1] for b in self._buckets), sum(b[2] for b in self._buckets)
+
+    def install(self, engine) -> None:
+        """Feed statement and connection outcomes on `engine` into the breaker."""
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            self.record_success()
+
+        @event.listens_for(engine, "handle_error")
+        def _handle_error(exception_context):
+            original = exception_context.original_exception
+            if getattr(original, "pgcode", None) == QUERY_CANCELED:
+                return  # a request deadline, not an unhealthy database
+            if exception_context.is_disconnect or isinstance(
+                exception_context.sqlalchemy_exception, (exc.OperationalError, exc.InterfaceError)
+            ):
+                self.record_failure(original)
+
+    def get_stats(self) -> dict:
+        """Get breaker state for /health and /metrics."""
+        state = self.state
+        with self._lock:
+            calls, failures = self._totals()
+            return {
+                "enabled": self.enabled,
+                "state": state,
+                "open_for_seconds": (
+                    round(max(0.0, self._opened_at + self.open_seconds - time.monotonic()), 1)
+                    if state == OPEN else None
+                ),
+                "window": {"calls": calls, "failures": failures},
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+                "last_error": self._last_error,
+            }
+
+
+class BreakerQueuePool(DeadlineQueuePool):
+    """Pool that refuses checkouts while the database circuit breaker is open."""
+
+    def connect(self):
+        db_circuit_breaker.before_call()
+        return super().connect()
+
+
+# Global breaker for the application engine
+db_circuit_breaker = CircuitBreaker(
+    enabled=settings.DB_BREAKER_ENABLED,
+    failure_rate=settings.DB_BREAKER_FAILURE_RATE,
+    min_calls=settings.DB_BREAKER_MIN_CALLS,
+    window_seconds=settings.DB_BREAKER_WINDOW_SECONDS,
+    open_seconds=settings.DB_BREAKER_OPEN_SECONDS,
+    probe_interval=settings.DB_BREAKER_PROBE_INTERVAL,
+    probe_successes=settings.DB_BREAKER_PROBE_SUCCESSES,
+)
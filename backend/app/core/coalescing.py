@@ -0,0 +1,107 @@
+"""
+Single-flight request coalescing for hot, identical reads.
+
+Concurrent calls with the same key share one execution: the first caller
+runs the function and the others wait for its result, or its exception,
+instead of each taking a pooled connection and running the same query.
+Nothing is kept after the call completes; this is not a cache.
+
+Results are shared between requests, so they must be immutable and
+independent of the session that produced them (serialized JSON bytes,
+Pydantic models), and keys must carry every input the result depends
+on. Reads whose result depends on the caller pass `scope` (the user
+id) so they are only ever shared between that user's requests.
+
+Services run in the threadpool, so waiters block on a threading.Event.
+Callers end their session's transaction before `do`, so a waiting request
+holds no pooled connection; only the leader checks one out. A follower
+waits at most `wait_timeout` and never past its request deadline.
+"""
+from typing import Any, Callable, Dict, Hashable, Optional
+import threading
+
+from app.core.config import settings
+from app.core.deadlines import check_deadline, remaining
+from app.core.tracing import span
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-safe single-flight group with per-name counters."""
+
+    def __init__(self, enabled: bool = True, wait_timeout: float = 30.0):
+        self.enabled = enabled
+        self.wait_timeout = wait_timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def do(self, name: str, key: Hashable, fn: Callable[[], Any], scope: Optional[Hashable] = None) -> Any:
+        """Run `fn`, or wait for the identical in-flight call and return its result."""
+        if not self.enabled:
+            return fn()
+        flight_key = (name, scope, key)
+        with self._lock:
+            stats = self._stats.setdefault(name, {"executions": 0, "coalesced": 0, "errors": 0, "timeouts": 0})
+            call = self._calls.get(flight_key)
+            leader = call is None
+            if leader:
+                call = self._calls[flight_key] = _Call()
+                stats["executions"] += 1
+            else:
+                call.waiters += 1
+                stats["coalesced"] += 1
+
+        if not leader:
+            timeout = self.wait_timeout
+            left = remaining()
+            if left is not None:
+                timeout = max(0.0, min(timeout, left))
+            with span("coalesced.wait"):
+                finished = call.done.wait(timeout)
+            if not finished:
+                with self._lock:
+                    call.waiters -= 1
+                    stats["timeouts"] += 1
+                check_deadline("coalesced.wait")
+                # Leader is stuck; don't make every follower share its fate
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[flight_key]
+            call.done.set()
+
+    def get_stats(self) -> dict:
+        """Get coalescing statistics for monitoring."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "in_flight": len(self._calls),
+                "waiting": sum(call.waiters for call in self._calls.values()),
+                "by_name": {name: dict(counters) for name, counters in self._stats.items()},
+            }
+
+
+# Global single-flight group for service reads
+read_coalescer = SingleFlight(enabled=settings.COALESCING_ENABLED)
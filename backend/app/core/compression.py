@@ -0,0 +1,208 @@
+"""
+gzip / brotli response compression.
+
+CompressionMiddleware compresses buffered (Content-Length) responses of
+compressible types at or above COMPRESSION_MIN_SIZE bytes, choosing brotli
+or gzip from Accept-Encoding. Streaming responses (SSE) pass through.
+
+Compressed bodies are kept in a small LRU keyed by a digest of the
+uncompressed body and the encoding. A hot payload served to many clients,
+such as the maid list, is compressed once. Hashing the body costs far less
+than compressing it again. ETags aren't used as keys: they are only unique
+per resource, and two routes may well produce the same one.
+
+Bodies of COMPRESSION_THREAD_MIN_SIZE bytes or more are hashed and
+compressed on a worker thread, so one large list response doesn't stall
+every other connection on the event loop; smaller ones are compressed
+inline, where a thread hop would cost more than the compression.
+
+Routes opt out with the `@no_compression` decorator (applied below the
+route decorator), e.g. endpoints returning tokens, which shouldn't be
+compressed next to attacker-controlled input (BREACH).
+
+Brotli is optional: without the `brotli` package only gzip is offered.
+"""
+from typing import Callable, List, Optional
+import gzip
+import hashlib
+import threading
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.tracing import span
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+MAX_CACHED_BODY = 256 * 1024
+
+
+def no_compression(endpoint: Callable) -> Callable:
+    """Never compress this route's responses."""
+    endpoint.__no_compression__ = True
+    return endpoint
+
+
+def _parse_accept_encoding(header: str) -> dict:
+    """Encoding -> q-value from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+class Compressor:
+    """Encoding negotiation, compression and the compressed-body cache."""
+
+    def __init__(self, min_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 cache_entries: int = 512, cache_ttl_seconds: int = 300,
+                 thread_min_size: int = 64 * 1024):
+        self.min_size = min_size
+        self.thread_min_size = thread_min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings: List[str] = (["br"] if brotli is not None else []) + ["gzip"]
+        self.cache = TTLCache(max_entries=cache_entries, ttl_seconds=cache_ttl_seconds)
+        self._lock = threading.Lock()
+        self._compressed = 0
+        self._offloaded = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Preferred encoding the client accepts (brotli first on ties), or None."""
+        if not accept_encoding:
+            return None
+        accepted = _parse_accept_encoding(accept_encoding)
+        best, best_q = None, 0.0
+        for encoding in self.encodings:
+            q = accepted.get(encoding, accepted.get("*", 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.sha256(body).digest(), encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            with span(f"compress.{encoding}"):
+                if encoding == "br":
+                    compressed = brotli.compress(body, quality=self.brotli_quality)
+                else:
+                    compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+            if len(body) <= MAX_CACHED_BODY:
+                self.cache.set(key, compressed)
+        with self._lock:
+            self._compressed += 1
+            self._bytes_in += len(body)
+            self._bytes_out += len(compressed)
+        return compressed
+
+    async def compress_async(self, body: bytes, encoding: str) -> bytes:
+        """compress() from the event loop; large bodies go to a worker thread."""
+        if len(body) < self.thread_min_size:
+            return self.compress(body, encoding)
+        with self._lock:
+            self._offloaded += 1
+        return await anyio.to_thread.run_sync(self.compress, body, encoding)
+
+    def get_stats(self) -> dict:
+        """Get compression statistics for monitoring."""
+        return {
+            "encodings": self.encodings,
+            "min_size": self.min_size,
+            "thread_min_size": self.thread_min_size,
+            "responses_compressed": self._compressed,
+            "compressed_in_thread": self._offloaded,
+            "bytes_in": self._bytes_in,
+            "bytes_out": self._bytes_out,
+            "ratio": round(self._bytes_out / self._bytes_in, 3) if self._bytes_in else None,
+            "cache": self.cache.get_stats(),
+        }
+
+
+def _compressible(message: Message, min_size: int) -> bool:
+    headers = MutableHeaders(scope=message)
+    content_type = headers.get("content-type", "")
+    length = headers.get("content-length")
+    return (
+        message["status"] not in (204, 304)
+        and "content-encoding" not in headers
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+        and length is not None
+        and int(length) >= min_size
+    )
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, compressor: Optional[Compressor] = None):
+        self.app = app
+        self.compressor = compressor or response_compressor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.compressor.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if getattr(scope.get("endpoint"), "__no_compression__", False):
+                    await send(message)
+                    return
+                if headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+                    headers.add_vary_header("Accept-Encoding")
+                if encoding is None or not _compressible(message, self.compressor.min_size):
+                    await send(message)
+                    return
+                start = message  # hold until the whole body is in
+                return
+
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = MutableHeaders(scope=start)
+            compressed = await self.compressor.compress_async(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+
+# Global compressor instance
+response_compressor = Compressor(
+    min_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    cache_entries=settings.COMPRESSION_CACHE_ENTRIES,
+    thread_min_size=settings.COMPRESSION_THREAD_MIN_SIZE,
+)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 import logging
 
@@ -37,6 +37,91 @@ class Settings(BaseSettings):
     RATE_LIMIT_REQUESTS: int = 100  # requests per window
     RATE_LIMIT_WINDOW: int = 60  # window in seconds
     
+    # Bookings partitioning (see partition_maintenance.py)
+    BOOKING_ARCHIVE_HORIZON_MONTHS: int = 12  # history older than this is archived/hidden by default
+    BOOKING_PARTITION_PREMAKE_MONTHS: int = 3  # monthly partitions created ahead of time
+    
+    # Idempotency-Key support for POST /bookings and POST /reviews
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000  # per-worker in-memory cache
+    IDEMPOTENCY_WAIT_SECONDS: float = 4  # duplicate's wait on the in-flight request; below the route deadlines
+    
+    # Logging (see app/core/logging_config.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json"
+    LOG_QUEUE_SIZE: int = 10000  # records beyond this are dropped, never block a request
+    LOG_SAMPLING: Dict[str, float] = {}  # e.g. {"app.api.v1.auth": 0.1}; INFO and below only
+    LOG_WARNING_RATE_LIMIT: int = 10  # WARNING+ records per call site per window (0 = unlimited)
+    LOG_WARNING_RATE_WINDOW: int = 60
+    
+    # Single-flight coalescing of identical concurrent public reads
+    COALESCING_ENABLED: bool = True
+    
+    # Threads for sync endpoints (see app/core/threadpool.py); 0 = derived default
+    THREADPOOL_SIZE: int = 0  # I/O routes and dependencies; 0 = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    THREADPOOL_AUTH_SIZE: int = 0  # Argon2 routes (@cpu_bound); 0 = CPU count
+    
+    # Database circuit breaker (see app/core/circuit_breaker.py)
+    DB_BREAKER_ENABLED: bool = True
+    DB_BREAKER_FAILURE_RATE: float = 0.5  # failed share of connections/statements that opens it
+    DB_BREAKER_MIN_CALLS: int = 10  # outcomes needed in the window before it can open
+    DB_BREAKER_WINDOW_SECONDS: float = 10.0
+    DB_BREAKER_OPEN_SECONDS: float = 15.0  # fail fast this long before probing
+    DB_BREAKER_PROBE_INTERVAL: float = 1.0  # one trial checkout per interval while half-open
+    DB_BREAKER_PROBE_SUCCESSES: int = 2  # successful trial statements that close it
+    
+    # Request deadlines (see app/core/deadlines.py): seconds per path prefix,
+    # optionally "METHOD /prefix"; longest match wins, 0 = no deadline
+    REQUEST_TIMEOUT_SECONDS: float = 30.0
+    ROUTE_TIMEOUTS: Dict[str, float] = {
+        "/api/v1/maids": 5.0,
+        "/api/v1/reviews": 5.0,
+        "/api/v1/users": 5.0,
+        "/api/v1/auth": 10.0,
+        "/api/v1/bookings": 10.0,
+        "/api/v1/bookings/events": 0,
+    }
+    
+    # Cross-worker cache invalidation. PostgreSQL uses LISTEN/NOTIFY; other
+    # databases fall back to Unix datagram sockets in this directory ("" disables)
+    INVALIDATION_SOCKET_DIR: str = "/tmp/maidease-invalidation"
+    
+    # Response compression (brotli needs the optional `brotli` package)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies aren't worth the CPU
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11; 4 is about gzip-6 speed with smaller output
+    COMPRESSION_CACHE_ENTRIES: int = 512  # compressed bodies kept per worker
+    COMPRESSION_THREAD_MIN_SIZE: int = 65536  # bytes; larger bodies are compressed off the event loop
+    
+    # Worker startup (see app/core/startup.py)
+    STARTUP_WARM_CONNECTIONS: int = 5  # pooled connections opened before /ready reports ready
+    STARTUP_RETRY_SECONDS: float = 2.0
+    
+    # Request tracing: Server-Timing header on every response, and a sample
+    # of traces appended to TRACE_FILE as OTLP/JSON lines (0 disables)
+    SERVER_TIMING_ENABLED: bool = True
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_FILE: str = "traces.jsonl"
+    
+    # Request profiling (off by default; when off the middleware isn't installed).
+    # Profiles PROFILING_SAMPLE_RATE of requests plus any request carrying an
+    # X-Profile-Token signed with PROFILING_SECRET (see profile_token.py)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_SECRET: Optional[str] = None
+    PROFILING_INTERVAL_MS: float = 5.0  # stack sampling interval
+    
+    # Public profile cache (per worker)
+    PROFILE_CACHE_MAX_ENTRIES: int = 5000
+    PROFILE_CACHE_TTL_SECONDS: int = 60
+    
+    # Server-Sent Events (booking status stream)
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_RETRY_MS: int = 3000  # client reconnection delay
+    SSE_REPLAY_SIZE: int = 50  # events kept per user for Last-Event-ID replay
+    SSE_TICKET_TTL_SECONDS: int = 30  # single-use stream tickets (EventSource URL)
+    
     # Demo Account Configuration
     DEMO_CUSTOMER_EMAIL: str = "demo.customer@maidease.com"
     DEMO_MAID_EMAIL: str = "demo.maid@maidease.com"
@@ -62,9 +147,9 @@ if cors_env:
     # Handle both comma-separated and single values
     cors_urls = [url.strip() for url in cors_env.split(",") if url.strip()]
     settings.BACKEND_CORS_ORIGINS = cors_urls
-    logger.info(f"Loaded CORS origins from CORS_ORIGINS: {cors_urls}")
+    logger.info("Loaded CORS origins from CORS_ORIGINS: %s", cors_urls)
 else:
-    logger.warning(f"CORS_ORIGINS not set, using defaults: {settings.BACKEND_CORS_ORIGINS}")
+    logger.warning("CORS_ORIGINS not set, using defaults: %s", settings.BACKEND_CORS_ORIGINS)
 
-logger.info(f"Final CORS origins configured: {settings.BACKEND_CORS_ORIGINS}")
+logger.info("Final CORS origins configured: %s", settings.BACKEND_CORS_ORIGINS)
 
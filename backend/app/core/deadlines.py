@@ -0,0 +1,215 @@
+"""
+Per-route request deadlines.
+
+DeadlineMiddleware gives each request a time budget: the longest
+ROUTE_TIMEOUTS prefix matching the path (optionally "METHOD /prefix"),
+else REQUEST_TIMEOUT_SECONDS; 0 means no deadline (e.g. the SSE stream).
+The deadline lives in a context variable, so it follows the request into
+the threadpool, and is enforced wherever the request touches the database:
+
+- pool checkout waits at most the remaining budget (DeadlineQueuePool);
+- each transaction on PostgreSQL starts with
+  SET LOCAL statement_timeout = <remaining ms>, so slow queries and lock
+  waits are cancelled by the server;
+- no statement is sent once the deadline has passed.
+
+Expiry raises DeadlineExceeded, a 504 HTTPException, and is counted per
+route in /metrics. Enforcement is cooperative: CPU-bound work that never
+touches the database runs to completion. Cleanup that must succeed after
+a failure (releasing an idempotency claim) runs under `deadline_exempt()`.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import threading
+import time
+
+from fastapi import HTTPException, status
+from sqlalchemy import event, exc
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+from app.core.tracing import TracedQueuePool
+
+# SQLSTATE query_canceled, raised when statement_timeout fires
+QUERY_CANCELED = "57014"
+
+
+class _Deadline(NamedTuple):
+    route: str
+    expires_at: float  # time.monotonic()
+
+
+_deadline: ContextVar[Optional[_Deadline]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded",
+        )
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None without a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline.expires_at - time.monotonic()
+
+
+def check_deadline(stage: str) -> None:
+    """Raise DeadlineExceeded if the current request is out of time."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise expired(stage)
+
+
+def expired(stage: str) -> DeadlineExceeded:
+    """Count an expiry at `stage` and return the exception to raise."""
+    deadline = _deadline.get()
+    deadline_policy.record_expired(deadline.route if deadline else "unknown", stage)
+    return DeadlineExceeded()
+
+
+@contextmanager
+def deadline_exempt():
+    """Run the block without the current request's deadline."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class DeadlinePolicy:
+    """Route -> budget lookup and expiry counters."""
+
+    def __init__(self, default_seconds: float, route_timeouts: Dict[str, float]):
+        self.default_seconds = default_seconds
+        self._rules: List[Tuple[Optional[str], str, float]] = []
+        for rule, seconds in route_timeouts.items():
+            method, _, prefix = rule.rpartition(" ")
+            self._rules.append((method.upper() or None, prefix.rstrip("/"), seconds))
+        # Longest prefix first; a method-specific rule beats a generic one
+        self._rules.sort(key=lambda r: (len(r[1]), r[0] is not None), reverse=True)
+        self._lock = threading.Lock()
+        self._started = 0
+        self._expired: Dict[str, Dict[str, int]] = {}
+
+    def budget_for(self, method: str, path: str) -> Tuple[str, float]:
+        """(route label, seconds) for a request; 0 seconds means no deadline."""
+        for rule_method, prefix, seconds in self._rules:
+            if rule_method is not None and rule_method != method:
+                continue
+            if path == prefix or path.startswith(prefix + "/"):
+                label = f"{rule_method} {prefix}" if rule_method else prefix
+                return label, seconds
+        return "default", self.default_seconds
+
+    def record_started(self) -> None:
+        with self._lock:
+            self._started += 1
+
+    def record_expired(self, route: str, stage: str) -> None:
+        with self._lock:
+            by_stage = self._expired.setdefault(route, {})
+            by_stage[stage] = by_stage.get(stage, 0) + 1
+
+    def get_stats(self) -> dict:
+        """Get deadline statistics for monitoring."""
+        with self._lock:
+            return {
+                "default_seconds": self.default_seconds,
+                "routes": {
+                    (f"{m} {p}" if m else p): seconds for m, p, seconds in self._rules
+                },
+                "requests_with_deadline": self._started,
+                "expired": sum(sum(stages.values()) for stages in self._expired.values()),
+                "expired_by_route": {route: dict(stages) for route, stages in self._expired.items()},
+            }
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp, policy: Optional[DeadlinePolicy] = None):
+        self.app = app
+        self.policy = policy or deadline_policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route, seconds = self.policy.budget_for(scope["method"], scope["path"])
+        if seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+        self.policy.record_started()
+        token = _deadline.set(_Deadline(route, time.monotonic() + seconds))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
+
+
+class DeadlineQueuePool(TracedQueuePool):
+    """Pool whose checkout wait is capped by the request's remaining budget."""
+
+    @property
+    def _timeout(self) -> float:
+        left = remaining()
+        if left is None:
+            return self._pool_timeout
+        return max(0.0, min(self._pool_timeout, left))
+
+    @_timeout.setter
+    def _timeout(self, value: float) -> None:
+        self._pool_timeout = value
+
+    def _do_get(self):
+        check_deadline("db.pool")
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            check_deadline("db.pool")  # timed out because the budget ran out
+            raise
+
+    def recreate(self):
+        # The copy must get the configured timeout, not this request's remainder
+        with deadline_exempt():
+            return super().recreate()
+
+
+def enforce_deadlines(engine) -> None:
+    """Propagate request deadlines into statements executed on `engine`."""
+    postgres = engine.dialect.name == "postgresql"
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        check_deadline("db.query")
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        original = exception_context.original_exception
+        if remaining() is not None and getattr(original, "pgcode", None) == QUERY_CANCELED:
+            return expired("db.statement_timeout")
+
+    if postgres:
+        @event.listens_for(Session, "after_begin")
+        def _after_begin(session, transaction, connection):
+            if connection.engine is not engine:
+                return
+            left = remaining()
+            if left is None:
+                return
+            if left <= 0:
+                raise expired("db.begin")
+            # SET can't take bind parameters; the value is an integer we computed
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
+
+
+# Global policy
+deadline_policy = DeadlinePolicy(
+    default_seconds=settings.REQUEST_TIMEOUT_SECONDS,
+    route_timeouts=settings.ROUTE_TIMEOUTS,
+)
@@ -0,0 +1,230 @@
+"""
+Booking event broker for Server-Sent Events.
+Services publish booking changes inside their transaction; subscribers
+(one per open `/bookings/events` stream) receive them once committed.
+
+With PostgreSQL, events are sent with pg_notify in the writer's transaction
+(NOTIFY is only delivered on commit) and every worker fans them out from the
+LISTEN connection it shares with cache invalidation (app.core.pg_listener). Elsewhere they are delivered in-process from an
+after_commit hook. A short per-user history supports Last-Event-ID replay.
+
+NOTIFY payloads must stay under 8000 bytes, so an event whose data doesn't
+fit (e.g. a booking with long notes) is sent as a `booking.changed` event
+carrying only the booking id, and clients refetch that booking.
+"""
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Optional, Set
+import asyncio
+import json
+import logging
+import threading
+import uuid
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.pg_listener import pg_listener
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "booking_events"
+_PENDING_KEY = "pending_booking_events"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 8000
+
+
+def format_sse(event: dict) -> str:
+    """Serialize an event in text/event-stream format."""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+class _Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.replay: List[dict] = []
+
+
+class BookingEventBroker:
+    """
+    In-process pub/sub keyed by user id, with optional LISTEN/NOTIFY fan-out.
+    Thread-safe: publishers run in the threadpool, subscribers on the event loop.
+    """
+
+    def __init__(self, replay_size: int = 50, max_users: int = 10000, queue_size: int = 100):
+        self.replay_size = replay_size
+        self.max_users = max_users
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[_Subscription]] = {}
+        self._history: "OrderedDict[str, Deque[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._engine = None
+        self._dropped = 0
+
+    # Publishing
+
+    def publish(self, db: Session, event_type: str, data: dict, recipients: List) -> None:
+        """Queue an event on `db`'s transaction. Call before commit."""
+        self.publish_many(db, [(event_type, data, recipients)])
+
+    def publish_many(self, db: Session, events: List[tuple]) -> None:
+        """Queue several (event_type, data, recipients) events in one statement."""
+        payloads = [
+            self._payload(event_type, data, recipients)
+            for event_type, data, recipients in events
+        ]
+        if not payloads:
+            return
+
+        if self._engine is not None:
+            db.execute(
+                text(
+                    "SELECT pg_notify(:channel, payload) "
+                    "FROM unnest(CAST(:payloads AS text[])) AS payload"
+                ),
+                {"channel": NOTIFY_CHANNEL, "payloads": [json.dumps(p) for p in payloads]},
+            )
+        else:
+            db.info.setdefault(_PENDING_KEY, []).extend(payloads)
+
+    @staticmethod
+    def _payload(event_type: str, data: dict, recipients: List) -> dict:
+        payload = {
+            "id": uuid.uuid4().hex,
+            "type": event_type,
+            "data": data,
+            "recipients": [str(r) for r in recipients],
+        }
+        # json.dumps escapes non-ASCII, so its length is the size in bytes
+        if len(json.dumps(payload)) >= MAX_PAYLOAD_BYTES:
+            payload["type"] = "booking.changed"
+            payload["data"] = {"id": data.get("id")}
+        return payload
+
+    def _on_after_commit(self, session: Session) -> None:
+        for payload in session.info.pop(_PENDING_KEY, []):
+            self._dispatch(payload)
+
+    def _on_after_rollback(self, session: Session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+    def _dispatch(self, payload: dict) -> None:
+        event = {"id": payload["id"], "type": payload["type"], "data": payload["data"]}
+        with self._lock:
+            for user_id in payload["recipients"]:
+                history = self._history.get(user_id)
+                if history is None:
+                    history = self._history[user_id] = deque(maxlen=self.replay_size)
+                    if len(self._history) > self.max_users:
+                        self._history.popitem(last=False)
+                else:
+                    self._history.move_to_end(user_id)
+                history.append(event)
+
+                for subscription in self._subscribers.get(user_id, ()):
+                    subscription.loop.call_soon_threadsafe(self._deliver, subscription, event)
+
+    def _deliver(self, subscription: _Subscription, event: dict) -> None:
+        try:
+            subscription.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client; it will resync from Last-Event-ID on reconnect
+            self._dropped += 1
+
+    def _broadcast_resync(self) -> None:
+        """Ask every local subscriber to refetch after a gap in NOTIFY delivery."""
+        event = {"id": uuid.uuid4().hex, "type": "resync", "data": {}}
+        with self._lock:
+            for subscriptions in self._subscribers.values():
+                for subscription in subscriptions:
+                    subscription.loop.call_soon_threadsafe(self._deliver, subscription, event)
+
+    # Subscribing
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str, last_event_id: Optional[str] = None):
+        """
+        Register a subscriber for `user_id`.
+        If `last_event_id` is given, `subscription.replay` holds the events
+        after it, or a single `resync` event if it is no longer in history.
+        """
+        subscription = _Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            if last_event_id:
+                history = list(self._history.get(user_id, ()))
+                ids = [e["id"] for e in history]
+                if last_event_id in ids:
+                    subscription.replay = history[ids.index(last_event_id) + 1:]
+                else:
+                    subscription.replay = [{"id": last_event_id, "type": "resync", "data": {}}]
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(user_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[user_id]
+
+    async def stream(self, user_id: str, last_event_id: Optional[str], is_disconnected,
+                     heartbeat_seconds: float, retry_ms: int):
+        """Async generator producing the text/event-stream body for one client."""
+        async with self.subscribe(user_id, last_event_id) as subscription:
+            yield f"retry: {retry_ms}\n\n"
+            for event in subscription.replay:
+                yield format_sse(event)
+
+            while not await is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield format_sse(event)
+
+    # Cross-worker fan-out
+
+    def start_listener(self, engine) -> None:
+        """Fan out through NOTIFY and the shared LISTEN connection (PostgreSQL only)."""
+        if engine.dialect.name != "postgresql" or self._engine is not None:
+            return
+        self._engine = engine
+        pg_listener.start(engine)
+
+    def stop_listener(self) -> None:
+        if self._engine is not None:
+            pg_listener.stop()
+        self._engine = None
+
+    def _on_notify(self, payload: str) -> None:
+        self._dispatch(json.loads(payload))
+
+    def _on_listener_connect(self, reconnected: bool) -> None:
+        if reconnected:
+            self._broadcast_resync()
+
+    def get_stats(self) -> dict:
+        """Get broker statistics for monitoring."""
+        with self._lock:
+            return {
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+                "users_with_history": len(self._history),
+                "dropped_events": self._dropped,
+                "listener": (
+                    ("listening" if pg_listener.listening else "reconnecting")
+                    if self._engine is not None else "local"
+                ),
+            }
+
+
+# Global broker instance
+booking_events = BookingEventBroker(replay_size=settings.SSE_REPLAY_SIZE)
+
+event.listen(Session, "after_commit", booking_events._on_after_commit)
+event.listen(Session, "after_rollback", booking_events._on_after_rollback)
+pg_listener.register(
+    NOTIFY_CHANNEL, booking_events._on_notify, on_connect=booking_events._on_listener_connect
+)
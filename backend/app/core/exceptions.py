@@ -0,0 +1,46 @@
+"""
+Database error classification.
+
+Services turn the integrity errors they expect (a duplicate email, a booking
+for a maid that doesn't exist) into client errors; anything else is a bug or
+a schema problem and must propagate as a 500. `is_violation` matches an
+IntegrityError on its SQLSTATE and constraint name.
+"""
+from typing import Optional, Tuple
+import re
+
+from sqlalchemy.exc import IntegrityError
+
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+# SQLite reports constraint failures by kind; map them onto SQLSTATEs
+_SQLITE_CODES = {
+    "SQLITE_CONSTRAINT_UNIQUE": UNIQUE_VIOLATION,
+    "SQLITE_CONSTRAINT_PRIMARYKEY": UNIQUE_VIOLATION,
+    "SQLITE_CONSTRAINT_FOREIGNKEY": FOREIGN_KEY_VIOLATION,
+    "SQLITE_CONSTRAINT_NOTNULL": "23502",
+    "SQLITE_CONSTRAINT_CHECK": "23514",
+}
+_SQLITE_UNIQUE_COLUMNS = re.compile(r"UNIQUE constraint failed: (\w+)\.(\w+)$")
+
+
+def violated_constraint(error: IntegrityError) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (SQLSTATE, constraint name) of an integrity error. On SQLite, unique
+    violations get PostgreSQL's default name (<table>_<column>_key) and other
+    constraints have no name.
+    """
+    original = error.orig
+    pgcode = getattr(original, "pgcode", None)
+    if pgcode is not None:
+        return pgcode, getattr(getattr(original, "diag", None), "constraint_name", None)
+    sqlstate = _SQLITE_CODES.get(getattr(original, "sqlite_errorname", None))
+    match = _SQLITE_UNIQUE_COLUMNS.match(str(original))
+    return sqlstate, f"{match.group(1)}_{match.group(2)}_key" if match else None
+
+
+def is_violation(error: IntegrityError, sqlstate: str, constraint: str) -> bool:
+    """Whether `error` violated `constraint` with `sqlstate`; unnamed constraints match on SQLSTATE alone."""
+    code, name = violated_constraint(error)
+    return code == sqlstate and (name is None or name == constraint)
@@ -0,0 +1,347 @@
+"""
+Idempotency-Key support for retried POST requests.
+
+The first response for a (user, key) pair is kept in a bounded in-memory
+cache and mirrored to the idempotency_keys table so every worker can answer
+retries from it without running the endpoint again. A duplicate that arrives
+while the original is still running waits for it instead of racing it:
+in-process on an asyncio.Event, across workers by polling the claim row
+from the event loop (each attempt borrows a thread and a connection only for
+its own statements). The wait ends shortly before the duplicate's own request deadline, so it
+gets a 409 it can retry rather than a 504.
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+import asyncio
+import hashlib
+import time
+from uuid import UUID
+
+import anyio
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, update
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.deadlines import deadline_exempt, remaining
+from app.core.tracing import TracedRoute
+from app.database import SessionLocal, upsert_insert
+from app.models.idempotency import IdempotencyKey
+from app.api.deps import _get_user_from_token, get_current_active_user
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# A waiting duplicate gives up this long before its request deadline
+DEADLINE_MARGIN_SECONDS = 0.5
+
+
+class _Entry(NamedTuple):
+    fingerprint: str
+    status_code: int
+    body: bytes
+    expires_at: float
+
+
+class _KeyInFlight(Exception):
+    """Another request still holds the claim."""
+
+
+class IdempotencyStore:
+    """
+    Bounded LRU of stored responses with a TTL, backed by the database.
+    The in-memory side is only touched from the event loop; database work
+    runs in the threadpool.
+    """
+
+    def __init__(self, ttl_seconds: int = 86400, max_entries: int = 10000,
+                 wait_seconds: float = 4, poll_interval: float = 0.1,
+                 purge_interval_seconds: int = 600):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.wait_seconds = wait_seconds
+        self.poll_interval = poll_interval
+        self.purge_interval_seconds = purge_interval_seconds
+        self._session_factory: Callable = SessionLocal
+        self._entries: "OrderedDict[Tuple[UUID, str], _Entry]" = OrderedDict()
+        self._inflight: Dict[Tuple[UUID, str], asyncio.Event] = {}
+        self._last_purge = 0.0
+        self._replays = 0
+        self._executions = 0
+        self._conflicts = 0
+
+    def configure(self, session_factory: Callable) -> None:
+        """Use a different session factory for the database mirror."""
+        self._session_factory = session_factory
+
+    def _wait_budget(self) -> float:
+        """Seconds a duplicate may wait, ending before the request's deadline."""
+        left = remaining()
+        if left is None:
+            return self.wait_seconds
+        return max(0.0, min(self.wait_seconds, left - DEADLINE_MARGIN_SECONDS))
+
+    def _claim_seconds(self) -> float:
+        """How long a new claim is held: long enough for the owner to finish."""
+        left = remaining()
+        return self.wait_seconds if left is None else max(self.wait_seconds, left)
+
+    # In-memory cache
+
+    def _get(self, cache_key: Tuple[UUID, str]) -> Optional[_Entry]:
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            del self._entries[cache_key]
+            return None
+        self._entries.move_to_end(cache_key)
+        return entry
+
+    def _remember(self, cache_key: Tuple[UUID, str], entry: _Entry) -> None:
+        self._entries[cache_key] = entry
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _replay(self, entry: _Entry, fingerprint: str) -> Response:
+        if entry.fingerprint != fingerprint:
+            self._conflicts += 1
+            return JSONResponse(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                content={"detail": "Idempotency-Key was already used with a different request"},
+            )
+        self._replays += 1
+        return Response(
+            content=entry.body,
+            status_code=entry.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    # Database mirror (runs in the threadpool)
+
+    def _active_user_id(self, token: str) -> Optional[UUID]:
+        """The token's user id if the user exists and is active, as get_current_active_user checks."""
+        with self._session_factory() as db:
+            try:
+                return get_current_active_user(_get_user_from_token(db, token)).id
+            except HTTPException:
+                return None
+
+    def _try_claim(self, user_id: UUID, key: str, fingerprint: str) -> Optional[_Entry]:
+        """
+        Insert an in-flight claim for (user_id, key).
+        Returns None if this request owns the key, or the stored response if
+        the owner has finished; raises _KeyInFlight while it is still running.
+        """
+        while True:
+            now = datetime.now(timezone.utc)
+            with self._session_factory() as db:
+                if time.monotonic() - self._last_purge > self.purge_interval_seconds:
+                    self._last_purge = time.monotonic()
+                    db.execute(
+                        delete(IdempotencyKey).where(IdempotencyKey.expires_at < now),
+                        execution_options={"synchronize_session": False},
+                    )
+
+                # In-flight claims expire once the owner's deadline has passed
+                # so a crashed worker can't block the key until the full TTL
+                claimed = db.scalar(
+                    upsert_insert(db, IdempotencyKey)
+                    .values(
+                        user_id=user_id,
+                        key=key,
+                        fingerprint=fingerprint,
+                        expires_at=now + timedelta(seconds=self._claim_seconds()),
+                    )
+                    .on_conflict_do_nothing(index_elements=["user_id", "key"])
+                    .returning(IdempotencyKey.key)
+                )
+                db.commit()
+                if claimed is not None:
+                    return None
+
+                row = db.get(IdempotencyKey, (user_id, key))
+                if row is not None and _as_utc(row.expires_at) <= now:
+                    db.execute(
+                        delete(IdempotencyKey).where(
+                            IdempotencyKey.user_id == user_id,
+                            IdempotencyKey.key == key,
+                            IdempotencyKey.expires_at <= now,
+                        ),
+                        execution_options={"synchronize_session": False},
+                    )
+                    db.commit()
+                    continue
+                if row is not None and row.status_code is not None:
+                    return _Entry(
+                        fingerprint=row.fingerprint,
+                        status_code=row.status_code,
+                        body=row.response_body.encode(),
+                        expires_at=_as_utc(row.expires_at).timestamp(),
+                    )
+            raise _KeyInFlight()
+
+    def _complete(self, user_id: UUID, key: str, entry: _Entry) -> None:
+        # Runs after the endpoint has committed: it must store the response
+        # even if the deadline expires now, or a retry would run it again
+        with deadline_exempt(), self._session_factory() as db:
+            db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+                .values(
+                    status_code=entry.status_code,
+                    response_body=entry.body.decode(),
+                    expires_at=datetime.fromtimestamp(entry.expires_at, timezone.utc),
+                ),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+
+    def _release(self, user_id: UUID, key: str) -> None:
+        """Drop the claim so a retry runs the request again."""
+        # Also runs after the request's deadline has expired
+        with deadline_exempt(), self._session_factory() as db:
+            db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.status_code.is_(None),
+                ),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+
+    # Request handling
+
+    async def _claim(self, user_id: UUID, key: str, fingerprint: str) -> Optional[_Entry]:
+        """_try_claim, polling until the owner finishes or the wait budget runs out."""
+        deadline = time.monotonic() + self._wait_budget()
+        while True:
+            try:
+                return await run_in_threadpool(self._try_claim, user_id, key, fingerprint)
+            except _KeyInFlight:
+                if time.monotonic() >= deadline:
+                    raise
+            await anyio.sleep(self.poll_interval)
+
+    async def run(self, user_id: UUID, key: str, fingerprint: str, call) -> Response:
+        """Answer from the store, wait on an in-flight duplicate, or run `call`."""
+        cache_key = (user_id, key)
+        while True:
+            entry = self._get(cache_key)
+            if entry is not None:
+                return self._replay(entry, fingerprint)
+            waiter = self._inflight.get(cache_key)
+            if waiter is None:
+                break
+            try:
+                await asyncio.wait_for(waiter.wait(), timeout=self._wait_budget())
+            except asyncio.TimeoutError:
+                return _in_flight_response()
+
+        waiter = self._inflight[cache_key] = asyncio.Event()
+        try:
+            try:
+                stored = await self._claim(user_id, key, fingerprint)
+            except _KeyInFlight:
+                return _in_flight_response()
+            if stored is not None:
+                self._remember(cache_key, stored)
+                return self._replay(stored, fingerprint)
+
+            self._executions += 1
+            try:
+                response = await call()
+            except BaseException:
+                await run_in_threadpool(self._release, user_id, key)
+                raise
+
+            body = getattr(response, "body", None)
+            if response.status_code >= 500 or body is None:
+                # Not a final answer; let the client retry for real
+                await run_in_threadpool(self._release, user_id, key)
+                return response
+
+            entry = _Entry(fingerprint, response.status_code, bytes(body), time.time() + self.ttl_seconds)
+            await run_in_threadpool(self._complete, user_id, key, entry)
+            self._remember(cache_key, entry)
+            return response
+        finally:
+            del self._inflight[cache_key]
+            waiter.set()
+
+    def get_stats(self) -> dict:
+        """Get store statistics for monitoring."""
+        return {
+            "cached_responses": len(self._entries),
+            "in_flight": len(self._inflight),
+            "executions": self._executions,
+            "replays": self._replays,
+            "key_conflicts": self._conflicts,
+        }
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _in_flight_response() -> Response:
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "A request with this Idempotency-Key is still being processed"},
+    )
+
+
+def _bearer_token(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token
+
+
+class IdempotentRoute(TracedRoute):
+    """
+    Route class that honours the Idempotency-Key header on POST endpoints.
+    Requests without the header, or without a bearer token of an active user,
+    run as usual (and fail authentication in the endpoint's dependencies).
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def idempotent_handler(request: Request) -> Response:
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key or request.method != "POST":
+                return await handler(request)
+            if len(key) > MAX_KEY_LENGTH:
+                return JSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"},
+                )
+
+            token = _bearer_token(request)
+            if token is None:
+                return await handler(request)
+            user_id = await run_in_threadpool(idempotency_store._active_user_id, token)
+            if user_id is None:
+                return await handler(request)
+
+            body = await request.body()
+            fingerprint = hashlib.sha256(
+                b"\0".join([request.method.encode(), request.url.path.encode(), body])
+            ).hexdigest()
+            return await idempotency_store.run(user_id, key, fingerprint, lambda: handler(request))
+
+        return idempotent_handler
+
+
+# Global store instance
+idempotency_store = IdempotencyStore(
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+    max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+    wait_seconds=settings.IDEMPOTENCY_WAIT_SECONDS,
+)
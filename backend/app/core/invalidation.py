@@ -0,0 +1,299 @@
+"""
+Cross-worker cache invalidation bus.
+
+Per-worker caches (see app.core.cache) are registered here under a kind,
+e.g. "profile". Services publish invalidations on their session before
+committing. Once the transaction commits, the publishing worker evicts the
+keys itself, and the other workers evict them when the message reaches
+them:
+
+- PostgreSQL: pg_notify in the writer's transaction (delivered only on
+  commit), received by each worker on the LISTEN connection it shares with
+  booking events (app.core.pg_listener). This also reaches workers from
+  scripts such as rebuild_maid_stats.py.
+- Otherwise: Unix datagram sockets, one per process, in
+  INVALIDATION_SOCKET_DIR; publishers send to every socket found there.
+
+Every message carries its send time, so receivers report the observed
+delivery lag. While the listener is disconnected, invalidations can be
+missed; the caches' TTL is then the only staleness bound. Every
+(re)connect therefore flushes all registered caches.
+"""
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache, profile_cache
+from app.core.config import settings
+from app.core.pg_listener import pg_listener
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "cache_invalidation"
+# Keep NOTIFY payloads well under PostgreSQL's 8000 byte limit
+MAX_KEYS_PER_MESSAGE = 100
+
+
+class InvalidationBus:
+    """
+    Routes invalidation messages to the registered caches of every worker.
+    Thread-safe: publishers run in the threadpool, receivers in a listener thread.
+    """
+
+    def __init__(self, socket_dir: str = "", lag_window: int = 100):
+        self.socket_dir = socket_dir
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._caches: Dict[str, tuple] = {}
+        self._pending_key = f"pending_invalidations:{self.origin}"
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._transport = "local"
+        self._connected = False
+        self._disconnected_at: Optional[float] = None
+        self._socket: Optional[socket.socket] = None
+        self._lags: deque = deque(maxlen=lag_window)
+        self._max_lag = 0.0
+        self._published = 0
+        self._received = 0
+        self._full_flushes = 0
+        self._send_errors = 0
+
+    def register(self, kind: str, cache: TTLCache, key_type: Callable = str) -> None:
+        """Evict from `cache` on `kind` invalidations; `key_type` parses keys back from JSON."""
+        self._caches[kind] = (cache, key_type)
+
+    # Publishing
+
+    def publish(self, db: Session, kind: str, keys: Optional[Iterable] = None) -> None:
+        """
+        Invalidate `keys` of `kind` everywhere once `db` commits; no keys
+        flushes the whole cache. Call before commit.
+        """
+        if keys is None:
+            messages = [{"kind": kind, "keys": None}]
+        else:
+            keys = [str(key) for key in keys]
+            messages = [
+                {"kind": kind, "keys": keys[i:i + MAX_KEYS_PER_MESSAGE]}
+                for i in range(0, len(keys), MAX_KEYS_PER_MESSAGE)
+            ]
+            if not messages:
+                return
+
+        if db.get_bind().dialect.name == "postgresql":
+            payloads = [json.dumps(self._envelope(message)) for message in messages]
+            db.execute(
+                text(
+                    "SELECT pg_notify(:channel, payload) "
+                    "FROM unnest(CAST(:payloads AS text[])) AS payload"
+                ),
+                {"channel": NOTIFY_CHANNEL, "payloads": payloads},
+            )
+            # Other workers hear about it from PostgreSQL; only evict locally
+            messages = [{**message, "local_only": True} for message in messages]
+        db.info.setdefault(self._pending_key, []).extend(messages)
+
+    def _envelope(self, message: dict) -> dict:
+        return {**message, "origin": self.origin, "ts": time.time()}
+
+    def _on_after_commit(self, session: Session) -> None:
+        messages = session.info.pop(self._pending_key, None)
+        if not messages:
+            return
+        for message in messages:
+            self._apply(message)
+            if not message.get("local_only"):
+                self._send_to_peers(self._envelope(message))
+        self._published += len(messages)
+
+    def _on_after_rollback(self, session: Session) -> None:
+        session.info.pop(self._pending_key, None)
+
+    # Applying
+
+    def _apply(self, message: dict) -> None:
+        registered = self._caches.get(message["kind"])
+        if registered is None:
+            return
+        cache, key_type = registered
+        if message["keys"] is None:
+            cache.clear()
+            return
+        for key in message["keys"]:
+            try:
+                cache.invalidate(key_type(key))
+            except ValueError:
+                logger.warning("Invalid %s cache key in invalidation: %r", message["kind"], key)
+
+    def _receive(self, payload: str) -> None:
+        message = json.loads(payload)
+        if message.get("origin") == self.origin:
+            return  # applied on commit already
+        lag = max(0.0, time.time() - message.get("ts", time.time()))
+        with self._lock:
+            self._received += 1
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+        self._apply(message)
+
+    def flush_all(self) -> None:
+        """Clear every registered cache, e.g. after missing messages."""
+        for cache, _ in self._caches.values():
+            cache.clear()
+        with self._lock:
+            self._full_flushes += 1
+
+    # Listening
+
+    def start(self, engine) -> None:
+        """Start receiving: LISTEN on PostgreSQL, else the Unix socket. Safe to call more than once."""
+        if self._transport != "local":
+            return
+        if engine.dialect.name == "postgresql":
+            self._transport = "postgresql"
+            self._set_connected(False)
+            pg_listener.start(engine)
+        elif self.socket_dir and hasattr(socket, "AF_UNIX"):
+            self._transport = "unix_socket"
+            self._stop.clear()
+            self._listener = threading.Thread(
+                target=self._listen_socket, name="cache-invalidation-listener", daemon=True
+            )
+            self._listener.start()
+
+    def stop(self) -> None:
+        if self._transport == "postgresql":
+            pg_listener.stop()
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=10)
+        self._listener = None
+        self._transport = "local"
+
+    def _set_connected(self, connected: bool) -> None:
+        with self._lock:
+            self._connected = connected
+            self._disconnected_at = None if connected else time.monotonic()
+
+    def _on_listener_connect(self, reconnected: bool) -> None:
+        self._set_connected(True)
+        self.flush_all()  # anything published while we weren't listening is lost
+
+    def _on_listener_disconnect(self) -> None:
+        self._set_connected(False)
+
+    def _socket_path(self) -> str:
+        return os.path.join(self.socket_dir, f"{self.origin}.sock")
+
+    def _listen_socket(self) -> None:
+        path = self._socket_path()
+        while not self._stop.is_set():
+            try:
+                os.makedirs(self.socket_dir, exist_ok=True)
+                if os.path.exists(path):
+                    os.unlink(path)
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                sock.bind(path)
+                sock.settimeout(1.0)
+                self._socket = sock
+                self._set_connected(True)
+                self.flush_all()
+                try:
+                    while not self._stop.is_set():
+                        try:
+                            self._receive(sock.recv(65536).decode())
+                        except socket.timeout:
+                            continue
+                finally:
+                    self._socket = None
+                    sock.close()
+                    if os.path.exists(path):
+                        os.unlink(path)
+            except Exception as e:
+                logger.warning("Cache invalidation socket failed: %s", e)
+                self._stop.wait(1)
+            finally:
+                self._set_connected(False)
+
+    def _send_to_peers(self, message: dict) -> None:
+        """Send to every other process's socket (non-PostgreSQL deployments)."""
+        if not self.socket_dir or not hasattr(socket, "AF_UNIX"):
+            return
+        try:
+            names = os.listdir(self.socket_dir)
+        except FileNotFoundError:
+            return
+        data = json.dumps(message).encode()
+        own = os.path.basename(self._socket_path())
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            for name in names:
+                if not name.endswith(".sock") or name == own:
+                    continue
+                peer = os.path.join(self.socket_dir, name)
+                try:
+                    sock.sendto(data, peer)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # A worker that exited without cleaning up
+                    try:
+                        os.unlink(peer)
+                    except OSError:
+                        pass
+                except OSError as e:
+                    with self._lock:
+                        self._send_errors += 1
+                    logger.warning("Could not send cache invalidation to %s: %s", name, e)
+
+    def get_stats(self) -> dict:
+        """Get bus statistics for monitoring."""
+        with self._lock:
+            recent = list(self._lags)
+            disconnected_for = (
+                time.monotonic() - self._disconnected_at
+                if self._disconnected_at is not None and self._transport != "local" else None
+            )
+            # Connected: invalidations arrive within the observed lag.
+            # Disconnected or single-process: only the cache TTLs bound staleness.
+            ttl_bound = max((cache.ttl_seconds for cache, _ in self._caches.values()), default=None)
+            bound = round(max(recent), 3) if self._connected and recent else (
+                0.0 if self._connected else ttl_bound
+            )
+            return {
+                "transport": self._transport,
+                "connected": self._connected,
+                "disconnected_seconds": round(disconnected_for, 1) if disconnected_for is not None else None,
+                "published": self._published,
+                "received": self._received,
+                "send_errors": self._send_errors,
+                "full_flushes": self._full_flushes,
+                "lag_ms": {
+                    "last": round(recent[-1] * 1000, 2) if recent else None,
+                    "avg": round(sum(recent) / len(recent) * 1000, 2) if recent else None,
+                    "max": round(self._max_lag * 1000, 2),
+                },
+                "staleness_bound_seconds": bound,
+                "caches": sorted(self._caches),
+            }
+
+
+# Global bus instance
+invalidation_bus = InvalidationBus(socket_dir=settings.INVALIDATION_SOCKET_DIR)
+invalidation_bus.register("profile", profile_cache, key_type=uuid.UUID)
+
+event.listen(Session, "after_commit", invalidation_bus._on_after_commit)
+event.listen(Session, "after_rollback", invalidation_bus._on_after_rollback)
+pg_listener.register(
+    NOTIFY_CHANNEL,
+    invalidation_bus._receive,
+    on_connect=invalidation_bus._on_listener_connect,
+    on_disconnect=invalidation_bus._on_listener_disconnect,
+)
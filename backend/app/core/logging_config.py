@@ -0,0 +1,196 @@
+"""
+Non-blocking logging setup.
+
+Request threads only put records on a bounded queue; a QueueListener thread
+formats them (plain text or JSON lines) and writes them to stdout, so a slow
+stdout pipe never stalls a request. Two filters run before a record is
+queued:
+
+- per-logger sampling of INFO/DEBUG records (LOG_SAMPLING), for chatty
+  loggers on hot paths;
+- rate limiting of WARNING and above per call site
+  (LOG_WARNING_RATE_LIMIT per LOG_WARNING_RATE_WINDOW seconds), so a flood
+  of identical warnings, e.g. rate-limit rejections, doesn't turn into a
+  log flood. The next record let through reports how many were suppressed.
+
+Use lazy `%` formatting (`logger.warning("... %s", value)`): records that
+are filtered out are then never formatted, and the rest are formatted on
+the listener thread.
+"""
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+
+from app.core.config import settings
+from app.core.tracing import current_trace_id
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# LogRecord attributes that aren't `extra=` fields
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "trace_id"}
+
+
+class LogStats:
+    """Counters for /metrics."""
+
+    def __init__(self):
+        self.queued = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.rate_limited = 0
+
+    def get_stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "dropped_queue_full": self.dropped,
+            "sampled_out": self.sampled_out,
+            "rate_limited": self.rate_limited,
+        }
+
+
+log_stats = LogStats()
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", None)
+        return f"{line} [{suppressed} similar suppressed]" if suppressed else line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra=` fields and the request trace id are included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records below WARNING for the configured loggers (and their children)."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._resolved:
+            rate = None
+            prefix = name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._resolved[name] = rate
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate is None or random.random() < rate:
+            return True
+        log_stats.sampled_out += 1
+        return False
+
+
+class RateLimitFilter(logging.Filter):
+    """At most `limit` WARNING+ records per call site per window."""
+
+    def __init__(self, limit: int, window_seconds: float):
+        super().__init__()
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._windows: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.limit <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window is not None else 0
+                window = self._windows[key] = [now, 0, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+            if window[1] >= self.limit:
+                window[2] += 1
+                log_stats.rate_limited += 1
+                return False
+            window[1] += 1
+            if len(self._windows) > 10000:
+                self._windows.clear()
+        return True
+
+
+class _TraceIdFilter(logging.Filter):
+    # Captured on the request thread; the listener thread has no trace context
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = current_trace_id()
+        return True
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same-process queue: hand the record over unformatted and let the
+        # listener thread do the %-formatting and JSON encoding
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            log_stats.queued += 1
+        except queue.Full:
+            log_stats.dropped += 1
+
+
+def setup_logging() -> QueueListener:
+    """Route the root logger through a queue to a stdout writer thread."""
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(TextFormatter(TEXT_FORMAT))
+
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    if settings.LOG_SAMPLING:
+        handler.addFilter(SamplingFilter(settings.LOG_SAMPLING))
+    handler.addFilter(RateLimitFilter(settings.LOG_WARNING_RATE_LIMIT, settings.LOG_WARNING_RATE_WINDOW))
+    if settings.LOG_FORMAT == "json":
+        handler.addFilter(_TraceIdFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,160 @@
+"""
+Shared PostgreSQL LISTEN connection.
+
+Booking events (app.core.events) and cache invalidation (app.core.invalidation)
+both fan out with NOTIFY. Rather than each holding its own LISTEN connection,
+they register their channel here and one thread per worker LISTENs on every
+registered channel over a single dedicated connection, dispatching each
+notification to its channel's handler.
+
+Handlers are registered at import time, before `start`. On every (re)connect
+each channel's `on_connect(reconnected)` runs, so receivers can recover from
+notifications missed while the connection was down; `on_disconnect` runs when
+it drops.
+"""
+from typing import Callable, Dict, NamedTuple, Optional
+import logging
+import select
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Channel(NamedTuple):
+    on_notify: Callable[[str], None]
+    on_connect: Optional[Callable[[bool], None]]
+    on_disconnect: Optional[Callable[[], None]]
+
+
+class PostgresListener:
+    """One LISTEN connection and thread, shared by every registered channel."""
+
+    def __init__(self, poll_seconds: float = 5.0, max_backoff: float = 30):
+        self.poll_seconds = poll_seconds
+        self.max_backoff = max_backoff
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+        self._users = 0
+        self._engine = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._listening = False
+        self._reconnects = 0
+        self._handler_errors = 0
+
+    def register(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_connect: Optional[Callable[[bool], None]] = None,
+        on_disconnect: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Deliver `channel` payloads to `on_notify`. Register before `start`."""
+        self._channels[channel] = _Channel(on_notify, on_connect, on_disconnect)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def listening(self) -> bool:
+        return self._listening
+
+    def start(self, engine) -> None:
+        """
+        Start listening (PostgreSQL only). Each caller that starts the listener
+        should stop it; the thread ends when the last one does.
+        """
+        if engine.dialect.name != "postgresql":
+            return
+        with self._lock:
+            self._users += 1
+            if self._thread is not None:
+                return
+            self._engine = engine
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._listen, name="pg-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                return
+            self._users -= 1
+            if self._users > 0:
+                return
+            thread, self._thread = self._thread, None
+            self._stop.set()
+        thread.join(timeout=10)
+        self._engine = None
+
+    def _listen(self) -> None:
+        backoff = 1
+        reconnected = False
+        while not self._stop.is_set():
+            connection = None
+            try:
+                # Dedicated connection, detached so it doesn't hold a pool slot
+                connection = self._engine.raw_connection()
+                connection.detach()
+                dbapi_conn = connection.driver_connection
+                dbapi_conn.autocommit = True
+                with dbapi_conn.cursor() as cursor:
+                    for channel in self._channels:
+                        cursor.execute(f"LISTEN {channel}")
+                self._listening = True
+                backoff = 1
+                for channel in self._channels.values():
+                    if channel.on_connect is not None:
+                        channel.on_connect(reconnected)
+                logger.info("Listening on channels %s", ", ".join(self._channels))
+
+                while not self._stop.is_set():
+                    if select.select([dbapi_conn], [], [], self.poll_seconds) == ([], [], []):
+                        continue
+                    dbapi_conn.poll()
+                    while dbapi_conn.notifies:
+                        notify = dbapi_conn.notifies.pop(0)
+                        self._handle(notify.channel, notify.payload)
+            except Exception as e:
+                logger.warning("LISTEN connection lost: %s", e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+            finally:
+                if self._listening:
+                    self._listening = False
+                    for channel in self._channels.values():
+                        if channel.on_disconnect is not None:
+                            channel.on_disconnect()
+                if not self._stop.is_set():
+                    reconnected = True
+                    self._reconnects += 1
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _handle(self, channel: str, payload: str) -> None:
+        registered = self._channels.get(channel)
+        if registered is None:
+            return
+        try:
+            registered.on_notify(payload)
+        except Exception:
+            # One bad message shouldn't drop the connection for every channel
+            self._handler_errors += 1
+            logger.exception("Failed to handle notification on channel %s", channel)
+
+    def get_stats(self) -> dict:
+        """Get listener statistics for monitoring."""
+        return {
+            "channels": sorted(self._channels),
+            "state": "listening" if self._listening else ("reconnecting" if self._thread else "stopped"),
+            "reconnects": self._reconnects,
+            "handler_errors": self._handler_errors,
+        }
+
+
+# Global listener, shared by booking events and cache invalidation
+pg_listener = PostgresListener()
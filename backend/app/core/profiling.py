@@ -0,0 +1,269 @@
+"""
+On-demand request profiling with a statistical stack sampler.
+
+ProfilingMiddleware profiles a sample of requests (PROFILING_SAMPLE_RATE)
+and any request carrying a valid X-Profile-Token. While a profiled request
+is running, a background thread samples the stack of the thread doing its
+work every PROFILING_INTERVAL_MS: the event loop thread, or the threadpool
+thread while the (sync) endpoint runs there. Samples are aggregated per
+route into collapsed stacks, which give both the top functions and a
+flamegraph.pl / speedscope compatible download.
+
+The middleware is only installed when PROFILING_ENABLED is set, so a
+disabled profiler costs nothing; the sampler thread only runs while a
+profiled request is in flight.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+import os
+import random
+import sys
+import threading
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILED_HEADER = "X-Profiled"
+MAX_STACK_DEPTH = 128
+# The event loop blocked in its selector: the request is waiting on the
+# threadpool (sync dependencies) or the network, not running Python code
+IDLE_STACK = "[waiting on threadpool or I/O]"
+
+_current_session: ContextVar[Optional["_Session"]] = ContextVar("current_profile", default=None)
+
+
+class _Session:
+    """Samples collected for one profiled request."""
+
+    __slots__ = ("threads", "stacks", "started")
+
+    def __init__(self, thread_id: int):
+        # Innermost thread last; only that one is sampled
+        self.threads: List[int] = [thread_id]
+        self.stacks: Counter = Counter()
+        self.started = time.perf_counter()
+
+
+class _RouteProfile:
+    __slots__ = ("requests", "duration", "stacks")
+
+    def __init__(self):
+        self.requests = 0
+        self.duration = 0.0
+        self.stacks: Counter = Counter()
+
+
+class RequestProfiler:
+    """Per-route aggregation of sampled request stacks."""
+
+    def __init__(self, sample_rate: float = 0.0, interval_ms: float = 5.0, max_routes: int = 200):
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.max_routes = max_routes
+        self._sessions: Dict[int, _Session] = {}
+        self._routes: Dict[str, _RouteProfile] = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def should_profile(self, headers: Headers) -> bool:
+        token = headers.get(PROFILE_TOKEN_HEADER)
+        if token is not None:
+            # Imported here: security -> tracing -> this module
+            from app.core.security import decode_profiling_token
+            return decode_profiling_token(token) is not None
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    # Sessions
+
+    def start(self) -> _Session:
+        session = _Session(threading.get_ident())
+        with self._lock:
+            self._sessions[id(session)] = session
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+                self._thread.start()
+            self._active.set()
+        return session
+
+    def stop(self, session: _Session, route: str) -> None:
+        duration = time.perf_counter() - session.started
+        with self._lock:
+            del self._sessions[id(session)]
+            if not self._sessions:
+                self._active.clear()
+            profile = self._routes.get(route)
+            if profile is None:
+                if len(self._routes) >= self.max_routes:
+                    return
+                profile = self._routes[route] = _RouteProfile()
+            profile.requests += 1
+            profile.duration += duration
+            profile.stacks.update(session.stacks)
+
+    @contextmanager
+    def thread(self):
+        """Sample the current thread, instead of its caller's, for the enclosed block."""
+        session = _current_session.get()
+        if session is None:
+            yield
+            return
+        session.threads.append(threading.get_ident())
+        try:
+            yield
+        finally:
+            session.threads.pop()
+
+    def _sample_loop(self) -> None:
+        while True:
+            self._active.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for session in self._sessions.values():
+                    thread_id = session.threads[-1]
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        session.stacks[_collapse(frame)] += 1
+            del frames
+
+    # Reporting
+
+    def routes(self) -> List[str]:
+        with self._lock:
+            return list(self._routes)
+
+    def get_summary(self, top: int = 20) -> List[dict]:
+        """Per-route request counts and the top functions by self and total samples."""
+        with self._lock:
+            routes = [(route, profile.requests, profile.duration, Counter(profile.stacks))
+                      for route, profile in self._routes.items()]
+
+        summary = []
+        for route, requests, duration, stacks in routes:
+            self_samples: Counter = Counter()
+            total_samples: Counter = Counter()
+            for stack, count in stacks.items():
+                frames = stack.split(";")
+                self_samples[frames[-1]] += count
+                for function in set(frames):
+                    total_samples[function] += count
+            samples = sum(stacks.values())
+            summary.append({
+                "route": route,
+                "requests": requests,
+                "avg_ms": round(duration / requests * 1000, 2),
+                "samples": samples,
+                "interval_ms": self.interval * 1000,
+                "top_self": _top(self_samples, samples, top),
+                "top_total": _top(total_samples, samples, top),
+            })
+        summary.sort(key=lambda entry: entry["samples"], reverse=True)
+        return summary
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """Collapsed stacks (`frame;frame;frame count` lines) for one route or all."""
+        with self._lock:
+            profiles = [self._routes[route]] if route is not None else list(self._routes.values())
+            stacks: Counter = Counter()
+            for profile in profiles:
+                stacks.update(profile.stacks)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def get_stats(self) -> dict:
+        """Get profiler statistics for monitoring."""
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "interval_ms": self.interval * 1000,
+                "in_flight": len(self._sessions),
+                "routes": len(self._routes),
+                "requests": sum(profile.requests for profile in self._routes.values()),
+            }
+
+
+def _collapse(frame) -> str:
+    if frame.f_code.co_name == "select" and frame.f_code.co_filename.endswith("selectors.py"):
+        return IDLE_STACK
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+def _short_path(filename: str) -> str:
+    parts = filename.split(os.sep)
+    for anchor in ("site-packages", "app"):
+        if anchor in parts:
+            return "/".join(parts[parts.index(anchor) + (anchor == "site-packages"):])
+    return "/".join(parts[-2:])
+
+
+def _top(samples: Counter, total: int, limit: int) -> List[dict]:
+    return [
+        {"function": function, "samples": count, "percent": round(count / total * 100, 1)}
+        for function, count in samples.most_common(limit)
+    ]
+
+
+def _route_name(scope: Scope) -> str:
+    # Starlette leaves the matched endpoint in the scope; map it back to the path template
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    path = scope["path"]
+    if endpoint is not None and app is not None:
+        for route in getattr(app, "routes", ()):
+            if getattr(route, "endpoint", None) is endpoint:
+                path = route.path
+                break
+    return f"{scope['method']} {path}"
+
+
+class ProfilingMiddleware:
+    # The profile endpoints themselves are never profiled
+    EXEMPT_PREFIX = f"{settings.API_V1_PREFIX}/admin/profiling"
+
+    def __init__(self, app: ASGIApp, profiler: Optional[RequestProfiler] = None):
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(self.EXEMPT_PREFIX)
+            or not self.profiler.should_profile(Headers(scope=scope))
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILED_HEADER] = "true"
+            await send(message)
+
+        session = self.profiler.start()
+        token = _current_session.set(session)
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            _current_session.reset(token)
+            self.profiler.stop(session, _route_name(scope))
+
+
+# Global profiler instance
+request_profiler = RequestProfiler(
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    interval_ms=settings.PROFILING_INTERVAL_MS,
+)
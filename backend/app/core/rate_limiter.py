@@ -6,7 +6,10 @@ For distributed deployments, replace with Redis-based implementation.
 from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, Tuple
-from fastapi import Request, HTTPException, status
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import asyncio
 import logging
 
@@ -76,35 +79,50 @@ class RateLimiter:
 rate_limiter = RateLimiter()
 
 
-async def rate_limit_middleware(request: Request, call_next):
+class RateLimitMiddleware:
     """
-    FastAPI middleware for rate limiting.
-    Adds rate limit headers to all responses.
+    ASGI middleware for rate limiting.
+    Adds rate limit headers to all responses and answers 429 directly
+    when the client is over its limit.
     """
-    # Skip rate limiting for health checks
-    if request.url.path in ["/health", "/", "/docs", "/redoc", "/openapi.json"]:
-        return await call_next(request)
     
-    allowed, remaining, reset_time = await rate_limiter.check_rate_limit(request)
+    EXEMPT_PATHS = {"/health", "/ready", "/", "/docs", "/redoc", "/openapi.json"}
     
-    if not allowed:
-        logger.warning(f"Rate limit exceeded for client: {rate_limiter._get_client_id(request)}")
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Rate limit exceeded. Please try again later.",
-            headers={
-                "X-RateLimit-Limit": str(rate_limiter.requests_per_window),
-                "X-RateLimit-Remaining": "0",
-                "X-RateLimit-Reset": str(reset_time),
-                "Retry-After": str(reset_time),
-            }
-        )
-    
-    response = await call_next(request)
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
     
-    # Add rate limit headers to response
-    response.headers["X-RateLimit-Limit"] = str(rate_limiter.requests_per_window)
-    response.headers["X-RateLimit-Remaining"] = str(remaining)
-    response.headers["X-RateLimit-Reset"] = str(reset_time)
-    
-    return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip rate limiting for health checks
+        if scope["type"] != "http" or scope["path"] in self.EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        allowed, remaining, reset_time = await self.limiter.check_rate_limit(request)
+        limit = str(self.limiter.requests_per_window)
+        
+        if not allowed:
+            logger.warning("Rate limit exceeded for client: %s", self.limiter._get_client_id(request))
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Rate limit exceeded. Please try again later."},
+                headers={
+                    "X-RateLimit-Limit": limit,
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(reset_time),
+                    "Retry-After": str(reset_time),
+                },
+            )
+            await response(scope, receive, send)
+            return
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = limit
+                headers["X-RateLimit-Remaining"] = str(remaining)
+                headers["X-RateLimit-Reset"] = str(reset_time)
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
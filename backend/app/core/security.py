@@ -3,6 +3,7 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.tracing import span
 
 # Use Argon2 instead of bcrypt - no 72 byte limit!
 pwd_context = CryptContext(
@@ -20,12 +21,14 @@ REFRESH_TOKEN_EXPIRE_DAYS = 7
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    with span("argon2.verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password using Argon2"""
-    return pwd_context.hash(password)
+    with span("argon2.hash"):
+        return pwd_context.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -67,6 +70,29 @@ def decode_access_token(token: str) -> Optional[dict]:
         return None
 
 
+def create_profiling_token(expires_delta: timedelta = timedelta(minutes=10)) -> str:
+    """Create a short-lived token for the profiling header and admin endpoints"""
+    expire = datetime.utcnow() + expires_delta
+    return jwt.encode(
+        {"token_type": "profiling", "exp": expire},
+        settings.PROFILING_SECRET,
+        algorithm=settings.ALGORITHM,
+    )
+
+
+def decode_profiling_token(token: str) -> Optional[dict]:
+    """Decode and verify a profiling token; always None without PROFILING_SECRET"""
+    if not settings.PROFILING_SECRET:
+        return None
+    try:
+        payload = jwt.decode(token, settings.PROFILING_SECRET, algorithms=[settings.ALGORITHM])
+        if payload.get("token_type") != "profiling":
+            return None
+        return payload
+    except JWTError:
+        return None
+
+
 def decode_refresh_token(token: str) -> Optional[dict]:
     """Decode and verify a refresh token"""
     try:
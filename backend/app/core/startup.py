@@ -0,0 +1,127 @@
+"""
+One-shot background startup work for each worker.
+
+Boot only starts a thread; the worker accepts requests straight away and
+GET /ready reports 503 until the thread has opened and checked
+STARTUP_WARM_CONNECTIONS pooled connections (retrying while the database
+is unreachable). After that it creates missing demo accounts, guarded by a
+PostgreSQL advisory lock so that only one of the workers booting together
+does it.
+"""
+from datetime import datetime, timezone
+from typing import Callable, Optional
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key for the demo account bootstrap
+DEMO_BOOTSTRAP_LOCK_KEY = 7_316_801_042
+
+
+class StartupTasks:
+    """Pool warm-up and demo bootstrap, run once per worker in a background thread."""
+
+    def __init__(self, warm_connections: int = 5, retry_seconds: float = 2.0):
+        self.warm_connections = warm_connections
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._attempts = 0
+        self._last_error: Optional[str] = None
+        self._demo = "disabled"
+        self._started_at: Optional[datetime] = None
+        self._ready_after: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self, engine: Engine, session_factory: Callable) -> None:
+        """Start the background thread; later calls are no-ops."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._started_at = datetime.now(timezone.utc)
+            self._thread = threading.Thread(
+                target=self._run, args=(engine, session_factory),
+                name="startup-tasks", daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self, engine: Engine, session_factory: Callable) -> None:
+        start = time.perf_counter()
+        while True:
+            self._attempts += 1
+            try:
+                self._warm_pool(engine)
+                break
+            except Exception as e:
+                self._last_error = str(e)
+                logger.warning("Database not reachable yet (attempt %s): %s", self._attempts, e)
+                time.sleep(self.retry_seconds)
+        self._last_error = None
+        self._ready_after = time.perf_counter() - start
+        self._ready.set()
+        logger.info("Worker ready after %.2fs", self._ready_after)
+
+        if settings.DEMO_ENABLED:
+            self._bootstrap_demo(engine, session_factory)
+
+    def _warm_pool(self, engine: Engine) -> None:
+        # Hold them all at once so the pool really opens that many
+        connections = []
+        try:
+            for _ in range(self.warm_connections):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+
+    def _bootstrap_demo(self, engine: Engine, session_factory: Callable) -> None:
+        from app.services.demo_service import DemoService
+
+        self._demo = "running"
+        db = session_factory()
+        try:
+            if engine.dialect.name == "postgresql":
+                # Transaction-scoped: released when the bootstrap commits or rolls back
+                locked = db.scalar(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": DEMO_BOOTSTRAP_LOCK_KEY}
+                )
+                if not locked:
+                    self._demo = "skipped: another worker holds the lock"
+                    return
+            result = DemoService(db).ensure_demo_accounts_exist()
+            self._demo = "done"
+            logger.info("Demo accounts initialized: %s", result)
+        except Exception as e:
+            self._demo = "failed"
+            logger.error("Failed to initialize demo accounts: %s", e)
+        finally:
+            db.close()
+
+    def get_status(self) -> dict:
+        return {
+            "ready": self.is_ready,
+            "started_at": self._started_at.isoformat() if self._started_at else None,
+            "ready_after_seconds": round(self._ready_after, 3) if self._ready_after is not None else None,
+            "attempts": self._attempts,
+            "last_error": self._last_error,
+            "demo_bootstrap": self._demo,
+        }
+
+
+# Global instance
+startup_tasks = StartupTasks(
+    warm_connections=settings.STARTUP_WARM_CONNECTIONS,
+    retry_seconds=settings.STARTUP_RETRY_SECONDS,
+)
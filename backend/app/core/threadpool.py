@@ -0,0 +1,152 @@
+"""
+Thread limiters for sync endpoints.
+
+All endpoints are sync `def`, so each runs on a worker thread. anyio's
+default limiter (40 tokens, unrelated to the 20 + 40 connection pool) is
+split into two named limiters:
+
+- "io": ordinary endpoints. These stay plain sync endpoints, so FastAPI
+  runs them, their sync dependencies (get_db, get_current_user) and their
+  response model validation on anyio's default limiter, which
+  thread_limiters.configure() sizes to THREADPOOL_SIZE at startup
+  (default: the pool's DB_POOL_SIZE + DB_MAX_OVERFLOW connections);
+- "auth": endpoints marked `@cpu_bound` (Argon2 hashing and verification)
+  run on their own THREADPOOL_AUTH_SIZE threads (default: the CPU count),
+  so a burst of logins can't occupy the threads that bookings and searches
+  need. Their dependencies still use the default limiter.
+
+Each limiter records how many threads its endpoints keep busy; the auth
+limiter also records how long calls waited for a thread. The default
+limiter's queue is shared with dependencies and other run_in_threadpool
+work, so "io" reports its current queue length rather than per-call waits.
+"""
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+import os
+import threading
+import time
+
+import anyio
+import anyio.to_thread
+from app.core.config import settings
+
+IO = "io"
+AUTH = "auth"
+
+
+def cpu_bound(endpoint: Callable) -> Callable:
+    """Run this route on the auth (CPU) limiter; applied below the route decorator."""
+    endpoint.__thread_limiter__ = AUTH
+    return endpoint
+
+
+class ThreadLimiter:
+    """
+    A named CapacityLimiter with queue-wait and occupancy statistics.
+    With `default=True` it stands for anyio's default limiter, which FastAPI
+    uses for sync endpoints; it is sized by ThreadLimiters.configure().
+    """
+
+    def __init__(self, name: str, size: int, wait_window: int = 1000, default: bool = False):
+        self.name = name
+        self.size = size
+        self.default = default
+        self._limiter: Optional[anyio.CapacityLimiter] = None  # created in the event loop
+        self._lock = threading.Lock()
+        self._waits: deque = deque(maxlen=wait_window)
+        self._max_wait = 0.0
+        self._calls = 0
+        self._saturated = 0
+        self._busy = 0
+        self._peak_busy = 0
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        if self.default:
+            return anyio.to_thread.current_default_thread_limiter()
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.size)
+        return self._limiter
+
+    @contextmanager
+    def occupy(self, wait: Optional[float] = None):
+        """Count the enclosed block as one call holding a thread of this limiter."""
+        with self._lock:
+            self._calls += 1
+            if wait is not None:
+                self._waits.append(wait)
+                self._max_wait = max(self._max_wait, wait)
+            self._busy += 1
+            self._peak_busy = max(self._peak_busy, self._busy)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    async def run_sync(self, func: Callable, *args):
+        """Run `func(*args)` on a worker thread once this limiter has a free token."""
+        limiter = self.limiter
+        queued = time.perf_counter()
+        if limiter.available_tokens == 0:
+            with self._lock:
+                self._saturated += 1
+
+        def call():
+            with self.occupy(time.perf_counter() - queued):
+                return func(*args)
+
+        return await anyio.to_thread.run_sync(call, limiter=limiter)
+
+    def get_stats(self) -> dict:
+        """Call from the event loop (the default limiter is per event loop)."""
+        limiter = self.limiter if self.default or self._limiter is not None else None
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                "size": limiter.total_tokens if self.default else self.size,
+                "busy": self._busy,
+                "peak_busy": self._peak_busy,
+                "waiting": limiter.statistics().tasks_waiting if limiter is not None else 0,
+                "calls": self._calls,
+            }
+            if self.default:
+                # Endpoints, dependencies and other run_in_threadpool work
+                stats["threads_in_use"] = limiter.borrowed_tokens
+                return stats
+            stats["saturated_calls"] = self._saturated
+            stats["wait_ms"] = {
+                "avg": round(sum(waits) / len(waits) * 1000, 3) if waits else None,
+                "p95": round(waits[int(len(waits) * 0.95)] * 1000, 3) if waits else None,
+                "max": round(self._max_wait * 1000, 3),
+            }
+            return stats
+
+
+class ThreadLimiters:
+    """The endpoint limiters; "io" is anyio's default limiter."""
+
+    def __init__(self, io_size: int, auth_size: int):
+        self.limiters: Dict[str, ThreadLimiter] = {
+            IO: ThreadLimiter(IO, io_size, default=True),
+            AUTH: ThreadLimiter(AUTH, auth_size),
+        }
+
+    def for_endpoint(self, endpoint: Callable) -> ThreadLimiter:
+        return self.limiters[getattr(endpoint, "__thread_limiter__", IO)]
+
+    def configure(self) -> None:
+        """Size anyio's default limiter; must run inside the event loop (startup)."""
+        anyio.to_thread.current_default_thread_limiter().total_tokens = self.limiters[IO].size
+
+    def get_stats(self) -> dict:
+        """Get limiter statistics for monitoring; call from the event loop."""
+        return {name: limiter.get_stats() for name, limiter in self.limiters.items()}
+
+
+# Global limiters
+thread_limiters = ThreadLimiters(
+    io_size=settings.THREADPOOL_SIZE or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+    auth_size=settings.THREADPOOL_AUTH_SIZE or os.cpu_count() or 4,
+)
@@ -0,0 +1,309 @@
+"""
+Lightweight in-process request tracing.
+
+TimingMiddleware starts a trace per request; `span()` / `@traced` record
+timed, nested spans into it through a context variable (a no-op outside a
+request). Each response gets a Server-Timing header with per-phase totals
+(JWT decode, user lookup, pool wait, SQL, Argon2, service calls,
+serialization). A sample of traces can be appended to a local JSONL file,
+one OTLP/JSON `resourceSpans` document per line.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+from app.core.config import settings
+from app.core.profiling import request_profiler
+from app.core.threadpool import thread_limiters
+
+logger = logging.getLogger(__name__)
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start", "end", "start_ns", "attributes")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: dict,
+                 start: Optional[float] = None):
+        now = time.perf_counter()
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = now if start is None else start
+        self.start_ns = time.time_ns() - int((now - self.start) * 1e9)
+        self.end: Optional[float] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+
+class Trace:
+    """Spans recorded while serving one request."""
+
+    def __init__(self, name: str, sampled: bool):
+        self.trace_id = os.urandom(16).hex()
+        self.sampled = sampled
+        self.root = Span(name, None, {})
+        self.spans: List[Span] = []
+        self.marks: Dict[str, float] = {}
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: total duration and count per span name."""
+        totals: Dict[str, List[float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span.name, [0.0, 0])
+            entry[0] += span.duration_ms
+            entry[1] += 1
+        metrics = [
+            f'{name};dur={duration:.1f}' + (f';desc="x{count}"' if count > 1 else "")
+            for name, (duration, count) in totals.items()
+        ]
+        metrics.append(f"total;dur={self.root.duration_ms:.1f}")
+        return ", ".join(metrics)
+
+    def to_otlp(self) -> dict:
+        """The trace as an OTLP/JSON ExportTraceServiceRequest."""
+
+        def encode(span: Span, parent_id: Optional[str]) -> dict:
+            return {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": parent_id or "",
+                "name": span.name,
+                "kind": 2 if span is self.root else 1,  # SERVER / INTERNAL
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.start_ns + int(span.duration_ms * 1e6)),
+                "attributes": [
+                    {"key": key, "value": {"stringValue": str(value)}}
+                    for key, value in span.attributes.items()
+                ],
+            }
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": settings.APP_NAME}},
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [encode(self.root, None)]
+                    + [encode(span, span.parent_id or self.root.span_id) for span in self.spans],
+                }],
+            }]
+        }
+
+
+class TraceExporter:
+    """Appends sampled traces to a JSONL file."""
+
+    def __init__(self, path: str, sample_rate: float):
+        self.path = path
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._exported = 0
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps(trace.to_otlp(), separators=(",", ":"))
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._exported += 1
+        except OSError as e:
+            logger.warning("Could not write trace to %s: %s", self.path, e)
+
+
+# Global exporter instance
+trace_exporter = TraceExporter(settings.TRACE_FILE, settings.TRACE_SAMPLE_RATE)
+
+
+def start_trace(name: str) -> Trace:
+    """Start the trace for the current request (called by TimingMiddleware)."""
+    trace = Trace(name, sampled=trace_exporter.should_sample())
+    _current_trace.set(trace)
+    return trace
+
+
+def finish_trace(trace: Trace) -> None:
+    trace.root.end = time.perf_counter()
+    if trace.sampled:
+        trace_exporter.export(trace)
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+def start_span(name: str, **attributes) -> Optional[Span]:
+    """Open a span in the current trace; None outside a request."""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    span = Span(name, parent.span_id if parent else None, attributes)
+    trace.spans.append(span)
+    return span
+
+
+def end_span(span: Optional[Span]) -> None:
+    if span is not None:
+        span.end = time.perf_counter()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time the enclosed block as a child of the current span."""
+    current = start_span(name, **attributes)
+    if current is None:
+        yield None
+        return
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        _current_span.reset(token)
+        end_span(current)
+
+
+def traced(fn=None, *, name: Optional[str] = None):
+    """Decorator form of `span()`; the span is named after the function by default."""
+    if fn is None:
+        return functools.partial(traced, name=name)
+    span_name = name or fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(span_name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+# Routing instrumentation
+
+_ENDPOINT_DONE = "endpoint_done"
+
+
+def _traced_endpoint(endpoint: Callable) -> Callable:
+    """
+    Wrap a route endpoint in an `endpoint` span, marking when it returns.
+    Sync endpoints run on their thread limiter (see app.core.threadpool); a
+    profiled request samples that thread while they do. Endpoints on the
+    default limiter stay sync, so FastAPI runs them and validates their
+    response in its threadpool as usual.
+    """
+    if getattr(endpoint, "__traced__", False):
+        # include_router rebuilds routes from the already wrapped endpoint
+        return endpoint
+
+    def mark_done():
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.marks[_ENDPOINT_DONE] = time.perf_counter()
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                with span("endpoint"):
+                    return await endpoint(*args, **kwargs)
+            finally:
+                mark_done()
+    else:
+        def run(*args, **kwargs):
+            try:
+                with span("endpoint"), request_profiler.thread():
+                    return endpoint(*args, **kwargs)
+            finally:
+                mark_done()
+
+        limiter = thread_limiters.for_endpoint(endpoint)
+        if limiter.default:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                with limiter.occupy():
+                    return run(*args, **kwargs)
+        else:
+            # Offloaded here rather than by FastAPI, to use the route's own limiter
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                return await limiter.run_sync(functools.partial(run, *args, **kwargs))
+    wrapper.__traced__ = True
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """
+    Route class recording an `endpoint` span around the endpoint function and
+    a `serialize` span for the response model validation/encoding after it.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _traced_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def traced_handler(request: Request) -> Response:
+            response = await handler(request)
+            trace = _current_trace.get()
+            done = trace.marks.pop(_ENDPOINT_DONE, None) if trace is not None else None
+            if done is not None:
+                serialize = Span("serialize", None, {}, start=done)
+                serialize.end = time.perf_counter()
+                trace.spans.append(serialize)
+            return response
+
+        return traced_handler
+
+
+# Database instrumentation
+
+class TracedQueuePool(QueuePool):
+    """QueuePool that records time spent waiting for a connection."""
+
+    def connect(self):
+        with span("db.pool"):
+            return super().connect()
+
+
+def instrument_engine(engine) -> None:
+    """Record a `db.query` span for every statement executed on `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        current = start_span("db.query", **{"db.statement": statement[:200]})
+        if current is not None:
+            conn.info.setdefault("trace_spans", []).append(current)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            end_span(spans.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            end_span(spans.pop())
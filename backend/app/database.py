@@ -1,8 +1,10 @@
 from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.circuit_breaker import BreakerQueuePool, db_circuit_breaker
+from app.core.deadlines import enforce_deadlines
+from app.core.tracing import instrument_engine
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,10 +18,12 @@ if any(h in (database_url or "") for h in ("supabase.co", "supabase.com")) and "
     connect_args = {"sslmode": "require"}
 
 # Production-ready connection pool configuration for 1000+ concurrent users
-# Using QueuePool with optimized settings
+# Using QueuePool with optimized settings (traced: pool wait shows in Server-Timing;
+# checkout waits no longer than the request's deadline allows, and is refused
+# outright while the circuit breaker is open)
 engine = create_engine(
     database_url,
-    poolclass=QueuePool,
+    poolclass=BreakerQueuePool,
     pool_pre_ping=True,  # Verify connections before use
     pool_size=settings.DB_POOL_SIZE,  # Base pool size
     max_overflow=settings.DB_MAX_OVERFLOW,  # Additional connections when pool is exhausted
@@ -29,6 +33,15 @@ engine = create_engine(
     connect_args=connect_args,
 )
 
+# Per-statement spans for request tracing
+instrument_engine(engine)
+
+# Request deadlines: statement_timeout per transaction, no statements once expired
+enforce_deadlines(engine)
+
+# Circuit breaker: opens on connection/statement error rate, 503 while open
+db_circuit_breaker.install(engine)
+
 # Connection pool event listeners for monitoring
 @event.listens_for(engine, "connect")
 def on_connect(dbapi_conn, connection_record):
@@ -42,7 +55,10 @@ def on_checkout(dbapi_conn, connection_record, connection_proxy):
 def on_checkin(dbapi_conn, connection_record):
     logger.debug("Connection returned to pool")
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: sessions are per-request, and write paths populate
+# server-generated columns via RETURNING (see eager_defaults on the models),
+# so there is no need to reload every object after commit.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -59,6 +75,18 @@ def get_db():
         db.close()
 
 
+def upsert_insert(db, model):
+    """
+    INSERT construct supporting ON CONFLICT for the session's backend.
+    PostgreSQL in production; SQLite is used by the benchmark scripts.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(model)
+
+
 def get_pool_status():
     """Get current connection pool status for monitoring."""
     pool = engine.pool
@@ -1,28 +1,38 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.config import settings
-from app.core.rate_limiter import rate_limit_middleware, rate_limiter
+from app.core.rate_limiter import RateLimitMiddleware, rate_limiter
+from app.core.events import booking_events
+from app.core.idempotency import idempotency_store
+from app.core.cache import profile_cache
+from app.core.logging_config import log_stats, setup_logging
+from app.core.tracing import finish_trace, start_trace
+from app.core.profiling import ProfilingMiddleware, request_profiler
+from app.core.startup import startup_tasks
+from app.core.compression import CompressionMiddleware, response_compressor
+from app.core.coalescing import read_coalescer
+from app.core.invalidation import invalidation_bus
+from app.core.pg_listener import pg_listener
+from app.core.deadlines import DeadlineMiddleware, deadline_policy
+from app.core.circuit_breaker import OPEN, db_circuit_breaker
+from app.core.threadpool import thread_limiters
 from app.api.v1 import auth, users, maids, bookings, reviews
-from app.database import engine, Base, get_pool_status
-from app.services.demo_service import DemoService
+from app.database import engine, Base, SessionLocal, get_pool_status
+from sqlalchemy import text
 
 # Import all models
 from app.models.user import User
 from app.models.booking import Booking
 from app.models.review import Review
 import logging
-import sys
 import time
 
-# Configure logging - important for production debugging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-    ]
-)
+# Configure logging - important for production debugging.
+# Records go through a queue to a writer thread (see app/core/logging_config.py)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Note: Database tables are managed via Supabase SQL scripts (database/init.sql)
@@ -38,78 +48,107 @@ app = FastAPI(
     redirect_slashes=False  # Disable trailing slash redirect to preserve CORS headers on redirects
 )
 
-logger.info(f"Starting {settings.APP_NAME} API v2.0.0")
-logger.info(f"DEBUG mode: {settings.DEBUG}")
-logger.info(f"Demo mode: {settings.DEMO_ENABLED}")
-logger.info(f"DATABASE_URL configured: {settings.DATABASE_URL[:50]}..." if settings.DATABASE_URL else "No DATABASE_URL")
-logger.info(f"DB Pool Size: {settings.DB_POOL_SIZE}, Max Overflow: {settings.DB_MAX_OVERFLOW}")
+logger.info(
+    "Starting %s API v2.0.0 (debug=%s, demo=%s, db pool=%s+%s)",
+    settings.APP_NAME, settings.DEBUG, settings.DEMO_ENABLED,
+    settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW,
+)
+
+
+# Request timing middleware for performance monitoring
+# (plain ASGI: no per-request task or body stream wrapping, safe for SSE)
+class TimingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        trace = start_trace(f"{scope['method']} {scope['path']}")
+        
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = f"{process_time:.4f}"
+                if settings.SERVER_TIMING_ENABLED:
+                    headers["Server-Timing"] = trace.server_timing()
+                
+                # Log slow requests (> 1 second)
+                if process_time > 1.0:
+                    logger.warning("Slow request: %s %s took %.2fs", scope["method"], scope["path"], process_time)
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish_trace(trace)
+
+
+# Add middlewares (last added runs first)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TimingMiddleware)
+app.add_middleware(DeadlineMiddleware)
+app.add_middleware(RateLimitMiddleware)
 
 # CORS configuration - production ready
+# Outermost, so preflights skip rate limiting and 429 responses carry CORS headers
 allowed_origins = settings.BACKEND_CORS_ORIGINS
-logger.info(f"CORS Origins: {allowed_origins}")
+logger.info("CORS Origins: %s", allowed_origins)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Idempotent-Replayed", "Server-Timing", "X-Profiled"],
 )
 
-
-# Request timing middleware for performance monitoring
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = f"{process_time:.4f}"
-        
-        # Log slow requests (> 1 second)
-        if process_time > 1.0:
-            logger.warning(f"Slow request: {request.method} {request.url.path} took {process_time:.2f}s")
-        
-        return response
-
-
-# Add middlewares
-app.add_middleware(TimingMiddleware)
-app.middleware("http")(rate_limit_middleware)
-
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(users.router, prefix=settings.API_V1_PREFIX)
 app.include_router(maids.router, prefix=settings.API_V1_PREFIX)
 app.include_router(bookings.router, prefix=settings.API_V1_PREFIX)
 app.include_router(reviews.router, prefix=settings.API_V1_PREFIX)
+if settings.PROFILING_ENABLED:
+    from app.api.v1 import profiling
+    app.include_router(profiling.router, prefix=settings.API_V1_PREFIX)
 
-logger.info(f"API v1 routes registered at prefix: {settings.API_V1_PREFIX}")
+logger.info("API v1 routes registered at prefix: %s", settings.API_V1_PREFIX)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize demo accounts on startup."""
-    logger.info("Running startup tasks...")
+    """Start background startup tasks; the worker serves requests meanwhile."""
+    # Default thread limiter (sync endpoints and dependencies), in line with the pool
+    thread_limiters.configure()
     
-    if settings.DEMO_ENABLED:
-        try:
-            from app.database import SessionLocal
-            db = SessionLocal()
-            try:
-                demo_service = DemoService(db)
-                result = demo_service.ensure_demo_accounts_exist()
-                logger.info(f"Demo accounts initialized: {result}")
-            finally:
-                db.close()
-        except Exception as e:
-            logger.error(f"Failed to initialize demo accounts: {e}")
+    # Pool warm-up and demo accounts (see /ready)
+    startup_tasks.start(engine, SessionLocal)
     
-    logger.info("Startup tasks completed")
+    # Cross-worker booking events via LISTEN/NOTIFY (PostgreSQL only); shares
+    # one LISTEN connection with cache invalidation
+    booking_events.start_listener(engine)
+    
+    # Cross-worker cache invalidation (LISTEN/NOTIFY, or local Unix sockets)
+    invalidation_bus.start(engine)
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    booking_events.stop_listener()
+    invalidation_bus.stop()
 
 
 @app.get("/")
 def root():
-    logger.info("Root endpoint called")
+    logger.debug("Root endpoint called")
     return {
         "message": f"Welcome to {settings.APP_NAME} API",
         "version": "2.0.0",
@@ -125,14 +164,18 @@ def health_check():
     Useful for load balancers and monitoring systems.
     """
     pool_status = get_pool_status()
+    breaker = db_circuit_breaker.get_stats()
     
     return {
-        "status": "healthy",
+        # Still 200: the process is alive, DB-dependent routes return 503
+        "status": "degraded" if breaker["state"] == OPEN else "healthy",
         "version": "2.0.0",
         "database": {
             "pool_size": pool_status["pool_size"],
             "connections_in_use": pool_status["checked_out"],
             "connections_available": pool_status["checked_in"],
+            "circuit_breaker": breaker["state"],
+            "circuit_open_for_seconds": breaker["open_for_seconds"],
         },
         "features": {
             "demo_mode": settings.DEMO_ENABLED,
@@ -141,11 +184,32 @@ def health_check():
     }
 
 
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness probe: 503 until the startup tasks have warmed the pool,
+    or while the database doesn't answer. /health is the liveness probe.
+    """
+    body = {"status": "ready", "startup": startup_tasks.get_status()}
+    if not startup_tasks.is_ready:
+        body["status"] = "starting"
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning("Readiness check failed: %s", e)
+        body["status"] = "database unavailable"
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    return body
+
+
 @app.get("/metrics")
 async def get_metrics():
     """
     Metrics endpoint for monitoring and observability.
-    Returns rate limiter and connection pool statistics.
+    Returns rate limiter, connection pool, event, LISTEN, idempotency, cache, coalescing,
+    logging, compression and profiler statistics.
     """
     pool_status = get_pool_status()
     rate_stats = await rate_limiter.get_stats()
@@ -153,4 +217,16 @@ async def get_metrics():
     return {
         "database_pool": pool_status,
         "rate_limiter": rate_stats,
+        "booking_events": booking_events.get_stats(),
+        "idempotency": idempotency_store.get_stats(),
+        "profile_cache": profile_cache.get_stats(),
+        "coalescing": read_coalescer.get_stats(),
+        "invalidation": invalidation_bus.get_stats(),
+        "pg_listener": pg_listener.get_stats(),
+        "deadlines": deadline_policy.get_stats(),
+        "circuit_breaker": db_circuit_breaker.get_stats(),
+        "threadpool": thread_limiters.get_stats(),
+        "logging": log_stats.get_stats(),
+        "compression": response_compressor.get_stats() if settings.COMPRESSION_ENABLED else None,
+        "profiler": request_profiler.get_stats() if settings.PROFILING_ENABLED else None,
     }
@@ -1,5 +1,11 @@
 from app.models.user import User, UserRole
 from app.models.booking import Booking, BookingStatus
 from app.models.review import Review
+from app.models.maid_stats import MaidStats, MaidEarnings
+from app.models.idempotency import IdempotencyKey
+from app.models.stream_ticket import StreamTicket
 
-__all__ = ["User", "UserRole", "Booking", "BookingStatus", "Review"]
+__all__ = [
+    "User", "UserRole", "Booking", "BookingStatus", "Review",
+    "MaidStats", "MaidEarnings", "IdempotencyKey", "StreamTicket",
+]
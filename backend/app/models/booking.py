@@ -16,18 +16,22 @@ class BookingStatus(str, enum.Enum):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    # Fetch server-generated columns (created_at/updated_at) with RETURNING
+    __mapper_args__ = {"eager_defaults": True}
     
+    # The table is range-partitioned by booking_date, so its primary key must
+    # include it (see database/migrations/002_partition_bookings.sql)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     customer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     maid_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     service_type = Column(String, nullable=False)
-    booking_date = Column(DateTime, nullable=False)
+    booking_date = Column(DateTime, primary_key=True)
     time_slot = Column(String)
     status = Column(Enum(BookingStatus, values_callable=lambda x: [e.value for e in x]), default=BookingStatus.PENDING)
     total_amount = Column(Float)
     notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     customer = relationship(
@@ -43,6 +47,7 @@ class Booking(Base):
     review = relationship(
         "Review",
         back_populates="booking",
+        primaryjoin="Booking.id == foreign(Review.booking_id)",
         uselist=False,
         cascade="all, delete-orphan"
     )
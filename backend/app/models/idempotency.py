@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Stored result of a POST made with an Idempotency-Key header.
+    status_code is NULL while the first request is still in flight.
+    """
+    __tablename__ = "idempotency_keys"
+    
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
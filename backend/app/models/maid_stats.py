@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Float
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class MaidStats(Base):
+    """
+    Per-maid booking aggregates, maintained incrementally by MaidStatsService
+    in the same transaction as booking writes.
+    """
+    __tablename__ = "maid_stats"
+    
+    maid_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    # Current number of bookings in each status
+    total_bookings = Column(Integer, nullable=False, server_default="0")
+    pending_bookings = Column(Integer, nullable=False, server_default="0")
+    accepted_bookings = Column(Integer, nullable=False, server_default="0")
+    completed_bookings = Column(Integer, nullable=False, server_default="0")
+    canceled_bookings = Column(Integer, nullable=False, server_default="0")
+    total_earnings = Column(Float, nullable=False, server_default="0")
+    # Maid decisions on pending bookings
+    acceptances = Column(Integer, nullable=False, server_default="0")
+    declines = Column(Integer, nullable=False, server_default="0")
+    responses = Column(Integer, nullable=False, server_default="0")
+    response_seconds_total = Column(Float, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class MaidEarnings(Base):
+    """Completed bookings and earnings per maid per week/month of booking_date."""
+    __tablename__ = "maid_earnings"
+    
+    maid_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    period = Column(String, primary_key=True)  # "week" or "month"
+    period_start = Column(Date, primary_key=True)
+    completed_bookings = Column(Integer, nullable=False, server_default="0")
+    earnings = Column(Float, nullable=False, server_default="0")
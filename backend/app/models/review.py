@@ -8,9 +8,13 @@ import uuid
 
 class Review(Base):
     __tablename__ = "reviews"
+    # Fetch server-generated columns (created_at/updated_at) with RETURNING
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id"), nullable=False, unique=True)
+    # No foreign key: bookings(id) alone isn't unique on the partitioned table.
+    # Database triggers check the booking exists and delete the review with it.
+    booking_id = Column(UUID(as_uuid=True), nullable=False, unique=True)
     customer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     maid_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     rating = Column(Float, nullable=False)
@@ -18,7 +22,11 @@ class Review(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    booking = relationship("Booking", back_populates="review")
+    booking = relationship(
+        "Booking",
+        back_populates="review",
+        primaryjoin="Booking.id == foreign(Review.booking_id)"
+    )
     customer = relationship(
         "User",
         back_populates="reviews_given",
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class StreamTicket(Base):
+    """
+    Single-use ticket for opening the booking event stream. EventSource can't
+    send an Authorization header, so the client trades its access token for a
+    ticket and puts that in the URL instead. Only the SHA-256 of the ticket
+    is stored; the row is deleted when the stream is opened.
+    """
+    __tablename__ = "stream_tickets"
+    
+    ticket_hash = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
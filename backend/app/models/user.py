@@ -14,6 +14,8 @@ class UserRole(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch server-generated columns (created_at/updated_at) with RETURNING
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -23,7 +25,7 @@ class User(Base):
     role = Column(Enum(UserRole, values_callable=lambda x: [e.value for e in x]), nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Maid-specific fields
     bio = Column(Text)
@@ -31,7 +33,15 @@ class User(Base):
     experience_years = Column(Integer)
     hourly_rate = Column(Float)
     availability_schedule = Column(Text)
-    average_rating = Column(Float, default=0.0)
+    average_rating = Column(Float, default=0.0)  # rating_sum / rating_count, kept in step by ReviewService
+    rating_count = Column(Integer, nullable=False, server_default="0")
+    rating_sum = Column(Float, nullable=False, server_default="0")
+    # Star histogram (floor of the rating) for the review summary
+    rating_1_count = Column(Integer, nullable=False, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, server_default="0")
     
     # Relationships - Use string references
     bookings_as_customer = relationship(
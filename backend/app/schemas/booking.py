@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from app.models.booking import BookingStatus
@@ -22,6 +22,22 @@ class BookingUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class BookingBulkStatusUpdate(BaseModel):
+    booking_ids: List[UUID] = Field(..., min_length=1, max_length=100)
+    status: BookingStatus
+
+
+class BookingStatusResult(BaseModel):
+    booking_id: UUID
+    updated: bool
+    status: Optional[BookingStatus] = None
+    detail: Optional[str] = None
+
+
+class BookingBulkStatusResponse(BaseModel):
+    results: List[BookingStatusResult]
+
+
 class UserDetail(BaseModel):
     id: UUID
     full_name: str
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+
+
+class EarningsPeriod(BaseModel):
+    period_start: date
+    completed_bookings: int
+    earnings: float
+    
+    class Config:
+        from_attributes = True
+
+
+class MaidStatsResponse(BaseModel):
+    total_bookings: int
+    pending_bookings: int
+    accepted_bookings: int
+    completed_jobs: int
+    canceled_bookings: int
+    total_earnings: float
+    acceptance_rate: Optional[float] = None
+    average_response_seconds: Optional[float] = None
+    earnings_by_week: List[EarningsPeriod]
+    earnings_by_month: List[EarningsPeriod]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -13,6 +13,14 @@ class ReviewCreate(ReviewBase):
     booking_id: UUID
 
 
+class ReviewCheckBatch(BaseModel):
+    booking_ids: List[UUID] = Field(..., min_length=1, max_length=100)
+
+
+class ReviewCheckBatchResponse(BaseModel):
+    exists: Dict[UUID, bool]  # booking id -> reviewed by the current user
+
+
 class ReviewResponse(ReviewBase):
     id: UUID
     booking_id: UUID
@@ -22,3 +30,15 @@ class ReviewResponse(ReviewBase):
     
     class Config:
         from_attributes = True
+
+
+class RatingSummary(BaseModel):
+    count: int
+    average_rating: float
+    histogram: Dict[int, int]  # stars (1-5) -> number of reviews
+
+
+class MaidReviewsPage(BaseModel):
+    items: List[ReviewResponse]
+    next_cursor: Optional[str] = None
+    summary: Optional[RatingSummary] = None  # first page only
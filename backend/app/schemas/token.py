@@ -18,3 +18,8 @@ class TokenData(BaseModel):
 
 class TokenRefresh(BaseModel):
     refresh_token: str
+
+
+class StreamTicketResponse(BaseModel):
+    ticket: str
+    expires_in: int  # seconds
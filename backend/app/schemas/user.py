@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from app.models.user import UserRole
@@ -73,7 +73,36 @@ class UserResponse(UserBase):
     experience_years: Optional[int] = None
     hourly_rate: Optional[float] = None
     average_rating: Optional[float] = None
+    rating_count: Optional[int] = None
     availability_schedule: Optional[str] = None
     
     class Config:
         from_attributes = True
+
+
+class UserPublicProfile(BaseModel):
+    """A user as other users see it: no contact details (email, phone_number)."""
+    id: UUID
+    full_name: str
+    role: UserRole
+    is_active: bool
+    created_at: datetime
+    bio: Optional[str] = None
+    skills: Optional[str] = None
+    experience_years: Optional[int] = None
+    hourly_rate: Optional[float] = None
+    average_rating: Optional[float] = None
+    rating_count: Optional[int] = None
+    availability_schedule: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class UserBatchRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=100)
+
+
+class UserBatchResponse(BaseModel):
+    users: List[UserPublicProfile]  # in request order, duplicates removed
+    missing: List[UUID]
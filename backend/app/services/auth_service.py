@@ -1,6 +1,11 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
+import hashlib
+import secrets
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.models.stream_ticket import StreamTicket
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.core.security import (
@@ -10,6 +15,9 @@ from app.core.security import (
     create_refresh_token,
     decode_refresh_token
 )
+from app.core.config import settings
+from app.core.exceptions import UNIQUE_VIOLATION, is_violation
+from app.core.tracing import traced
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,16 +27,9 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
     
+    @traced
     def register_user(self, user_data: UserCreate) -> User:
-        # Check if user already exists
-        logger.info(f"Checking if user exists: {user_data.email}")
-        existing_user = self.db.query(User).filter(User.email == user_data.email).first()
-        if existing_user:
-            logger.warning(f"User already exists: {user_data.email}")
-            raise ValueError("Email already registered")
-        
-        # Create new user
-        logger.info(f"Creating new user: {user_data.email}, role={user_data.role}")
+        # Create new user; the unique constraint on email rejects duplicates
         hashed_password = get_password_hash(user_data.password)
         db_user = User(
             email=user_data.email,
@@ -38,14 +39,21 @@ class AuthService:
             role=user_data.role
         )
         
-        logger.info(f"Saving user to database: {user_data.email}")
         self.db.add(db_user)
+        try:
+            self.db.flush()
+        except IntegrityError as e:
+            self.db.rollback()
+            if not is_violation(e, UNIQUE_VIOLATION, "users_email_key"):
+                raise
+            logger.info("User already exists: %s", user_data.email)
+            raise ValueError("Email already registered")
         self.db.commit()
-        self.db.refresh(db_user)
-        logger.info(f"User registered successfully: {db_user.id} ({user_data.email})")
+        logger.info("User registered: %s (%s, role=%s)", db_user.id, user_data.email, user_data.role.value)
         
         return db_user
     
+    @traced
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         user = self.db.query(User).filter(User.email == email).first()
         if not user:
@@ -73,3 +81,42 @@ class AuthService:
         }
         access_token = create_access_token(data)
         return access_token
+    
+    def issue_stream_ticket(self, user: User) -> str:
+        """
+        A single-use ticket that opens the user's event stream within
+        SSE_TICKET_TTL_SECONDS. Unused tickets expire and are purged here.
+        """
+        ticket = secrets.token_urlsafe(32)
+        now = datetime.now(timezone.utc)
+        self.db.execute(
+            delete(StreamTicket).where(StreamTicket.expires_at < now),
+            execution_options={"synchronize_session": False},
+        )
+        self.db.add(StreamTicket(
+            ticket_hash=_ticket_hash(ticket),
+            user_id=user.id,
+            expires_at=now + timedelta(seconds=settings.SSE_TICKET_TTL_SECONDS),
+        ))
+        self.db.commit()
+        return ticket
+    
+    def redeem_stream_ticket(self, ticket: str) -> Optional[User]:
+        """The ticket's user, or None if it is unknown, used or expired. Consumes the ticket."""
+        # One DELETE ... RETURNING, so two workers can't both redeem a ticket
+        user_id = self.db.scalar(
+            delete(StreamTicket)
+            .where(
+                StreamTicket.ticket_hash == _ticket_hash(ticket),
+                StreamTicket.expires_at > datetime.now(timezone.utc),
+            )
+            .returning(StreamTicket.user_id)
+        )
+        self.db.commit()
+        if user_id is None:
+            return None
+        return self.db.query(User).filter(User.id == user_id).first()
+
+
+def _ticket_hash(ticket: str) -> str:
+    return hashlib.sha256(ticket.encode()).hexdigest()
@@ -0,0 +1,166 @@
+"""
+Maintenance of the range-partitioned bookings table (PostgreSQL).
+Monthly partitions `bookings_pYYYY_MM` hold hot data; whole years older than
+the archive horizon are rolled into one cold partition `bookings_yYYYY` once
+they only contain completed or canceled bookings.
+"""
+from datetime import date, datetime
+from typing import List, Set
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ("pending", "accepted")
+
+
+def _add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def archive_horizon_start(now: datetime = None) -> datetime:
+    """First instant of the hot window; older history is archived."""
+    today = (now or datetime.utcnow()).date()
+    start = _add_months(today.replace(day=1), -settings.BOOKING_ARCHIVE_HORIZON_MONTHS)
+    return datetime(start.year, start.month, 1)
+
+
+def _month_partition(month_start: date) -> str:
+    return f"bookings_p{month_start:%Y_%m}"
+
+
+def _year_partition(year: int) -> str:
+    return f"bookings_y{year}"
+
+
+class BookingPartitionService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _partitions(self) -> Set[str]:
+        rows = self.db.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'bookings'::regclass"
+        ))
+        return {row[0] for row in rows}
+    
+    def _moving_rows(self) -> None:
+        """
+        Tell the delete_bookings_review trigger that deleted rows are being
+        moved to another partition, so their reviews are kept (until commit).
+        """
+        self.db.execute(text("SELECT set_config('maidease.moving_bookings', 'on', true)"))
+    
+    def _create_partition(self, name: str, start: date, end: date) -> None:
+        """
+        Create and attach a partition for [start, end), moving any rows the
+        default partition already holds for that range.
+        """
+        self.db.execute(text(
+            f"CREATE TABLE {name} (LIKE bookings INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        self._moving_rows()
+        params = {"start": start, "end": end}
+        self.db.execute(text(
+            f"WITH moved AS ("
+            f"  DELETE FROM bookings_default"
+            f"  WHERE booking_date >= :start AND booking_date < :end RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        ), params)
+        self._attach(name, start, end)
+    
+    def _attach(self, name: str, start: date, end: date) -> None:
+        # A matching CHECK lets ATTACH skip its validation scan
+        self.db.execute(text(
+            f"ALTER TABLE {name} ADD CONSTRAINT {name}_range "
+            f"CHECK (booking_date >= '{start}' AND booking_date < '{end}')"
+        ))
+        self.db.execute(text(
+            f"ALTER TABLE bookings ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+        self.db.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {name}_range"))
+    
+    def ensure_partitions(self, months_ahead: int = None) -> List[str]:
+        """Create monthly partitions from the hot window start through `months_ahead`."""
+        if months_ahead is None:
+            months_ahead = settings.BOOKING_PARTITION_PREMAKE_MONTHS
+        existing = self._partitions()
+        first = archive_horizon_start().date()
+        last = _add_months(date.today().replace(day=1), months_ahead)
+        
+        created = []
+        month_start = first
+        while month_start <= last:
+            name = _month_partition(month_start)
+            if name not in existing and _year_partition(month_start.year) not in existing:
+                self._create_partition(name, month_start, _add_months(month_start, 1))
+                created.append(name)
+            month_start = _add_months(month_start, 1)
+        
+        self.db.commit()
+        if created:
+            logger.info("Created booking partitions: %s", ", ".join(created))
+        return created
+    
+    def archive(self, horizon_months: int = None) -> List[str]:
+        """
+        Roll monthly partitions of years entirely older than the horizon into a
+        cold yearly partition. Years still holding pending/accepted bookings are
+        skipped (and logged) so open work never leaves the hot partitions.
+        """
+        if horizon_months is None:
+            horizon_months = settings.BOOKING_ARCHIVE_HORIZON_MONTHS
+        horizon = _add_months(date.today().replace(day=1), -horizon_months)
+        existing = self._partitions()
+        
+        years = sorted({
+            int(name[len("bookings_p"):][:4])
+            for name in existing
+            if name.startswith("bookings_p")
+        })
+        archived = []
+        for year in years:
+            year_start, year_end = date(year, 1, 1), date(year + 1, 1, 1)
+            if year_end > horizon:
+                continue
+            
+            open_count = self.db.execute(text(
+                "SELECT count(*) FROM bookings "
+                "WHERE booking_date >= :start AND booking_date < :end "
+                "AND status = ANY(CAST(:statuses AS booking_status[]))"
+            ), {"start": year_start, "end": year_end, "statuses": list(OPEN_STATUSES)}).scalar()
+            if open_count:
+                logger.warning("Not archiving bookings for %s: %s open bookings", year, open_count)
+                continue
+            
+            months = sorted(
+                name for name in existing
+                if name.startswith(f"bookings_p{year}_")
+            )
+            cold = _year_partition(year)
+            self.db.execute(text(
+                f"CREATE TABLE {cold} (LIKE bookings INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ))
+            self._moving_rows()
+            for name in months:
+                self.db.execute(text(f"ALTER TABLE bookings DETACH PARTITION {name}"))
+                self.db.execute(text(f"INSERT INTO {cold} SELECT * FROM {name}"))
+                self.db.execute(text(f"DROP TABLE {name}"))
+            self.db.execute(text(
+                f"WITH moved AS ("
+                f"  DELETE FROM bookings_default"
+                f"  WHERE booking_date >= :start AND booking_date < :end RETURNING *"
+                f") INSERT INTO {cold} SELECT * FROM moved"
+            ), {"start": year_start, "end": year_end})
+            self._attach(cold, year_start, year_end)
+            self.db.commit()
+            
+            archived.append(cold)
+            logger.info("Archived %s monthly booking partitions into %s", len(months), cold)
+        
+        return archived
@@ -1,13 +1,54 @@
-from typing import List
+from typing import Dict, List
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only
 from fastapi import HTTPException, status
 from app.models.booking import Booking, BookingStatus
 from app.models.user import User, UserRole
-from app.schemas.booking import BookingCreate, BookingUpdate
+from app.schemas.booking import BookingCreate, BookingResponse, BookingUpdate
+from app.core.events import booking_events
+from app.core.exceptions import FOREIGN_KEY_VIOLATION, is_violation
+from app.services.maid_stats_service import MaidStatsService
+from app.services.booking_partition_service import archive_horizon_start
+from app.core.tracing import traced
 import re
 
 
+# Status a maid may move a booking to, mapped to the status it may come from.
+# A single source status per target lets bulk updates know each row's old status.
+MAID_STATUS_TRANSITIONS = {
+    BookingStatus.ACCEPTED: (BookingStatus.PENDING,),
+    BookingStatus.CANCELED: (BookingStatus.PENDING,),
+    BookingStatus.COMPLETED: (BookingStatus.ACCEPTED,),
+}
+
+
+def _booking_response_options():
+    """
+    Loader options for booking read paths.
+    Only the columns serialized by BookingResponse are fetched; the joined
+    customer/maid rows are limited to the UserDetail fields (id, full_name)
+    instead of full User rows with password hash, bio, skills and schedule.
+    """
+    return (
+        load_only(
+            Booking.id,
+            Booking.customer_id,
+            Booking.maid_id,
+            Booking.service_type,
+            Booking.booking_date,
+            Booking.time_slot,
+            Booking.status,
+            Booking.total_amount,
+            Booking.notes,
+            Booking.created_at,
+        ),
+        joinedload(Booking.customer).load_only(User.id, User.full_name),
+        joinedload(Booking.maid).load_only(User.id, User.full_name),
+    )
+
+
 class BookingService:
     def __init__(self, db: Session):
         self.db = db
@@ -25,48 +66,81 @@ class BookingService:
                 return None
         return None
     
+    @traced
     def create_booking(self, customer_id: UUID, booking_data: BookingCreate) -> Booking:
-        booking = Booking(
-            customer_id=customer_id,
-            maid_id=booking_data.maid_id,
-            service_type=booking_data.service_type,
-            booking_date=booking_data.booking_date,
-            time_slot=booking_data.time_slot,
-            notes=booking_data.notes,
-            status=BookingStatus.PENDING
-        )
-        
         # Extract proposed rate from notes and calculate total_amount if provided
         proposed_rate = self._extract_proposed_rate(booking_data.notes)
         if proposed_rate:
-            booking.total_amount = proposed_rate
+            total_amount = proposed_rate
         else:
-            # Use maid's hourly rate if no proposed rate
-            maid = self.db.query(User).filter(User.id == booking_data.maid_id).first()
-            if maid and maid.hourly_rate:
-                booking.total_amount = maid.hourly_rate
+            # Use maid's hourly rate if no proposed rate, resolved inside the INSERT
+            total_amount = (
+                select(User.hourly_rate)
+                .where(User.id == booking_data.maid_id)
+                .scalar_subquery()
+            )
         
-        self.db.add(booking)
+        # INSERT ... RETURNING hydrates the Booking without a refresh SELECT;
+        # the maid_id foreign key replaces a pre-check that the maid exists
+        try:
+            booking = self.db.scalar(
+                insert(Booking)
+                .values(
+                    customer_id=customer_id,
+                    maid_id=booking_data.maid_id,
+                    service_type=booking_data.service_type,
+                    booking_date=booking_data.booking_date,
+                    time_slot=booking_data.time_slot,
+                    notes=booking_data.notes,
+                    status=BookingStatus.PENDING,
+                    total_amount=total_amount
+                )
+                .returning(Booking)
+            )
+        except IntegrityError as e:
+            self.db.rollback()
+            if is_violation(e, FOREIGN_KEY_VIOLATION, "bookings_maid_id_fkey"):
+                raise HTTPException(status_code=404, detail="Maid not found")
+            raise
+        MaidStatsService(self.db).record_created(booking.maid_id)
+        booking_events.publish(
+            self.db,
+            "booking.created",
+            BookingResponse.model_validate(booking).model_dump(mode="json"),
+            recipients=[booking.customer_id, booking.maid_id]
+        )
         self.db.commit()
-        self.db.refresh(booking)
         
         return booking
     
-    def get_user_bookings(self, user_id: UUID, role: UserRole) -> List[Booking]:
-        query = self.db.query(Booking).options(
-            joinedload(Booking.customer),
-            joinedload(Booking.maid)
-        )
+    @traced
+    def get_user_bookings(self, user_id: UUID, role: UserRole, include_archived: bool = False) -> List[Booking]:
         if role == UserRole.CUSTOMER or role == "customer":
-            return query.filter(Booking.customer_id == user_id).all()
+            owner = Booking.customer_id == user_id
         else:  # MAID - role == UserRole.MAID or role == "maid"
-            return query.filter(Booking.maid_id == user_id).all()
+            owner = Booking.maid_id == user_id
+        query = self.db.query(Booking).filter(owner)
+        if not include_archived:
+            # Only finished history is hidden past the horizon; pending and
+            # accepted bookings stay listed whatever their date. Two branches
+            # rather than an OR, so PostgreSQL can still prune partitions: the
+            # hot branch is bounded by the horizon, the open branch reads the
+            # older partitions through the partial idx_bookings_*_open indexes
+            horizon = archive_horizon_start()
+            query = query.filter(Booking.booking_date >= horizon).union_all(
+                self.db.query(Booking).filter(
+                    owner,
+                    Booking.booking_date < horizon,
+                    Booking.status.in_([BookingStatus.PENDING, BookingStatus.ACCEPTED])
+                )
+            )
+        return query.options(*_booking_response_options()).all()
     
+    @traced
     def get_booking_detail(self, booking_id: UUID, current_user: User) -> Booking:
         """Get booking details if user is authorized (customer or assigned maid)"""
         booking = self.db.query(Booking).options(
-            joinedload(Booking.customer),
-            joinedload(Booking.maid)
+            *_booking_response_options()
         ).filter(Booking.id == booking_id).first()
         
         if not booking:
@@ -81,8 +155,13 @@ class BookingService:
         
         return booking
     
+    @traced
     def update_booking(self, booking_id: UUID, current_user: User, booking_update: BookingUpdate) -> Booking:
-        booking = self.db.query(Booking).filter(Booking.id == booking_id).first()
+        # Lock the row so concurrent updates see each other's status and
+        # record_transitions applies each change to maid_stats exactly once
+        booking = self.db.query(Booking).options(
+            *_booking_response_options()
+        ).filter(Booking.id == booking_id).with_for_update(of=Booking).populate_existing().first()
         
         if not booking:
             raise HTTPException(status_code=404, detail="Booking not found")
@@ -100,7 +179,107 @@ class BookingService:
         for field, value in update_data.items():
             setattr(booking, field, value)
         
+        if booking.status != old_status:
+            MaidStatsService(self.db).record_transitions(
+                booking.maid_id,
+                [(booking, old_status, booking.status)],
+                by_maid=current_user.role == UserRole.MAID
+            )
+        booking_events.publish(
+            self.db,
+            "booking.updated",
+            {"id": str(booking.id), **booking_update.model_dump(mode="json", exclude_unset=True)},
+            recipients=[booking.customer_id, booking.maid_id]
+        )
         self.db.commit()
-        self.db.refresh(booking)
         
         return booking
+
+    @traced
+    def bulk_update_status(
+        self,
+        current_user: User,
+        booking_ids: List[UUID],
+        new_status: BookingStatus
+    ) -> List[Dict]:
+        """
+        Move several of the maid's bookings to `new_status` in one UPDATE.
+        Ownership and the allowed source statuses are part of the WHERE clause;
+        rows that were not updated are explained with a single follow-up SELECT.
+        Returns one result per requested id, in request order.
+        """
+        if current_user.role != UserRole.MAID:
+            raise HTTPException(status_code=403, detail="Only maids can bulk update bookings")
+        
+        allowed_from = MAID_STATUS_TRANSITIONS.get(new_status)
+        if not allowed_from:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Bookings cannot be bulk moved to '{new_status.value}'"
+            )
+        
+        booking_ids = list(dict.fromkeys(booking_ids))
+        updated = self.db.execute(
+            update(Booking)
+            .where(
+                Booking.id.in_(booking_ids),
+                Booking.maid_id == current_user.id,
+                Booking.status.in_(allowed_from)
+            )
+            .values(status=new_status)
+            .returning(
+                Booking.id,
+                Booking.customer_id,
+                Booking.created_at,
+                Booking.booking_date,
+                Booking.total_amount
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        MaidStatsService(self.db).record_transitions(
+            current_user.id,
+            [(row, allowed_from[0], new_status) for row in updated],
+            by_maid=True
+        )
+        booking_events.publish_many(self.db, [
+            (
+                "booking.updated",
+                {"id": str(row.id), "status": new_status.value},
+                [row.customer_id, current_user.id]
+            )
+            for row in updated
+        ])
+        self.db.commit()
+        updated_ids = {row.id for row in updated}
+        
+        failed_ids = [booking_id for booking_id in booking_ids if booking_id not in updated_ids]
+        current = {}
+        if failed_ids:
+            current = {
+                row.id: row
+                for row in self.db.query(Booking.id, Booking.maid_id, Booking.status)
+                .filter(Booking.id.in_(failed_ids))
+            }
+        
+        results = []
+        for booking_id in booking_ids:
+            if booking_id in updated_ids:
+                results.append({"booking_id": booking_id, "updated": True, "status": new_status})
+                continue
+            
+            row = current.get(booking_id)
+            if row is None:
+                detail, status_value = "Booking not found", None
+            elif row.maid_id != current_user.id:
+                detail, status_value = "Not authorized", None
+            else:
+                detail = f"Cannot change status from '{row.status.value}' to '{new_status.value}'"
+                status_value = row.status
+            results.append({
+                "booking_id": booking_id,
+                "updated": False,
+                "status": status_value,
+                "detail": detail,
+            })
+        
+        return results
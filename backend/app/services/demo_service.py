@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
 from app.core.security import get_password_hash, verify_password
 from app.core.config import settings
+from app.core.invalidation import invalidation_bus
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ class DemoService:
         ).first()
         
         if not customer:
-            logger.info(f"Creating demo customer account: {settings.DEMO_CUSTOMER_EMAIL}")
+            logger.info("Creating demo customer account: %s", settings.DEMO_CUSTOMER_EMAIL)
             customer = User(
                 email=settings.DEMO_CUSTOMER_EMAIL,
                 hashed_password=get_password_hash(settings.DEMO_PASSWORD),
@@ -50,7 +51,7 @@ class DemoService:
         ).first()
         
         if not maid:
-            logger.info(f"Creating demo maid account: {settings.DEMO_MAID_EMAIL}")
+            logger.info("Creating demo maid account: %s", settings.DEMO_MAID_EMAIL)
             maid = User(
                 email=settings.DEMO_MAID_EMAIL,
                 hashed_password=get_password_hash(settings.DEMO_PASSWORD),
@@ -124,6 +125,7 @@ class DemoService:
             user.experience_years = 3
             user.hourly_rate = 25.00
         
+        invalidation_bus.publish(self.db, "profile", [user.id])
         self.db.commit()
-        logger.info(f"Demo account reset: {email}")
+        logger.info("Demo account reset: %s", email)
         return True
@@ -1,15 +1,23 @@
 from typing import List, Optional
 from uuid import UUID
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from app.models.user import User, UserRole
+from app.schemas.user import UserPublicProfile, UserResponse
+from app.services.user_service import UserService
+from app.core.coalescing import read_coalescer
+from app.core.tracing import traced
 from fastapi import HTTPException
 
+_MAID_LIST = TypeAdapter(List[UserResponse])
+
 
 class MaidService:
     def __init__(self, db: Session):
         self.db = db
     
+    @traced
     def search_maids(
         self,
         skill: Optional[str] = None,
@@ -34,6 +42,27 @@ class MaidService:
         
         return query.all()
     
+    @traced
+    def search_maids_json(
+        self,
+        skill: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        max_rate: Optional[float] = None
+    ) -> bytes:
+        """
+        search_maids serialized as a JSON list of UserResponse. The result is
+        public, so identical concurrent searches share one query and payload.
+        """
+        key = (skill or None, min_experience, max_rate)
+        # End the read transaction (e.g. the auth lookup) so waiting on an
+        # identical search doesn't hold a pooled connection
+        self.db.commit()
+        return read_coalescer.do("maids.search", key, lambda: _MAID_LIST.dump_json(
+            _MAID_LIST.validate_python(
+                self.search_maids(skill, min_experience, max_rate), from_attributes=True
+            )
+        ))
+    
     def get_maid_by_id(self, maid_id: UUID) -> User:
         maid = self.db.query(User).filter(
             and_(
@@ -46,3 +75,13 @@ class MaidService:
             raise HTTPException(status_code=404, detail="Maid not found")
         
         return maid
+    
+    @traced
+    def get_maid_profile(self, maid_id: UUID) -> UserPublicProfile:
+        """Public maid profile from the shared profile cache."""
+        profile = UserService(self.db).get_public_profile(maid_id)
+        
+        if not profile or profile.role != UserRole.MAID:
+            raise HTTPException(status_code=404, detail="Maid not found")
+        
+        return profile
@@ -0,0 +1,250 @@
+"""
+Incrementally maintained per-maid booking statistics.
+Booking writes call into this service inside their own transaction, so the
+aggregates commit (or roll back) together with the booking change. Reads are
+primary-key lookups and don't depend on booking history size.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import Date, case, cast, delete, func, insert, literal, literal_column, select, text
+from sqlalchemy.orm import Session
+from app.database import upsert_insert
+from app.models.booking import Booking, BookingStatus
+from app.models.maid_stats import MaidEarnings, MaidStats
+from app.core.tracing import traced
+
+# Number of recent weeks/months returned by get_stats
+EARNINGS_PERIODS = 12
+
+_STATUS_COLUMNS = {
+    BookingStatus.PENDING: "pending_bookings",
+    BookingStatus.ACCEPTED: "accepted_bookings",
+    BookingStatus.COMPLETED: "completed_bookings",
+    BookingStatus.CANCELED: "canceled_bookings",
+}
+
+
+def _period_starts(booking_date: datetime) -> Tuple[Tuple[str, date], ...]:
+    """Week (Monday) and month buckets, matching PostgreSQL date_trunc."""
+    day = booking_date.date()
+    return (
+        ("week", day - timedelta(days=day.weekday())),
+        ("month", day.replace(day=1)),
+    )
+
+
+def _period_start_expr(dialect: str, period: str, column):
+    """SQL for the start of `column`'s week (Monday) or month, as _period_starts."""
+    if dialect == "sqlite":
+        modifiers = ("'-6 days'", "'weekday 1'") if period == "week" else ("'start of month'",)
+        return func.date(column, *(literal_column(m) for m in modifiers))
+    # Literal unit so SELECT and GROUP BY render the identical expression
+    return cast(func.date_trunc(literal_column(f"'{period}'"), column), Date)
+
+
+def _seconds_between(dialect: str, start, end):
+    if dialect == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return func.extract("epoch", end - start)
+
+
+class MaidStatsService:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def record_created(self, maid_id: UUID) -> None:
+        """Account for a new pending booking."""
+        self._apply(maid_id, {"total_bookings": 1, "pending_bookings": 1}, {})
+    
+    def record_transitions(
+        self,
+        maid_id: UUID,
+        transitions: Iterable[Tuple[Booking, BookingStatus, BookingStatus]],
+        by_maid: bool
+    ) -> None:
+        """
+        Account for status changes of the maid's bookings.
+        `transitions` yields (booking, old_status, new_status); the booking needs
+        created_at, booking_date and total_amount loaded.
+        """
+        stats: Dict[str, float] = defaultdict(float)
+        periods: Dict[Tuple[str, date], list] = defaultdict(lambda: [0, 0.0])
+        now = datetime.now(timezone.utc)
+        
+        for booking, old_status, new_status in transitions:
+            if old_status == new_status:
+                continue
+            stats[_STATUS_COLUMNS[old_status]] -= 1
+            stats[_STATUS_COLUMNS[new_status]] += 1
+            
+            if BookingStatus.COMPLETED in (old_status, new_status):
+                sign = 1 if new_status == BookingStatus.COMPLETED else -1
+                amount = booking.total_amount or 0.0
+                stats["total_earnings"] += sign * amount
+                for period in _period_starts(booking.booking_date):
+                    periods[period][0] += sign
+                    periods[period][1] += sign * amount
+            
+            if by_maid and old_status == BookingStatus.PENDING and new_status in (
+                BookingStatus.ACCEPTED, BookingStatus.CANCELED
+            ):
+                created_at = booking.created_at
+                if created_at.tzinfo is None:
+                    created_at = created_at.replace(tzinfo=timezone.utc)
+                stats["acceptances" if new_status == BookingStatus.ACCEPTED else "declines"] += 1
+                stats["responses"] += 1
+                stats["response_seconds_total"] += max(0.0, (now - created_at).total_seconds())
+        
+        self._apply(maid_id, stats, periods)
+    
+    def _apply(self, maid_id: UUID, stats: Dict[str, float], periods: Dict[Tuple[str, date], list]) -> None:
+        stats = {column: delta for column, delta in stats.items() if delta}
+        if stats:
+            stmt = upsert_insert(self.db, MaidStats).values(maid_id=maid_id, **stats)
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[MaidStats.maid_id],
+                set_={
+                    **{column: getattr(MaidStats, column) + stmt.excluded[column] for column in stats},
+                    "updated_at": func.now(),
+                }
+            ))
+        
+        rows = [
+            {
+                "maid_id": maid_id,
+                "period": period,
+                "period_start": period_start,
+                "completed_bookings": count,
+                "earnings": earnings,
+            }
+            for (period, period_start), (count, earnings) in periods.items()
+            if count or earnings
+        ]
+        if rows:
+            stmt = upsert_insert(self.db, MaidEarnings).values(rows)
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[MaidEarnings.maid_id, MaidEarnings.period, MaidEarnings.period_start],
+                set_={
+                    "completed_bookings": MaidEarnings.completed_bookings + stmt.excluded.completed_bookings,
+                    "earnings": MaidEarnings.earnings + stmt.excluded.earnings,
+                }
+            ))
+    
+    @traced
+    def get_stats(self, maid_id: UUID) -> dict:
+        stats = self.db.get(MaidStats, maid_id)
+        
+        def recent(period: str):
+            return self.db.query(MaidEarnings).filter(
+                MaidEarnings.maid_id == maid_id,
+                MaidEarnings.period == period,
+                MaidEarnings.completed_bookings > 0
+            ).order_by(MaidEarnings.period_start.desc()).limit(EARNINGS_PERIODS).all()
+        
+        if stats is None:
+            stats = MaidStats(
+                maid_id=maid_id, total_bookings=0, pending_bookings=0, accepted_bookings=0,
+                completed_bookings=0, canceled_bookings=0, total_earnings=0.0,
+                acceptances=0, declines=0, responses=0, response_seconds_total=0.0,
+            )
+        
+        decisions = stats.acceptances + stats.declines
+        return {
+            "total_bookings": stats.total_bookings,
+            "pending_bookings": stats.pending_bookings,
+            "accepted_bookings": stats.accepted_bookings,
+            "completed_jobs": stats.completed_bookings,
+            "canceled_bookings": stats.canceled_bookings,
+            "total_earnings": round(stats.total_earnings, 2),
+            "acceptance_rate": round(stats.acceptances / decisions, 4) if decisions else None,
+            "average_response_seconds": (
+                round(stats.response_seconds_total / stats.responses, 1) if stats.responses else None
+            ),
+            "earnings_by_week": recent("week"),
+            "earnings_by_month": recent("month"),
+        }
+    
+    def rebuild(self, maid_id: Optional[UUID] = None) -> None:
+        """
+        Recompute aggregates from the bookings table in set-based statements
+        (PostgreSQL; SQLite for tests).
+        
+        Decisions follow record_transitions: a booking the maid accepted is
+        an acceptance, one the maid declined a decline, and responses are their
+        sum. Booking history doesn't record who canceled a booking or when
+        it was accepted, so for backfilled rows accepted and completed
+        bookings count as acceptances, every cancellation counts as a
+        decline, and response time is approximated by updated_at - created_at
+        of bookings still in accepted/canceled status; completed bookings are
+        given the average of those.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            # Booking writes upsert deltas into these tables. Make them wait
+            # until the rebuilt rows commit, so a delta is applied either to
+            # rows this rebuild already counted it in, or on top of them
+            # afterwards; never to rows about to be deleted.
+            self.db.execute(text("LOCK TABLE maid_stats, maid_earnings IN SHARE ROW EXCLUSIVE MODE"))
+        stats_delete = delete(MaidStats)
+        earnings_delete = delete(MaidEarnings)
+        bookings = select(Booking).subquery()
+        if maid_id is not None:
+            stats_delete = stats_delete.where(MaidStats.maid_id == maid_id)
+            earnings_delete = earnings_delete.where(MaidEarnings.maid_id == maid_id)
+            bookings = select(Booking).where(Booking.maid_id == maid_id).subquery()
+        self.db.execute(stats_delete)
+        self.db.execute(earnings_delete)
+        
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+        
+        accepted = bookings.c.status.in_([BookingStatus.ACCEPTED, BookingStatus.COMPLETED])
+        declined = bookings.c.status == BookingStatus.CANCELED
+        # Bookings whose updated_at still marks the maid's response
+        timed = bookings.c.status.in_([BookingStatus.ACCEPTED, BookingStatus.CANCELED])
+        timed_seconds = func.sum(case((
+            timed, _seconds_between(dialect, bookings.c.created_at, bookings.c.updated_at)
+        ), else_=0))
+        self.db.execute(insert(MaidStats).from_select(
+            [
+                "maid_id", "total_bookings", "pending_bookings", "accepted_bookings",
+                "completed_bookings", "canceled_bookings", "total_earnings",
+                "acceptances", "declines", "responses", "response_seconds_total",
+            ],
+            select(
+                bookings.c.maid_id,
+                func.count(),
+                count_where(bookings.c.status == BookingStatus.PENDING),
+                count_where(bookings.c.status == BookingStatus.ACCEPTED),
+                count_where(bookings.c.status == BookingStatus.COMPLETED),
+                count_where(bookings.c.status == BookingStatus.CANCELED),
+                func.coalesce(func.sum(case(
+                    (bookings.c.status == BookingStatus.COMPLETED, bookings.c.total_amount), else_=0
+                )), 0),
+                count_where(accepted),
+                count_where(declined),
+                count_where(accepted | declined),
+                func.coalesce(
+                    timed_seconds * count_where(accepted | declined) / func.nullif(count_where(timed), 0), 0
+                ),
+            ).group_by(bookings.c.maid_id)
+        ))
+        
+        for period in ("week", "month"):
+            period_start = _period_start_expr(dialect, period, bookings.c.booking_date)
+            self.db.execute(insert(MaidEarnings).from_select(
+                ["maid_id", "period", "period_start", "completed_bookings", "earnings"],
+                select(
+                    bookings.c.maid_id,
+                    literal(period),
+                    period_start,
+                    func.count(),
+                    func.coalesce(func.sum(bookings.c.total_amount), 0),
+                )
+                .where(bookings.c.status == BookingStatus.COMPLETED)
+                .group_by(bookings.c.maid_id, period_start)
+            ))
+        
+        self.db.commit()
@@ -1,17 +1,26 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Set
 from uuid import UUID
-from sqlalchemy.orm import Session
+import base64
+from sqlalchemy import Numeric, and_, case, cast, exists, func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
 from fastapi import HTTPException, status
+from app.core.coalescing import read_coalescer
+from app.core.exceptions import UNIQUE_VIOLATION, is_violation
+from app.core.invalidation import invalidation_bus
 from app.models.review import Review
 from app.models.booking import Booking, BookingStatus
 from app.models.user import User, UserRole
-from app.schemas.review import ReviewCreate
+from app.schemas.review import MaidReviewsPage, ReviewCreate
+from app.core.tracing import traced
 
 
 class ReviewService:
     def __init__(self, db: Session):
         self.db = db
     
+    @traced
     def create_review(self, customer_id: UUID, review_data: ReviewCreate) -> Review:
         # Verify booking exists and belongs to customer
         booking = self.db.query(Booking).filter(
@@ -26,18 +35,7 @@ class ReviewService:
                 detail="Booking not found or not completed"
             )
         
-        # Check if review already exists
-        existing_review = self.db.query(Review).filter(
-            Review.booking_id == review_data.booking_id
-        ).first()
-        
-        if existing_review:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Review already exists for this booking"
-            )
-        
-        # Create review
+        # Create review; the unique constraint on booking_id rejects duplicates
         review = Review(
             booking_id=review_data.booking_id,
             customer_id=customer_id,
@@ -47,17 +45,97 @@ class ReviewService:
         )
         
         self.db.add(review)
-        self.db.commit()
-        self.db.refresh(review)
+        try:
+            self.db.flush()
+        except IntegrityError as e:
+            self.db.rollback()
+            if not is_violation(e, UNIQUE_VIOLATION, "reviews_booking_id_key"):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Review already exists for this booking"
+            )
         
-        # Update maid's average rating
-        self._update_maid_rating(booking.maid_id)
+        # Update maid's rating aggregate in the same transaction
+        self._add_maid_rating(booking.maid_id, review_data.rating)
+        invalidation_bus.publish(self.db, "profile", [booking.maid_id])
+        self.db.commit()
         
         return review
     
-    def get_maid_reviews(self, maid_id: UUID) -> List[Review]:
-        return self.db.query(Review).filter(Review.maid_id == maid_id).all()
+    @traced
+    def get_maid_reviews(self, maid_id: UUID, limit: int = 20, cursor: Optional[str] = None) -> dict:
+        """
+        One page of a maid's reviews, newest first, keyed on (created_at, id).
+        The first page (no cursor) also carries the rating summary.
+        """
+        query = self.db.query(Review).filter(Review.maid_id == maid_id)
+        if cursor is not None:
+            created_at, review_id = _decode_cursor(cursor)
+            query = query.filter(
+                tuple_(Review.created_at, Review.id)
+                < tuple_(created_at, review_id, types=[Review.created_at.type, Review.id.type])
+            )
+        
+        reviews = query.order_by(Review.created_at.desc(), Review.id.desc()).limit(limit + 1).all()
+        page = {"items": reviews[:limit], "next_cursor": None}
+        if len(reviews) > limit:
+            page["next_cursor"] = _encode_cursor(reviews[limit - 1])
+        if cursor is None:
+            page["summary"] = self.get_rating_summary(maid_id)
+        return page
+    
+    @traced
+    def get_maid_reviews_json(self, maid_id: UUID, limit: int = 20, cursor: Optional[str] = None) -> bytes:
+        """
+        get_maid_reviews serialized as a MaidReviewsPage. Reviews are public,
+        so identical concurrent page requests share one query and payload.
+        """
+        # Release the connection before possibly waiting (see search_maids_json)
+        self.db.commit()
+        return read_coalescer.do("reviews.maid", (maid_id, limit, cursor), lambda: MaidReviewsPage.model_validate(
+            self.get_maid_reviews(maid_id, limit, cursor), from_attributes=True
+        ).model_dump_json().encode())
+    
+    def get_rating_summary(self, maid_id: UUID) -> dict:
+        """Count, average and star histogram from the maid's rating aggregate."""
+        maid = self.db.query(User).options(
+            load_only(User.average_rating, User.rating_count, *_HISTOGRAM_COLUMNS)
+        ).filter(User.id == maid_id, User.role == UserRole.MAID).first()
+        
+        if not maid:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Maid not found"
+            )
+        
+        return {
+            "count": maid.rating_count,
+            "average_rating": maid.average_rating or 0.0,
+            "histogram": {
+                stars: getattr(maid, column.key)
+                for stars, column in enumerate(_HISTOGRAM_COLUMNS, start=1)
+            },
+        }
+    
+    @traced
+    def review_exists(self, booking_id: UUID, customer_id: UUID) -> bool:
+        """Whether the customer has reviewed the booking."""
+        return bool(self.db.scalar(
+            select(exists().where(Review.booking_id == booking_id, Review.customer_id == customer_id))
+        ))
+    
+    @traced
+    def get_reviewed_booking_ids(self, booking_ids: List[UUID], customer_id: UUID) -> Set[UUID]:
+        """The subset of `booking_ids` the customer has reviewed, in one query."""
+        return set(self.db.scalars(
+            select(Review.booking_id).where(
+                Review.booking_id.in_(booking_ids),
+                Review.customer_id == customer_id,
+            )
+        ))
     
+    @traced
     def get_booking_review(self, booking_id: UUID, current_user: User) -> Review:
         """Get review for a specific booking. Only customer can view their reviews."""
         review = self.db.query(Review).filter(Review.booking_id == booking_id).first()
@@ -77,13 +155,98 @@ class ReviewService:
         
         return review
     
-    def _update_maid_rating(self, maid_id: UUID):
-        from sqlalchemy import func
-        avg_rating = self.db.query(func.avg(Review.rating)).filter(
-            Review.maid_id == maid_id
-        ).scalar()
+    def rebuild_ratings(self, maid_id: Optional[UUID] = None) -> None:
+        """
+        Recompute the rating totals and star histogram from reviews
+        for one maid, or all maids, in a single aggregate pass.
+        """
+        totals = select(
+            Review.maid_id,
+            func.count().label("rating_count"),
+            func.sum(Review.rating).label("rating_sum"),
+            *(
+                func.sum(case((_in_bucket(Review.rating, stars), 1), else_=0)).label(column.key)
+                for stars, column in enumerate(_HISTOGRAM_COLUMNS, start=1)
+            ),
+        ).group_by(Review.maid_id)
+        if maid_id is not None:
+            totals = totals.where(Review.maid_id == maid_id)
+        totals = totals.subquery()
         
-        maid = self.db.query(User).filter(User.id == maid_id).first()
-        if maid and avg_rating:
-            maid.average_rating = round(avg_rating, 2)
-            self.db.commit()
+        maids = [User.role == UserRole.MAID]
+        if maid_id is not None:
+            maids.append(User.id == maid_id)
+        
+        self.db.execute(
+            update(User)
+            .where(User.id == totals.c.maid_id)
+            .values(
+                rating_count=totals.c.rating_count,
+                rating_sum=totals.c.rating_sum,
+                average_rating=_average(totals.c.rating_sum, totals.c.rating_count),
+                **{column.key: totals.c[column.key] for column in _HISTOGRAM_COLUMNS},
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            update(User)
+            .where(*maids, ~exists().where(Review.maid_id == User.id))
+            .values(
+                rating_count=0,
+                rating_sum=0,
+                average_rating=0,
+                **{column.key: 0 for column in _HISTOGRAM_COLUMNS},
+            )
+            .execution_options(synchronize_session=False)
+        )
+        invalidation_bus.publish(self.db, "profile")
+        self.db.commit()
+    
+    def _add_maid_rating(self, maid_id: UUID, rating: float) -> None:
+        # One atomic row update; concurrent reviews serialize on the row lock
+        bucket = _HISTOGRAM_COLUMNS[min(5, max(1, int(rating))) - 1]
+        self.db.execute(
+            update(User)
+            .where(User.id == maid_id)
+            .values(
+                rating_count=User.rating_count + 1,
+                rating_sum=User.rating_sum + rating,
+                average_rating=_average(User.rating_sum + rating, User.rating_count + 1),
+                **{bucket.key: bucket + 1},
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+_HISTOGRAM_COLUMNS = (
+    User.rating_1_count,
+    User.rating_2_count,
+    User.rating_3_count,
+    User.rating_4_count,
+    User.rating_5_count,
+)
+
+
+def _average(total, count):
+    return func.round(cast(total, Numeric) / count, 2)
+
+
+def _in_bucket(rating, stars: int):
+    # Floor of the rating; 5.0 is the only value in the 5-star bucket
+    return and_(rating >= stars, rating < stars + 1)
+
+
+def _encode_cursor(review: Review) -> str:
+    raw = f"{review.created_at.isoformat()}|{review.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, review_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(review_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
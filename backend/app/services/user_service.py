@@ -1,8 +1,16 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, load_only
+from app.core.cache import profile_cache
+from app.core.invalidation import invalidation_bus
 from app.models.user import User
-from app.schemas.user import UserUpdate
+from app.schemas.user import UserPublicProfile, UserUpdate
+from app.core.tracing import traced
+
+# Columns serialized by UserPublicProfile; contact details and
+# hashed_password are never loaded
+_PUBLIC_PROFILE_COLUMNS = tuple(getattr(User, field) for field in UserPublicProfile.model_fields)
 
 
 class UserService:
@@ -12,15 +20,63 @@ class UserService:
     def get_user_by_id(self, user_id: UUID) -> Optional[User]:
         return self.db.query(User).filter(User.id == user_id).first()
     
-    def update_user(self, user_id: UUID, user_update: UserUpdate) -> User:
-        user = self.get_user_by_id(user_id)
-        if not user:
-            raise ValueError("User not found")
+    @traced
+    def get_public_profile(self, user_id: UUID) -> Optional[UserPublicProfile]:
+        """Public profile projection, served from the per-worker profile cache."""
+        profile = profile_cache.get(user_id)
+        if profile is None:
+            user = self.db.query(User).options(
+                load_only(*_PUBLIC_PROFILE_COLUMNS)
+            ).filter(User.id == user_id).first()
+            if not user:
+                return None
+            profile = UserPublicProfile.model_validate(user)
+            profile_cache.set(user_id, profile)
+        return profile
+    
+    @traced
+    def get_public_profiles(self, user_ids: List[UUID]) -> Tuple[List[UserPublicProfile], List[UUID]]:
+        """
+        Public profiles for `user_ids` in request order, plus the ids that
+        don't exist. Cache misses are loaded with one IN query.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        profiles = {}
+        for user_id in user_ids:
+            profile = profile_cache.get(user_id)
+            if profile is not None:
+                profiles[user_id] = profile
         
+        to_load = [user_id for user_id in user_ids if user_id not in profiles]
+        if to_load:
+            users = self.db.query(User).options(
+                load_only(*_PUBLIC_PROFILE_COLUMNS)
+            ).filter(User.id.in_(to_load)).all()
+            for user in users:
+                profile = profiles[user.id] = UserPublicProfile.model_validate(user)
+                profile_cache.set(user.id, profile)
+        
+        found = [profiles[user_id] for user_id in user_ids if user_id in profiles]
+        missing = [user_id for user_id in user_ids if user_id not in profiles]
+        return found, missing
+    
+    @traced
+    def update_user(self, user_id: UUID, user_update: UserUpdate) -> User:
         update_data = user_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(user, field, value)
+        if not update_data:
+            user = self.get_user_by_id(user_id)
+        else:
+            # Single UPDATE ... RETURNING; refreshes the identity-mapped user in place
+            user = self.db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(**update_data)
+                .returning(User)
+                .execution_options(populate_existing=True)
+            ).scalar_one_or_none()
+            invalidation_bus.publish(self.db, "profile", [user_id])
+            self.db.commit()
         
-        self.db.commit()
-        self.db.refresh(user)
+        if not user:
+            raise ValueError("User not found")
         return user
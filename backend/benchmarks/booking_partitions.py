@@ -0,0 +1,191 @@
+"""
+Partitioned vs. heap bookings table at scale (PostgreSQL only).
+
+Generates synthetic bookings server-side with generate_series into a scratch
+schema, once as a plain heap and once range-partitioned by month like
+database/migrations/002_partition_bookings.sql, then compares the queries
+BookingService issues: the listed history (bookings within the archive
+horizon plus older open ones, as a UNION ALL so both branches prune), the
+same filter written as an OR (which can't prune), full history, maid status
+counts and lookup by id.
+
+Usage: python -m benchmarks.booking_partitions --database-url postgresql://... \
+           [--rows 10000000] [--years 5] [--keep]
+"""
+import argparse
+import json
+import statistics
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+
+from benchmarks import common  # noqa: F401  (sets config defaults)
+from app.services.booking_partition_service import archive_horizon_start
+
+SCHEMA = "bench_partitions"
+COLUMNS = """
+    id UUID NOT NULL,
+    customer_id UUID NOT NULL,
+    maid_id UUID NOT NULL,
+    service_type VARCHAR(255) NOT NULL,
+    booking_date TIMESTAMP NOT NULL,
+    time_slot VARCHAR(100),
+    status TEXT NOT NULL,
+    total_amount FLOAT,
+    notes TEXT,
+    created_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE
+"""
+
+QUERIES = {
+    "customer history (listed)":
+        "SELECT * FROM {table} WHERE customer_id = :customer_id AND booking_date >= :horizon "
+        "UNION ALL SELECT * FROM {table} WHERE customer_id = :customer_id "
+        "AND booking_date < :horizon AND status IN ('pending', 'accepted')",
+    "customer history (listed, OR)":
+        "SELECT * FROM {table} WHERE customer_id = :customer_id "
+        "AND (booking_date >= :horizon OR status IN ('pending', 'accepted'))",
+    "customer history (all)":
+        "SELECT * FROM {table} WHERE customer_id = :customer_id",
+    "maid status counts (horizon)":
+        "SELECT status, count(*) FROM {table} "
+        "WHERE maid_id = :maid_id AND booking_date >= :horizon GROUP BY status",
+    "lookup by id":
+        "SELECT * FROM {table} WHERE id = :booking_id",
+}
+
+
+def _generate(conn, rows: int, years: int) -> None:
+    customers, maids = max(1, rows // 50), max(1, rows // 500)
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.bookings_heap ({COLUMNS}, PRIMARY KEY (id))"))
+    conn.execute(text(
+        f"CREATE TABLE {SCHEMA}.bookings_part ({COLUMNS}, PRIMARY KEY (id, booking_date)) "
+        f"PARTITION BY RANGE (booking_date)"
+    ))
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.bookings_part_default PARTITION OF {SCHEMA}.bookings_part DEFAULT"))
+    conn.execute(text(f"""
+        DO $$
+        DECLARE month_start DATE;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc('month', now() - interval '{years} years'),
+                    date_trunc('month', now()) + interval '3 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE {SCHEMA}.%I PARTITION OF {SCHEMA}.bookings_part FOR VALUES FROM (%L) TO (%L)',
+                    'bookings_p' || to_char(month_start, 'YYYY_MM'),
+                    month_start, (month_start + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """))
+
+    print(f"generating {rows:,} bookings ({customers:,} customers, {maids:,} maids, {years} years)...")
+    conn.execute(text(f"""
+        INSERT INTO {SCHEMA}.bookings_heap
+        SELECT
+            md5(i::text)::uuid,
+            ('00000000-0000-0000-0000-' || lpad((i % {customers})::text, 12, '0'))::uuid,
+            ('00000000-0000-0000-0001-' || lpad((i % {maids})::text, 12, '0'))::uuid,
+            'Deep Cleaning',
+            d,
+            '09:00-12:00',
+            CASE
+                WHEN d < now() - interval '30 days' THEN
+                    CASE WHEN random() < 0.9 THEN 'completed' ELSE 'canceled' END
+                ELSE CASE WHEN random() < 0.5 THEN 'pending' ELSE 'accepted' END
+            END,
+            25 + (i % 50),
+            'Proposed Hourly Rate: $25.00',
+            d - interval '3 days',
+            d
+        FROM (
+            SELECT i, now() - random() * interval '{years} years' AS d
+            FROM generate_series(1, {rows}) AS i
+        ) src
+    """))
+    conn.execute(text(f"INSERT INTO {SCHEMA}.bookings_part SELECT * FROM {SCHEMA}.bookings_heap"))
+
+    for table in ("bookings_heap", "bookings_part"):
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (customer_id, booking_date DESC)"))
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (maid_id, booking_date DESC)"))
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (maid_id, status)"))
+        conn.execute(text(
+            f"CREATE INDEX ON {SCHEMA}.{table} (customer_id) WHERE status IN ('pending', 'accepted')"
+        ))
+    conn.execute(text(f"CREATE INDEX ON {SCHEMA}.bookings_part (id)"))
+
+
+def _plan_stats(plan: dict) -> tuple:
+    """(relations scanned, shared buffers touched) for a JSON plan tree."""
+    relations, buffers = set(), 0
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if "Relation Name" in node:
+            relations.add(node["Relation Name"])
+            buffers += node.get("Shared Hit Blocks", 0) + node.get("Shared Read Blocks", 0)
+        stack.extend(node.get("Plans", []))
+    return len(relations), buffers
+
+
+def _explain(conn, sql: str, params: dict, repeat: int) -> dict:
+    timings, scanned, buffers = [], 0, 0
+    for _ in range(repeat):
+        result = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()
+        plan = (json.loads(result) if isinstance(result, str) else result)[0]
+        timings.append(plan["Execution Time"] + plan.get("Planning Time", 0))
+        scanned, buffers = _plan_stats(plan["Plan"])
+    return {"ms": statistics.median(timings), "relations": scanned, "buffers": buffers}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the generated schema")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    try:
+        with engine.begin() as conn:
+            _generate(conn, args.rows, args.years)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.bookings_heap"))
+            conn.execute(text(f"ANALYZE {SCHEMA}.bookings_part"))
+
+        with engine.connect() as conn:
+            sample = conn.execute(text(
+                f"SELECT id, customer_id, maid_id FROM {SCHEMA}.bookings_heap "
+                f"WHERE booking_date >= now() - interval '1 month' LIMIT 1"
+            )).one()
+            params = {
+                "customer_id": sample.customer_id,
+                "maid_id": sample.maid_id,
+                "booking_id": sample.id,
+                "horizon": archive_horizon_start(datetime.utcnow()),
+            }
+
+            print(f"{'query':<30} {'table':<6} {'ms':>9} {'relations':>10} {'buffers':>9}")
+            for name, template in QUERIES.items():
+                for label, table in (("heap", "bookings_heap"), ("part", "bookings_part")):
+                    result = _explain(conn, template.format(table=f"{SCHEMA}.{table}"), params, args.repeat)
+                    print(
+                        f"{name:<30} {label:<6} {result['ms']:>9.3f} "
+                        f"{result['relations']:>10} {result['buffers']:>9}"
+                    )
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Booking read path: full joined User rows vs. column-projected loads.
+
+Compares the previous `joinedload(Booking.customer)/joinedload(Booking.maid)`
+query against the options used by BookingService, reporting the bytes of
+row data fetched and the ORM hydration time per 1k bookings.
+
+Usage: python -m benchmarks.booking_projection [--bookings 1000] [--database-url URL]
+"""
+import argparse
+import uuid
+from datetime import datetime
+
+from sqlalchemy.orm import joinedload
+
+from benchmarks.common import make_session, seed_bookings, seed_users, timed
+from app.models import Booking
+from app.services.booking_service import _booking_response_options
+
+
+def _value_size(value) -> int:
+    """Approximate wire size of a fetched column value."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, uuid.UUID):
+        return 16
+    if isinstance(value, (int, float, datetime)):
+        return 8
+    return len(str(value).encode("utf-8"))
+
+
+def _fetched_bytes(db, query) -> int:
+    rows = db.connection().execute(query.statement).all()
+    return sum(_value_size(value) for row in rows for value in row)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    db = make_session(args.database_url)
+    customers, maids = seed_users(db, customers=1, maids=50)
+    customer = customers[0]
+    seed_bookings(db, customer, maids, args.bookings)
+
+    variants = {
+        "full": (joinedload(Booking.customer), joinedload(Booking.maid)),
+        "projected": _booking_response_options(),
+    }
+
+    results = {}
+    for name, options in variants.items():
+        query = db.query(Booking).options(*options).filter(Booking.customer_id == customer.id)
+
+        def hydrate():
+            db.expunge_all()
+            return query.all()
+
+        results[name] = {
+            "bytes": _fetched_bytes(db, query),
+            "seconds": timed(hydrate),
+        }
+
+    scale = 1000 / args.bookings
+    print(f"bookings: {args.bookings} ({db.bind.dialect.name})")
+    for name, result in results.items():
+        print(
+            f"  {name:<10} {result['bytes'] * scale / 1024:9.1f} KiB/1k  "
+            f"{result['seconds'] * scale * 1000:8.2f} ms/1k"
+        )
+    full, projected = results["full"], results["projected"]
+    print(
+        f"  saved      {(full['bytes'] - projected['bytes']) * scale / 1024:9.1f} KiB/1k  "
+        f"{(full['seconds'] - projected['seconds']) * scale * 1000:8.2f} ms/1k"
+    )
+
+
+if __name__ == "__main__":
+    main()
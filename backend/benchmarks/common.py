@@ -0,0 +1,136 @@
+"""
+Shared helpers for benchmark scripts.
+Benchmarks build their own engine (SQLite in-memory by default, or any
+DATABASE_URL passed on the command line) and seed synthetic data through
+the application models, so they never touch the configured database.
+"""
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+# app.core.config requires these at import time; benchmarks don't use them.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import User, UserRole, Booking, BookingStatus, Review  # noqa: F401
+
+
+def make_session(database_url: str = "sqlite://") -> Session:
+    """Create tables on a fresh engine and return a session bound to it."""
+    if database_url.startswith("sqlite"):
+        engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def seed_users(db: Session, customers: int, maids: int) -> Tuple[List[User], List[User]]:
+    """Insert customers and maids with realistic profile sizes."""
+    customer_rows = [
+        User(
+            email=f"customer{i}@bench.maidease.com",
+            hashed_password="$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 64,
+            full_name=f"Bench Customer {i}",
+            phone_number="+1-555-000-0000",
+            role=UserRole.CUSTOMER,
+            is_active=True,
+        )
+        for i in range(customers)
+    ]
+    maid_rows = [
+        User(
+            email=f"maid{i}@bench.maidease.com",
+            hashed_password="$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 64,
+            full_name=f"Bench Maid {i}",
+            phone_number="+1-555-000-0000",
+            role=UserRole.MAID,
+            is_active=True,
+            bio="Experienced cleaner with attention to detail. " * 8,
+            skills="House Cleaning, Deep Cleaning, Organization, Laundry",
+            experience_years=5,
+            hourly_rate=25.0,
+            availability_schedule="Mon-Fri 09:00-17:00; Sat 10:00-14:00",
+            average_rating=4.5,
+        )
+        for i in range(maids)
+    ]
+    db.add_all(customer_rows + maid_rows)
+    db.commit()
+    return customer_rows, maid_rows
+
+
+def seed_bookings(db: Session, customer: User, maids: List[User], count: int) -> None:
+    """Insert `count` bookings for one customer spread across maids."""
+    start = datetime(2025, 1, 1, 9, 0)
+    db.add_all(
+        Booking(
+            id=uuid.uuid4(),
+            customer_id=customer.id,
+            maid_id=maids[i % len(maids)].id,
+            service_type="Deep Cleaning",
+            booking_date=start + timedelta(hours=i),
+            time_slot="09:00-12:00",
+            status=BookingStatus.COMPLETED,
+            total_amount=75.0,
+            notes="Proposed Hourly Rate: $25.00",
+        )
+        for i in range(count)
+    )
+    db.commit()
+
+
+def timed(fn: Callable[[], object], repeat: int = 7) -> float:
+    """Median wall time of `fn` in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def make_client(db: Session):
+    """
+    TestClient for the real ASGI app with `get_db` bound to the benchmark engine.
+    Requires httpx (see benchmarks/requirements.txt).
+    """
+    from fastapi.testclient import TestClient
+    from app.core.idempotency import idempotency_store
+    from app.database import SessionLocal, get_db
+    from app.main import app
+
+    session_factory = sessionmaker(**{**SessionLocal.kw, "bind": db.bind})
+    idempotency_store.configure(session_factory)
+
+    def _get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    return TestClient(app)
+
+
+def auth_headers(user: User) -> dict:
+    """Bearer header for `user` without going through the login endpoint."""
+    from app.core.security import create_access_token
+
+    token = create_access_token(
+        {"user_id": str(user.id), "email": user.email, "role": user.role.value}
+    )
+    return {"Authorization": f"Bearer {token}"}
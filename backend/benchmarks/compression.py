@@ -0,0 +1,102 @@
+"""
+Response compression: CPU cost vs. bytes saved for typical payloads.
+
+Fetches real uncompressed responses from the app (maid list, my-bookings,
+a page of maid reviews, a single profile) and, for gzip and brotli at a
+few levels, reports the compressed size, the median compression time and
+the microseconds spent per KB saved. The last column is the cost of a
+compressed-cache hit (hashing the body) for comparison.
+
+Usage: python -m benchmarks.compression [--maids 100] [--bookings 200] [--reviews 20]
+"""
+import argparse
+import gzip
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.common import auth_headers, make_client, make_session, seed_bookings, seed_users, timed
+from app.models import Booking, Review
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _payloads(maids: int, bookings: int, reviews: int) -> dict:
+    db = make_session()
+    customers, maid_rows = seed_users(db, customers=1, maids=maids)
+    customer, maid = customers[0], maid_rows[0]
+    seed_bookings(db, customer, maid_rows, bookings)
+    seed_bookings(db, customer, [maid], reviews)
+
+    completed = db.query(Booking).filter(Booking.maid_id == maid.id).limit(reviews).all()
+    start = datetime(2025, 6, 1)
+    db.add_all(
+        Review(
+            id=uuid.uuid4(),
+            booking_id=booking.id,
+            customer_id=customer.id,
+            maid_id=maid.id,
+            rating=4.0 + (i % 2),
+            comment="Very thorough and punctual, would book again. " * 3,
+            created_at=start + timedelta(hours=i),
+        )
+        for i, booking in enumerate(completed)
+    )
+    db.commit()
+
+    client = make_client(db)
+    headers = {**auth_headers(customer), "Accept-Encoding": "identity"}
+    paths = {
+        f"GET /maids ({maids})": "/api/v1/maids",
+        f"GET /bookings/my-bookings ({bookings})": "/api/v1/bookings/my-bookings?include_archived=true",
+        f"GET /reviews/maid/{{id}} ({len(completed)})": f"/api/v1/reviews/maid/{maid.id}",
+        "GET /users/{id}": f"/api/v1/users/{maid.id}",
+    }
+    payloads = {}
+    for name, path in paths.items():
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, (path, response.text)
+        payloads[name] = response.content
+    return payloads
+
+
+def _codecs() -> dict:
+    codecs = {f"gzip-{level}": (lambda body, level=level: gzip.compress(body, level, mtime=0)) for level in (1, 6, 9)}
+    if brotli is not None:
+        for quality in (1, 4, 8, 11):
+            codecs[f"br-{quality}"] = lambda body, quality=quality: brotli.compress(body, quality=quality)
+    return codecs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--maids", type=int, default=100)
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--reviews", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=21)
+    args = parser.parse_args()
+
+    payloads = _payloads(args.maids, args.bookings, args.reviews)
+    if brotli is None:
+        print("(brotli not installed: gzip only)")
+
+    print(f"{'payload':<34} {'codec':<8} {'bytes':>9} {'ratio':>6} {'us':>9} {'us/KB saved':>12} {'cache hit us':>13}")
+    for name, body in payloads.items():
+        hit = timed(lambda: hashlib.sha256(body).digest(), args.repeat) * 1e6
+        print(f"{name:<34} {'none':<8} {len(body):>9}")
+        for codec, compress in _codecs().items():
+            compressed = compress(body)
+            seconds = timed(lambda: compress(body), args.repeat)
+            saved_kb = (len(body) - len(compressed)) / 1024
+            per_kb = f"{seconds * 1e6 / saved_kb:.1f}" if saved_kb > 0 else "-"
+            print(
+                f"{'':<34} {codec:<8} {len(compressed):>9} {len(compressed) / len(body):>6.2f} "
+                f"{seconds * 1e6:>9.1f} {per_kb:>12} {hit:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
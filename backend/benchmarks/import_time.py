@@ -0,0 +1,77 @@
+"""
+Cold-start import profile for app.main.
+
+Imports app.main in fresh interpreters with `python -X importtime` and
+reports the median total, the slowest modules by self time and the app.*
+modules by cumulative time. The budget itself is enforced by
+tests/test_import_time.py; use this to find what pushed it over.
+
+Usage: python -m benchmarks.import_time [--runs 5] [--top 15]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_times(module: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for every import, in order."""
+    env = dict(os.environ)
+    # app.core.config requires these at import time
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "import-time-check")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    import_times(args.module)  # warm the OS file cache
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [next(cumulative for name, _, cumulative, _ in rows if name == args.module) / 1000 for rows in runs]
+
+    # Per-module medians across runs
+    self_ms: Dict[str, List[float]] = {}
+    cumulative_ms: Dict[str, List[float]] = {}
+    for rows in runs:
+        for name, self_us, cumulative_us, _ in rows:
+            self_ms.setdefault(name, []).append(self_us / 1000)
+            cumulative_ms.setdefault(name, []).append(cumulative_us / 1000)
+    median_self = {name: statistics.median(values) for name, values in self_ms.items()}
+    median_cumulative = {name: statistics.median(values) for name, values in cumulative_ms.items()}
+
+    print("Slowest modules by self time:")
+    for name, ms in sorted(median_self.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+    print("\napp modules by cumulative time:")
+    app_modules = [(name, ms) for name, ms in median_cumulative.items() if name.split(".")[0] == "app"]
+    for name, ms in sorted(app_modules, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    print(f"\nimport {args.module}: median {statistics.median(totals):.1f} ms over {args.runs} runs")
+
+
+if __name__ == "__main__":
+    main()
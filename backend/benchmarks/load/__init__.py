@@ -0,0 +1,10 @@
+"""
+End-to-end HTTP load benchmark.
+
+Drives the real ASGI app (middleware, thread limiters, pool, deadlines)
+in-process against a database loaded with synthetic data, with weighted
+scenario mixes at a fixed concurrency. Reports req/s, p50/p95/p99 and
+statements per request for each scenario, saves the results as a JSON
+baseline, and compares a run against a baseline, exiting non-zero on
+regressions. See __main__.py for usage.
+"""
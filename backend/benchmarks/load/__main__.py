@@ -0,0 +1,166 @@
+"""
+Run the HTTP load benchmark, or compare two result files.
+
+Point --database-url at a scratch local PostgreSQL database: tables are
+created if missing and synthetic users, maids and bookings are added on
+every run. Without it, a temporary SQLite file is used; that is fine for
+trying the scenarios, but its numbers aren't comparable to PostgreSQL.
+The rate limit is raised so the limiter's cost is measured without
+throttling the virtual users.
+
+Usage:
+  python -m benchmarks.load run --database-url postgresql://localhost/maidease_load \\
+      [--mix mixed] [--concurrency 32] [--duration 30] [--warmup 5] \\
+      [--output load.json] [--baseline baseline.json] [--threshold 10]
+  python -m benchmarks.load compare baseline.json load.json [--threshold 10]
+
+Mixes: browse, mixed, write, or "scenario=weight,..." over browse_maids,
+view_profile, maid_reviews, demo_login, create_booking, list_bookings, review.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run a scenario mix and save the results")
+    run.add_argument("--database-url", help="scratch database (default: temporary SQLite file)")
+    run.add_argument("--mix", default="mixed")
+    run.add_argument("--concurrency", type=int, default=32)
+    run.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    run.add_argument("--warmup", type=float, default=5.0, help="seconds discarded before measuring")
+    run.add_argument("--maids", type=int, default=50)
+    run.add_argument("--bookings-per-user", type=int, default=50)
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--output", default="load.json")
+    run.add_argument("--baseline", help="compare against this result file after the run")
+    run.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+
+    cmp = commands.add_parser("compare", help="compare a result file against a baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    return parser.parse_args()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_results(results: dict) -> None:
+    print(f"{'scenario':<16} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}")
+    rows = list(results["scenarios"].items()) + [("overall", results["overall"])]
+    for name, row in rows:
+        latency = row["latency_ms"] or {}
+        print(
+            f"{name:<16} {row['requests']:>9} {row['errors']:>7} {row['req_per_s']:>9.1f} "
+            f"{latency.get('p50', 0):>9.1f} {latency.get('p95', 0):>9.1f} {latency.get('p99', 0):>9.1f} "
+            f"{row['db_queries_per_request'] or 0:>8.2f}"
+        )
+
+
+def _compare_and_exit(baseline: dict, current: dict, threshold: float) -> None:
+    from benchmarks.load.runner import compare
+
+    regressions = compare(baseline, current, threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {threshold}% against the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {threshold}% against the baseline.")
+
+
+def _run(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so configure the app before importing it
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='maidease-load-')}/load.db"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "load-benchmark-secret-key")
+    os.environ.setdefault("RATE_LIMIT_REQUESTS", "1000000000")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    from benchmarks.load.runner import count_statements, run_load
+    from benchmarks.load.scenarios import parse_mix, seed_dataset
+    from app.core.startup import startup_tasks
+    from app.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.services.demo_service import DemoService
+
+    mix = parse_mix(args.mix)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        data = seed_dataset(db, args.concurrency, args.maids, args.bookings_per_user)
+        if "demo_login" in mix:
+            DemoService(db).ensure_demo_accounts_exist()
+    finally:
+        db.close()
+    count_statements(engine)
+
+    async def main() -> dict:
+        await app.router.startup()
+        try:
+            deadline = time.monotonic() + 60
+            while not startup_tasks.is_ready and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+            return await run_load(app, data, mix, args.concurrency, args.duration, args.warmup, args.seed)
+        finally:
+            await app.router.shutdown()
+
+    print(
+        f"{engine.dialect.name}: {args.concurrency} virtual users, mix {args.mix}, "
+        f"{args.warmup:g}s warm-up + {args.duration:g}s measured"
+    )
+    results = asyncio.run(main())
+    results["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "mix": mix,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "seed": args.seed,
+    }
+    _print_results(results)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            _compare_and_exit(json.load(f), results, args.threshold)
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.command == "run":
+        _run(args)
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    _print_results(current)
+    _compare_and_exit(baseline, current, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
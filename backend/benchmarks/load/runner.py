@@ -0,0 +1,141 @@
+"""
+Closed-loop load generation, per-scenario statistics and baseline comparison.
+
+Virtual users run concurrently in one event loop against the ASGI app
+through httpx's ASGITransport. Each picks a weighted scenario, sends it,
+and sends the next one as soon as the response arrives. Samples from the
+warm-up period are discarded.
+
+Statements are counted per request through a context variable. The app's
+threads inherit the request's context, so only the statements a request
+caused are counted, including any SET LOCAL sent by the deadline hook.
+"""
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import event
+
+from benchmarks.load.scenarios import SCENARIOS, Dataset, VirtualUser
+
+_statements: ContextVar[Optional[List[int]]] = ContextVar("load_statements", default=None)
+
+# (seconds, status code, statements)
+Sample = Tuple[float, int, int]
+
+
+def count_statements(engine) -> None:
+    """Count statements per request on `engine` (see _statements)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(*args):
+        counter = _statements.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+async def _virtual_user(client: httpx.AsyncClient, user: VirtualUser, data: Dataset,
+                        mix: Dict[str, float], rng: random.Random, record_from: float,
+                        stop_at: float, samples: Dict[str, List[Sample]]) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < stop_at:
+        name = rng.choices(names, weights)[0]
+        counter = [0]
+        token = _statements.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await SCENARIOS[name](client, user, data, rng)
+            status = response.status_code
+        except Exception:
+            status = 599  # the app raised instead of answering
+        finally:
+            _statements.reset(token)
+        if start >= record_from:
+            samples[name].append((time.perf_counter() - start, status, counter[0]))
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples: List[Sample], seconds: float) -> dict:
+    latencies = sorted(s[0] * 1000 for s in samples)
+    statuses: Dict[str, int] = {}
+    for _, status, _ in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(1 for s in samples if s[1] >= 400)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "statuses": statuses,
+        "req_per_s": round(len(samples) / seconds, 2),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2),
+            "p50": round(_percentile(latencies, 50), 2),
+            "p95": round(_percentile(latencies, 95), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2),
+        } if latencies else None,
+        "db_queries_per_request": round(sum(s[2] for s in samples) / len(samples), 2) if samples else None,
+    }
+
+
+async def run_load(app, data: Dataset, mix: Dict[str, float], concurrency: int,
+                   duration: float, warmup: float, seed: int) -> dict:
+    """Run `concurrency` virtual users for warmup + duration seconds; return the summary."""
+    samples: Dict[str, List[Sample]] = {name: [] for name in mix}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load.test", timeout=None) as client:
+        start = time.perf_counter()
+        record_from = start + warmup
+        stop_at = record_from + duration
+        await asyncio.gather(*(
+            _virtual_user(
+                client, data.users[i % len(data.users)], data, mix,
+                random.Random(seed + i), record_from, stop_at, samples,
+            )
+            for i in range(concurrency)
+        ))
+        # The last requests finish after stop_at; measure to when they did
+        measured = time.perf_counter() - record_from
+
+    everything = [sample for name in samples for sample in samples[name]]
+    return {
+        "overall": summarize(everything, measured),
+        "scenarios": {name: summarize(s, measured) for name, s in samples.items() if s},
+    }
+
+
+def compare(baseline: dict, current: dict, threshold_pct: float) -> List[str]:
+    """
+    Regressions of `current` against `baseline`: p95 latency or throughput
+    worse by more than threshold_pct, error rate up by more than a point,
+    or more statements per request (deterministic, so any real increase).
+    """
+    regressions = []
+
+    def check(name: str, base: dict, cur: dict) -> None:
+        if not base["latency_ms"] or not cur["latency_ms"]:
+            return
+        base_p95, cur_p95 = base["latency_ms"]["p95"], cur["latency_ms"]["p95"]
+        if base_p95 and (cur_p95 - base_p95) / base_p95 * 100 > threshold_pct:
+            regressions.append(f"{name}: p95 {base_p95:.1f}ms -> {cur_p95:.1f}ms")
+        base_rps, cur_rps = base["req_per_s"], cur["req_per_s"]
+        if base_rps and (base_rps - cur_rps) / base_rps * 100 > threshold_pct:
+            regressions.append(f"{name}: throughput {base_rps:.1f} -> {cur_rps:.1f} req/s")
+        if cur["error_rate"] - base["error_rate"] > 0.01:
+            regressions.append(f"{name}: error rate {base['error_rate']:.2%} -> {cur['error_rate']:.2%}")
+        base_q, cur_q = base["db_queries_per_request"], cur["db_queries_per_request"]
+        if base_q is not None and cur_q is not None and cur_q - base_q >= 0.5:
+            regressions.append(f"{name}: queries/request {base_q:.2f} -> {cur_q:.2f}")
+
+    check("overall", baseline["overall"], current["overall"])
+    for name, base in baseline["scenarios"].items():
+        if name in current["scenarios"]:
+            check(name, base, current["scenarios"][name])
+    return regressions
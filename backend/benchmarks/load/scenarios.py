@@ -0,0 +1,179 @@
+"""
+Load scenarios, scenario mixes and the synthetic dataset they run against.
+
+Each scenario issues one request as a virtual user. Every virtual user is
+its own customer with its own X-Forwarded-For address, so the rate limiter
+and the per-user caches see distinct clients.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from sqlalchemy.orm import Session
+
+from benchmarks.common import auth_headers
+from app.models import Booking, BookingStatus, User, UserRole
+
+API = "/api/v1"
+# Not a real Argon2 hash; seeded users never log in with a password
+_PASSWORD_HASH = "$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 64
+
+
+@dataclass
+class VirtualUser:
+    customer: User
+    headers: Dict[str, str]
+    # Completed bookings not reviewed yet; each review scenario uses one
+    reviewable: List[uuid.UUID] = field(default_factory=list)
+
+
+@dataclass
+class Dataset:
+    users: List[VirtualUser]
+    maid_ids: List[uuid.UUID]
+
+
+def seed_dataset(db: Session, virtual_users: int, maids: int, bookings_per_user: int) -> Dataset:
+    """
+    Insert maids and one customer per virtual user, each with completed past
+    bookings. Emails carry a run tag so repeated runs against one database
+    don't collide.
+    """
+    tag = uuid.uuid4().hex[:8]
+    maid_rows = [
+        User(
+            email=f"load-{tag}-maid{i}@bench.maidease.com",
+            hashed_password=_PASSWORD_HASH,
+            full_name=f"Load Maid {i}",
+            phone_number="+1-555-000-0000",
+            role=UserRole.MAID,
+            is_active=True,
+            bio="Experienced cleaner with attention to detail. " * 8,
+            skills="House Cleaning, Deep Cleaning, Organization, Laundry",
+            experience_years=1 + i % 10,
+            hourly_rate=20.0 + i % 15,
+            availability_schedule="Mon-Fri 09:00-17:00; Sat 10:00-14:00",
+        )
+        for i in range(maids)
+    ]
+    customer_rows = [
+        User(
+            email=f"load-{tag}-customer{i}@bench.maidease.com",
+            hashed_password=_PASSWORD_HASH,
+            full_name=f"Load Customer {i}",
+            phone_number="+1-555-000-0000",
+            role=UserRole.CUSTOMER,
+            is_active=True,
+        )
+        for i in range(virtual_users)
+    ]
+    db.add_all(maid_rows + customer_rows)
+    db.flush()
+
+    start = datetime(2025, 1, 1, 9, 0)
+    users = []
+    for i, customer in enumerate(customer_rows):
+        bookings = [
+            Booking(
+                id=uuid.uuid4(),
+                customer_id=customer.id,
+                maid_id=maid_rows[(i + j) % maids].id,
+                service_type="Deep Cleaning",
+                booking_date=start + timedelta(days=j, hours=i % 8),
+                time_slot="09:00-12:00",
+                status=BookingStatus.COMPLETED,
+                total_amount=75.0,
+                notes="Proposed Hourly Rate: $25.00",
+            )
+            for j in range(bookings_per_user)
+        ]
+        db.add_all(bookings)
+        headers = {**auth_headers(customer), "X-Forwarded-For": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"}
+        users.append(VirtualUser(customer, headers, [booking.id for booking in bookings]))
+    db.commit()
+    return Dataset(users, [maid.id for maid in maid_rows])
+
+
+Scenario = Callable[[httpx.AsyncClient, VirtualUser, Dataset, random.Random], Awaitable[httpx.Response]]
+
+
+async def browse_maids(client, user, data, rng):
+    return await client.get(f"{API}/maids", headers=user.headers)
+
+
+async def view_profile(client, user, data, rng):
+    return await client.get(f"{API}/users/{rng.choice(data.maid_ids)}", headers=user.headers)
+
+
+async def maid_reviews(client, user, data, rng):
+    return await client.get(f"{API}/reviews/maid/{rng.choice(data.maid_ids)}", headers=user.headers)
+
+
+async def demo_login(client, user, data, rng):
+    return await client.post(f"{API}/auth/demo/login", params={"role": "customer"}, headers=user.headers)
+
+
+async def create_booking(client, user, data, rng):
+    booking = {
+        "maid_id": str(rng.choice(data.maid_ids)),
+        "service_type": "Regular Cleaning",
+        "booking_date": (datetime(2030, 1, 1) + timedelta(hours=rng.randrange(24 * 365))).isoformat(),
+        "time_slot": "09:00-12:00",
+        "notes": "Proposed Hourly Rate: $25.00",
+    }
+    headers = {**user.headers, "Idempotency-Key": str(uuid.uuid4())}
+    return await client.post(f"{API}/bookings", json=booking, headers=headers)
+
+
+async def list_bookings(client, user, data, rng):
+    return await client.get(f"{API}/bookings/my-bookings", params={"include_archived": "true"}, headers=user.headers)
+
+
+async def review(client, user, data, rng):
+    if not user.reviewable:
+        # Out of completed bookings: read reviews instead of failing
+        return await maid_reviews(client, user, data, rng)
+    review_data = {
+        "booking_id": str(user.reviewable.pop()),
+        "rating": rng.choice([3, 4, 4, 5, 5]),
+        "comment": "Very thorough and punctual, would book again.",
+    }
+    return await client.post(f"{API}/reviews", json=review_data, headers=user.headers)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "browse_maids": browse_maids,
+    "view_profile": view_profile,
+    "maid_reviews": maid_reviews,
+    "demo_login": demo_login,
+    "create_booking": create_booking,
+    "list_bookings": list_bookings,
+    "review": review,
+}
+
+# Relative weights; demo_login is low because each one costs an Argon2 verify
+MIXES: Dict[str, Dict[str, float]] = {
+    "browse": {"browse_maids": 40, "view_profile": 30, "maid_reviews": 20, "list_bookings": 10},
+    "mixed": {
+        "browse_maids": 30, "view_profile": 20, "maid_reviews": 10, "list_bookings": 15,
+        "create_booking": 12, "review": 10, "demo_login": 3,
+    },
+    "write": {"create_booking": 50, "review": 30, "list_bookings": 20},
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """A MIXES name, or "scenario=weight,..." e.g. "browse_maids=3,demo_login=1"."""
+    if spec in MIXES:
+        return MIXES[spec]
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
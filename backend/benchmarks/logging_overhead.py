@@ -0,0 +1,138 @@
+"""
+Logging cost on the request thread: synchronous stdout handler vs. queue.
+
+Replays the log calls of two hot paths against each logging setup and
+reports the median microseconds they add to one request:
+
+- register: the five f-string INFO lines `POST /auth/register` used to
+  log, vs. the single lazy `%` line it logs now;
+- 429 flood: one rate-limit rejection warning per request, as during a
+  flood of rejected requests (rate-limited to 10 per minute by the queue
+  setup).
+
+Output goes to a null sink that sleeps `--sink-latency-us` per write to
+stand in for a slow stdout pipe or log driver.
+
+Usage: python -m benchmarks.logging_overhead [--requests 5000] [--repeat 5] [--sink-latency-us 50]
+"""
+import argparse
+import logging
+import queue
+import statistics
+import time
+from logging.handlers import QueueListener
+
+from benchmarks import common  # noqa: F401  (sets config defaults)
+from app.core.logging_config import (
+    TEXT_FORMAT,
+    RateLimitFilter,
+    TextFormatter,
+    _NonBlockingQueueHandler,
+)
+
+
+class _SlowSink:
+    """A write-only stream that takes `latency` seconds per write."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def write(self, text: str) -> None:
+        if self.latency:
+            time.sleep(self.latency)  # blocked on I/O, GIL released
+
+    def flush(self) -> None:
+        pass
+
+
+def _sync_logger(sink: _SlowSink) -> logging.Logger:
+    """The previous setup: basicConfig with a StreamHandler on the request thread."""
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    logger = logging.getLogger("bench.sync")
+    logger.handlers[:] = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _queue_logger(sink: _SlowSink):
+    """The app.core.logging_config setup, writing to `sink`."""
+    output = logging.StreamHandler(sink)
+    output.setFormatter(TextFormatter(TEXT_FORMAT))
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=10000))
+    handler.addFilter(RateLimitFilter(limit=10, window_seconds=60))
+    logger = logging.getLogger("bench.queue")
+    logger.handlers[:] = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    listener = QueueListener(handler.queue, output)
+    listener.start()
+    return logger, listener
+
+
+def _register_before(logger: logging.Logger, n: int) -> None:
+    email, role, user_id = "someone@example.com", "customer", "7f0c5a9e-1111-2222-3333-444455556666"
+    logger.info(f"Registration attempt: email={email}, role={role}")
+    logger.info(f"Creating new user: {email}, role={role}")
+    logger.info(f"Saving user to database: {email}")
+    logger.info(f"User registered successfully: {user_id} ({email})")
+    logger.info(f"Registration successful: user_id={user_id}, email={email}")
+
+
+def _register_after(logger: logging.Logger, n: int) -> None:
+    email, role, user_id = "someone@example.com", "customer", "7f0c5a9e-1111-2222-3333-444455556666"
+    logger.info("User registered: %s (%s, role=%s)", user_id, email, role)
+
+
+def _flood_before(logger: logging.Logger, n: int) -> None:
+    logger.warning(f"Rate limit exceeded for client: 10.0.{n % 256}.1")
+
+
+def _flood_after(logger: logging.Logger, n: int) -> None:
+    logger.warning("Rate limit exceeded for client: %s", f"10.0.{n % 256}.1")
+
+
+def _measure(logger: logging.Logger, log_request, requests: int, repeat: int) -> float:
+    """Median microseconds per request spent in the log calls."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for n in range(requests):
+            log_request(logger, n)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sink-latency-us", type=float, default=50)
+    args = parser.parse_args()
+
+    sink = _SlowSink(args.sink_latency_us / 1e6)
+    sync_logger = _sync_logger(sink)
+    queue_logger, listener = _queue_logger(sink)
+
+    print(f"{'path':<10} {'setup':<28} {'us/request':>11}")
+    try:
+        for path, before, after in (
+            ("register", _register_before, _register_after),
+            ("429 flood", _flood_before, _flood_after),
+        ):
+            for name, logger, log_request in (
+                ("sync handler, f-strings", sync_logger, before),
+                ("queue, f-strings", queue_logger, before),
+                ("queue, lazy %", queue_logger, after),
+            ):
+                per_request = _measure(logger, log_request, args.requests, args.repeat)
+                print(f"{path:<10} {name:<28} {per_request:>11.2f}")
+                listener.stop()  # drain before the next run
+                listener.start()
+    finally:
+        listener.stop()
+
+
+if __name__ == "__main__":
+    main()
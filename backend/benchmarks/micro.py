@@ -0,0 +1,279 @@
+"""
+Micro-benchmarks for the per-request building blocks.
+
+Times each function in isolation with realistic inputs: password hashing,
+JWTs, the rate limiter, proposed-rate parsing, request validation and
+response serialization from ORM objects. Loops are calibrated so each
+repeat runs for at least --min-time. Reported per call:
+- median, min and spread of the repeats;
+- tracemalloc peak (the most Python memory live at once during one call);
+- bytes still allocated after many calls, which should be ~0 unless the
+  function caches or leaks.
+tracemalloc only sees Python's allocator; Argon2's 64 MB work area is
+allocated in C and doesn't show.
+
+Results are written as JSON with sorted keys and rounded values, so two
+releases can be diffed directly, or compared with --compare.
+
+Usage: python -m benchmarks.micro [--filter jwt] [--repeat 7] [--min-time 0.2]
+                                  [--output micro.json] [--compare old.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+import benchmarks.common  # noqa: F401  (sets the env app.core.config needs)
+from pydantic import TypeAdapter
+from starlette.requests import Request
+
+from app.core.rate_limiter import RateLimiter
+from app.core.security import create_access_token, decode_access_token, get_password_hash, verify_password
+from app.models import Booking, BookingStatus, User, UserRole
+from app.schemas.booking import BookingResponse
+from app.schemas.user import UserCreate, UserResponse
+from app.services.booking_service import BookingService
+
+PASSWORD = "Correct-Horse-42-battery"
+
+
+def _run_coroutine(coroutine):
+    """Drive a coroutine that never suspends, without event loop overhead."""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    coroutine.close()
+    raise RuntimeError("coroutine suspended; it can't be benchmarked synchronously")
+
+
+def _maid(i: int = 0) -> User:
+    return User(
+        id=uuid.uuid4(),
+        email=f"maid{i}@example.com",
+        hashed_password="not-serialized",
+        full_name=f"Maria Example {i}",
+        phone_number="+1-555-010-0000",
+        role=UserRole.MAID,
+        is_active=True,
+        created_at=datetime(2025, 3, 1, 12, 0),
+        bio="Experienced cleaner with attention to detail. " * 8,
+        skills="House Cleaning, Deep Cleaning, Organization, Laundry",
+        experience_years=5,
+        hourly_rate=25.0,
+        availability_schedule="Mon-Fri 09:00-17:00; Sat 10:00-14:00",
+        average_rating=4.6,
+        rating_count=38,
+    )
+
+
+def _booking(customer: User, maid: User, i: int = 0) -> Booking:
+    return Booking(
+        id=uuid.uuid4(),
+        customer_id=customer.id,
+        customer=customer,
+        maid_id=maid.id,
+        maid=maid,
+        service_type="Deep Cleaning",
+        booking_date=datetime(2026, 5, 1, 9, 0) + timedelta(days=i),
+        time_slot="09:00-12:00",
+        status=BookingStatus.ACCEPTED,
+        total_amount=75.0,
+        notes="Proposed Hourly Rate: $25.00\nPlease use eco-friendly products; the cat stays inside.",
+        created_at=datetime(2026, 4, 20, 18, 30),
+    )
+
+
+def _request(client_ip: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/maids",
+        "headers": [(b"x-forwarded-for", client_ip.encode()), (b"authorization", b"Bearer x")],
+        "client": ("127.0.0.1", 50000),
+    })
+
+
+def build_benchmarks() -> Dict[str, Callable[[], object]]:
+    """Name -> zero-argument callable performing one operation."""
+    password_hash = get_password_hash(PASSWORD)
+    claims = {"user_id": str(uuid.uuid4()), "email": "customer@example.com", "role": "customer"}
+    token = create_access_token(claims)
+
+    # A client halfway through its window, and one at its limit
+    limiter = RateLimiter(requests_per_window=100, window_seconds=60)
+    now = datetime.utcnow()
+    limiter._requests["10.0.0.1"] = [now - timedelta(seconds=i) for i in range(50, 0, -1)]
+    limiter._requests["10.0.0.2"] = [now - timedelta(seconds=i * 0.5) for i in range(100, 0, -1)]
+    allowed_request, denied_request = _request("10.0.0.1"), _request("10.0.0.2")
+
+    def rate_limit_allowed():
+        result = _run_coroutine(limiter.check_rate_limit(allowed_request))
+        limiter._requests["10.0.0.1"].pop()  # keep the client at 50 requests
+        return result
+
+    booking_service = BookingService(db=None)
+    notes_with_rate = "Proposed Hourly Rate: $27.50\nPlease use eco-friendly products; the cat stays inside."
+    notes_without_rate = "Please use eco-friendly products; the cat stays inside. Key is under the mat."
+
+    signup = {
+        "email": "new.customer@example.com",
+        "full_name": "New Customer",
+        "phone_number": "+1-555-010-9999",
+        "role": "customer",
+        "password": PASSWORD,
+    }
+
+    customer = User(
+        id=uuid.uuid4(), email="customer@example.com", full_name="Carla Customer",
+        role=UserRole.CUSTOMER, is_active=True, created_at=datetime(2025, 1, 5),
+    )
+    maid = _maid()
+    maids = [_maid(i) for i in range(50)]
+    booking = _booking(customer, maid)
+    bookings = [_booking(customer, maids[i], i) for i in range(50)]
+    user_list = TypeAdapter(List[UserResponse])
+    booking_list = TypeAdapter(List[BookingResponse])
+
+    return {
+        "security.get_password_hash": lambda: get_password_hash(PASSWORD),
+        "security.verify_password": lambda: verify_password(PASSWORD, password_hash),
+        "security.create_access_token": lambda: create_access_token(claims),
+        "security.decode_access_token": lambda: decode_access_token(token),
+        "rate_limiter.check_rate_limit[allowed]": rate_limit_allowed,
+        "rate_limiter.check_rate_limit[denied]": lambda: _run_coroutine(limiter.check_rate_limit(denied_request)),
+        "booking._extract_proposed_rate[match]": lambda: booking_service._extract_proposed_rate(notes_with_rate),
+        "booking._extract_proposed_rate[no match]": lambda: booking_service._extract_proposed_rate(notes_without_rate),
+        "schema.UserCreate.validate": lambda: UserCreate.model_validate(signup),
+        "schema.UserResponse.from_orm_json": lambda: UserResponse.model_validate(maid).model_dump_json(),
+        "schema.UserResponse.from_orm_json[50]": lambda: user_list.dump_json(user_list.validate_python(maids, from_attributes=True)),
+        "schema.BookingResponse.from_orm_json": lambda: BookingResponse.model_validate(booking).model_dump_json(),
+        "schema.BookingResponse.from_orm_json[50]": lambda: booking_list.dump_json(booking_list.validate_python(bookings, from_attributes=True)),
+    }
+
+
+def _calibrate(fn: Callable[[], object], min_time: float) -> int:
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time or loops >= 10_000_000:
+            return loops
+        loops *= 10 if time.perf_counter() - start < min_time / 10 else 2
+
+
+def _time(fn: Callable[[], object], repeat: int, min_time: float) -> dict:
+    loops = _calibrate(fn, min_time)
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - start) / loops * 1e9)
+    median = statistics.median(per_call)
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "ns_per_op": round(median, 1),
+        "min_ns": round(min(per_call), 1),
+        "spread_pct": round(statistics.pstdev(per_call) / median * 100, 1) if median else 0.0,
+        "ops_per_s": round(1e9 / median, 1) if median else None,
+    }
+
+
+def _memory(fn: Callable[[], object], calls: int) -> dict:
+    fn()  # let first-call caches (regex, validators) settle before measuring
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(calls):
+            fn()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes": peak - baseline,
+        "retained_bytes_per_op": round((after - before) / calls, 1),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _format_ns(ns: float) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--memory-calls", type=int, default=200, help="calls for retained-memory tracking")
+    parser.add_argument("--output", default="micro.json")
+    parser.add_argument("--compare", help="earlier result file to show the change against")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)["benchmarks"]
+
+    results = {}
+    print(f"{'benchmark':<44} {'per op':>10} {'spread':>7} {'peak':>9} {'retained':>9} {'change':>8}")
+    for name, fn in build_benchmarks().items():
+        if args.filter not in name:
+            continue
+        # Slow functions (Argon2) get fewer memory-tracking calls
+        timing = _time(fn, args.repeat, args.min_time)
+        calls = max(1, min(args.memory_calls, timing["loops"]))
+        results[name] = {**timing, **_memory(fn, calls)}
+
+        change = ""
+        if name in previous:
+            change = f"{(timing['ns_per_op'] / previous[name]['ns_per_op'] - 1) * 100:+.1f}%"
+        row = results[name]
+        print(
+            f"{name:<44} {_format_ns(row['ns_per_op']):>10} {row['spread_pct']:>6.1f}% "
+            f"{row['peak_bytes']:>8}B {row['retained_bytes_per_op']:>8.0f}B {change:>8}"
+        )
+
+    output = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+        },
+        "benchmarks": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Per-request middleware overhead: BaseHTTPMiddleware vs. pure ASGI.
+
+Drives a trivial endpoint through the ASGI interface directly (no server,
+no HTTP client) with no middleware, with the previous BaseHTTPMiddleware
+timing + `app.middleware("http")` rate limiter stack, and with the pure
+ASGI TimingMiddleware + RateLimitMiddleware used by app.main. Reports the
+median microseconds per request and the overhead over the bare app, for
+a JSON response and for a streaming response.
+
+Usage: python -m benchmarks.middleware_overhead [--requests 2000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from benchmarks import common  # noqa: F401  (sets config defaults)
+from app.core.rate_limiter import RateLimiter, RateLimitMiddleware
+from app.main import TimingMiddleware
+
+
+def _limiter() -> RateLimiter:
+    # Every request is allowed; a tiny window keeps the per-client history short
+    # so the limiter's cost stays constant across the run
+    return RateLimiter(requests_per_window=10**9, window_seconds=0.001)
+
+
+def _bare_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(10):
+                yield b"data: x\n\n"
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+def _legacy_app() -> FastAPI:
+    """The middleware stack app.main used before the pure-ASGI rewrite."""
+    app = _bare_app()
+    limiter = _limiter()
+
+    class LegacyTimingMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            start_time = time.time()
+            response = await call_next(request)
+            response.headers["X-Process-Time"] = f"{time.time() - start_time:.4f}"
+            return response
+
+    async def legacy_rate_limit(request: Request, call_next):
+        allowed, remaining, reset_time = await limiter.check_rate_limit(request)
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(limiter.requests_per_window)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        response.headers["X-RateLimit-Reset"] = str(reset_time)
+        return response
+
+    app.add_middleware(LegacyTimingMiddleware)
+    app.middleware("http")(legacy_rate_limit)
+    return app
+
+
+def _asgi_app() -> FastAPI:
+    app = _bare_app()
+    app.add_middleware(TimingMiddleware)
+    app.add_middleware(RateLimitMiddleware, limiter=_limiter())
+    return app
+
+
+async def _drive(app, path: str, requests: int) -> float:
+    """Seconds to serve `requests` sequential GETs of `path`."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def drive_one():
+        body_sent = False
+
+        async def receive():
+            # Like a server: the body once, then block until the client disconnects
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.Event().wait()
+
+        await app(dict(scope), receive, send)
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await drive_one()
+    return time.perf_counter() - start
+
+
+def _measure(app, path: str, requests: int, repeat: int) -> float:
+    """Median microseconds per request."""
+    asyncio.run(_drive(app, path, min(requests, 200)))  # warm up routing/caches
+    samples = [asyncio.run(_drive(app, path, requests)) for _ in range(repeat)]
+    return statistics.median(samples) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stacks = {
+        "no middleware": _bare_app(),
+        "BaseHTTPMiddleware": _legacy_app(),
+        "pure ASGI": _asgi_app(),
+    }
+    print(f"{'endpoint':<10} {'stack':<20} {'us/request':>11} {'overhead':>10}")
+    for path in ("/ping", "/stream"):
+        baseline = None
+        for name, app in stacks.items():
+            per_request = _measure(app, path, args.requests, args.repeat)
+            baseline = per_request if baseline is None else baseline
+            print(f"{path:<10} {name:<20} {per_request:>11.1f} {per_request - baseline:>+10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Database round trips per write endpoint.
+
+Counts the SQL statements and COMMITs each write endpoint issues, including
+the authentication lookup and any lazy loads triggered while serializing the
+response.
+
+Usage: python -m benchmarks.round_trips [--database-url URL]
+"""
+import argparse
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from benchmarks.common import auth_headers, make_client, make_session, seed_bookings, seed_users
+from app.models import Booking, BookingStatus
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args):
+        self.statements += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+    @contextmanager
+    def measure(self, results: dict, name: str):
+        self.statements = self.commits = 0
+        yield
+        results[name] = (self.statements, self.commits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    db = make_session(args.database_url)
+    customers, maids = seed_users(db, customers=1, maids=1)
+    customer, maid = customers[0], maids[0]
+    seed_bookings(db, customer, maids, 2)
+    pending, completed = db.query(Booking).order_by(Booking.booking_date).all()
+    pending.status = BookingStatus.PENDING
+    db.commit()
+    # Resolve ids and tokens up front so the benchmark's own session
+    # doesn't add refresh queries to the counts.
+    maid_id, pending_id, completed_id = maid.id, pending.id, completed.id
+    customer_headers, maid_headers = auth_headers(customer), auth_headers(maid)
+
+    client = make_client(db)
+    counter = StatementCounter(db.bind)
+    results = {}
+
+    with counter.measure(results, "POST /auth/register"):
+        client.post("/api/v1/auth/register", json={
+            "email": "new.user@bench.maidease.com",
+            "full_name": "New User",
+            "password": "BenchPass123",
+            "role": "customer",
+        }).raise_for_status()
+
+    with counter.measure(results, "POST /bookings"):
+        client.post("/api/v1/bookings", headers=customer_headers, json={
+            "maid_id": str(maid_id),
+            "service_type": "Standard Cleaning",
+            "booking_date": "2025-06-01T09:00:00",
+            "time_slot": "09:00-12:00",
+        }).raise_for_status()
+
+    with counter.measure(results, "PUT /bookings/{id}"):
+        client.put(
+            f"/api/v1/bookings/{pending_id}",
+            headers=maid_headers,
+            json={"status": "accepted"},
+        ).raise_for_status()
+
+    with counter.measure(results, "POST /reviews"):
+        client.post("/api/v1/reviews", headers=customer_headers, json={
+            "booking_id": str(completed_id),
+            "rating": 5,
+            "comment": "Great job",
+        }).raise_for_status()
+
+    with counter.measure(results, "PUT /users/me"):
+        client.put(
+            "/api/v1/users/me",
+            headers=maid_headers,
+            json={"bio": "Updated bio", "hourly_rate": 30},
+        ).raise_for_status()
+
+    print(f"{'endpoint':<22} {'statements':>10} {'commits':>8}")
+    for name, (statements, commits) in results.items():
+        print(f"{name:<22} {statements:>10} {commits:>8}")
+
+
+if __name__ == "__main__":
+    main()
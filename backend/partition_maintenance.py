@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script to maintain the partitioned bookings table:
+creates upcoming monthly partitions and archives old years into cold
+yearly partitions. Run daily (e.g. a Render cron job) from the backend directory:
+    python partition_maintenance.py
+"""
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def maintain():
+    """Create upcoming partitions, then archive old ones"""
+    from app.database import SessionLocal
+    from app.services.booking_partition_service import BookingPartitionService
+    
+    db = SessionLocal()
+    try:
+        service = BookingPartitionService(db)
+        created = service.ensure_partitions()
+        print(f"✓ Partitions created: {', '.join(created) or 'none'}")
+        archived = service.archive()
+        print(f"✓ Partitions archived: {', '.join(archived) or 'none'}")
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Error: {e}")
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    success = maintain()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Script to mint an X-Profile-Token for the request profiler.
+Send it as an `X-Profile-Token` header to profile that request, or to read
+the /api/v1/admin/profiling endpoints. Needs PROFILING_SECRET set (and
+PROFILING_ENABLED on the server).
+Run from the backend directory:
+    python profile_token.py [minutes]
+"""
+import sys
+from datetime import timedelta
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+if __name__ == "__main__":
+    from app.core.config import settings
+    from app.core.security import create_profiling_token
+    
+    if not settings.PROFILING_SECRET:
+        print("✗ PROFILING_SECRET is not set")
+        sys.exit(1)
+    
+    minutes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(create_profiling_token(timedelta(minutes=minutes)))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild maid_stats / maid_earnings from the bookings table and the
+users rating totals from the reviews table.
+Run once after applying database/migrations/001_maid_stats.sql,
+004_user_rating_aggregates.sql or 005_review_pagination.sql, or any time the
+aggregates need a backfill.
+Run from the backend directory:
+    python rebuild_maid_stats.py [maid_id]
+"""
+import sys
+from uuid import UUID
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def rebuild(maid_id=None):
+    """Recompute aggregates for one maid, or all maids"""
+    from app.database import SessionLocal
+    from app.services.maid_stats_service import MaidStatsService
+    from app.services.review_service import ReviewService
+    
+    db = SessionLocal()
+    try:
+        MaidStatsService(db).rebuild(maid_id)
+        print(f"✓ Maid stats rebuilt for {maid_id or 'all maids'}")
+        ReviewService(db).rebuild_ratings(maid_id)
+        print(f"✓ Maid ratings rebuilt for {maid_id or 'all maids'}")
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Error: {e}")
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    success = rebuild(UUID(sys.argv[1]) if len(sys.argv) > 1 else None)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,125 @@
+"""
+Shared fixtures: each test gets a fresh in-memory SQLite database with the
+application's tables, plus a customer and a maid to book.
+"""
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# app.core.config requires these at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.deadlines import _Deadline, _deadline, enforce_deadlines
+from app.database import Base, SessionLocal
+from app.models import Booking, BookingStatus, User, UserRole
+
+_PASSWORD_HASH = "$argon2id$v=19$m=65536,t=3,p=4$" + "x" * 64
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    enforce_deadlines(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(**{**SessionLocal.kw, "bind": engine})
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(session_factory):
+    """TestClient for the real app with `get_db` bound to the test database."""
+    from fastapi.testclient import TestClient
+    from app.core.cache import profile_cache
+    from app.database import get_db
+    from app.main import app
+
+    def _get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    profile_cache.clear()
+
+
+def auth_headers(user: User) -> dict:
+    from app.core.security import create_access_token
+
+    token = create_access_token({"user_id": str(user.id), "email": user.email, "role": user.role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def request_deadline(seconds: float):
+    """Run the block as a request with `seconds` left (as DeadlineMiddleware)."""
+    token = _deadline.set(_Deadline("test", time.monotonic() + seconds))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def make_user(db, role: UserRole, **fields) -> User:
+    user = User(
+        email=f"{role.value}-{uuid.uuid4().hex[:8]}@test.maidease.com",
+        hashed_password=_PASSWORD_HASH,
+        full_name=f"Test {role.value.title()}",
+        phone_number="+1-555-000-0000",
+        role=role,
+        is_active=True,
+        **fields,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_booking(db, customer: User, maid: User, **fields) -> Booking:
+    values = {
+        "service_type": "Deep Cleaning",
+        "booking_date": datetime(2030, 1, 1, 9, 0),
+        "time_slot": "09:00-12:00",
+        "status": BookingStatus.PENDING,
+        "total_amount": 75.0,
+        **fields,
+    }
+    booking = Booking(id=uuid.uuid4(), customer_id=customer.id, maid_id=maid.id, **values)
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+@pytest.fixture
+def customer(db):
+    return make_user(db, UserRole.CUSTOMER)
+
+
+@pytest.fixture
+def maid(db):
+    return make_user(db, UserRole.MAID, hourly_rate=25.0)
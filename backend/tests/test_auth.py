@@ -0,0 +1,71 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.api.deps import get_current_user_for_stream
+from app.core.config import settings
+from app.models import UserRole
+from app.schemas.user import UserCreate
+from app.services.auth_service import AuthService
+from tests.conftest import auth_headers
+
+
+def _registration(**fields):
+    values = {
+        "email": "new-customer@test.maidease.com",
+        "password": "correct-horse-42",
+        "full_name": "New Customer",
+        "role": UserRole.CUSTOMER,
+        **fields,
+    }
+    return UserCreate(**values)
+
+
+def test_duplicate_email_is_reported(db, monkeypatch):
+    monkeypatch.setattr("app.services.auth_service.get_password_hash", lambda password: "hash")
+    AuthService(db).register_user(_registration())
+    with pytest.raises(ValueError, match="Email already registered"):
+        AuthService(db).register_user(_registration(full_name="Someone Else"))
+
+
+def test_other_integrity_errors_are_not_reported_as_duplicates(db, monkeypatch):
+    monkeypatch.setattr("app.services.auth_service.get_password_hash", lambda password: None)
+    # hashed_password is NOT NULL
+    with pytest.raises(IntegrityError):
+        AuthService(db).register_user(_registration())
+
+
+def _open_stream(db, ticket):
+    with pytest.raises(HTTPException) as raised:
+        get_current_user_for_stream(db, None, ticket)
+    return raised.value.status_code
+
+
+def test_stream_ticket_opens_the_stream_once(client, db, customer):
+    response = client.post("/api/v1/bookings/events/ticket", headers=auth_headers(customer))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["expires_in"] == settings.SSE_TICKET_TTL_SECONDS
+
+    assert get_current_user_for_stream(db, None, body["ticket"]).id == customer.id
+    assert _open_stream(db, body["ticket"]) == 401
+
+
+def test_stream_ticket_requires_authentication(client):
+    assert client.post("/api/v1/bookings/events/ticket").status_code == 401
+
+
+def test_stream_rejects_expired_tickets_and_access_tokens(db, customer, monkeypatch):
+    monkeypatch.setattr(settings, "SSE_TICKET_TTL_SECONDS", -1)
+    assert _open_stream(db, AuthService(db).issue_stream_ticket(customer)) == 401
+
+    access_token = auth_headers(customer)["Authorization"].split()[1]
+    assert _open_stream(db, access_token) == 401
+    assert get_current_user_for_stream(db, access_token, None).id == customer.id
+
+
+def test_stream_ticket_of_a_deactivated_user_is_refused(db, customer):
+    ticket = AuthService(db).issue_stream_ticket(customer)
+    customer.is_active = False
+    db.commit()
+    assert _open_stream(db, ticket) == 400
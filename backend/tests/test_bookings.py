@@ -0,0 +1,155 @@
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+
+from app.models import Booking, BookingStatus, Review, UserRole
+from app.schemas.booking import BookingCreate, BookingResponse
+from app.services.booking_service import BookingService
+from app.services.maid_stats_service import MaidStatsService
+from tests.conftest import auth_headers, make_booking, make_user
+
+
+def _ids(bookings):
+    return {booking.id for booking in bookings}
+
+
+@contextmanager
+def _statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_finished_bookings_past_the_horizon_are_hidden(db, customer, maid):
+    old = datetime(2000, 1, 1, 9)
+    recent = make_booking(db, customer, maid, status=BookingStatus.COMPLETED)
+    old_completed = make_booking(db, customer, maid, booking_date=old, status=BookingStatus.COMPLETED)
+    old_canceled = make_booking(db, customer, maid, booking_date=old, status=BookingStatus.CANCELED)
+
+    service = BookingService(db)
+    assert _ids(service.get_user_bookings(customer.id, UserRole.CUSTOMER)) == {recent.id}
+    assert _ids(service.get_user_bookings(customer.id, UserRole.CUSTOMER, include_archived=True)) == {
+        recent.id, old_completed.id, old_canceled.id
+    }
+
+
+def test_open_bookings_past_the_horizon_stay_visible(db, customer, maid):
+    old = datetime(2000, 1, 1, 9)
+    pending = make_booking(db, customer, maid, booking_date=old, status=BookingStatus.PENDING)
+    accepted = make_booking(db, customer, maid, booking_date=old, status=BookingStatus.ACCEPTED)
+
+    service = BookingService(db)
+    assert _ids(service.get_user_bookings(customer.id, UserRole.CUSTOMER)) == {pending.id, accepted.id}
+    assert _ids(service.get_user_bookings(maid.id, UserRole.MAID)) == {pending.id, accepted.id}
+
+
+def test_booking_key_includes_the_partition_column(db, customer, maid):
+    assert [column.name for column in inspect(Booking).primary_key] == ["id", "booking_date"]
+
+    booking = make_booking(db, customer, maid, status=BookingStatus.COMPLETED)
+    db.add(Review(booking_id=booking.id, customer_id=customer.id, maid_id=maid.id, rating=5))
+    db.commit()
+    db.expire_all()
+    assert db.get(Booking, (booking.id, booking.booking_date)).review.rating == 5
+
+
+def test_booking_for_an_unknown_maid_is_not_found(engine, db, customer):
+    with engine.connect() as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys = ON")
+    with pytest.raises(HTTPException) as raised:
+        BookingService(db).create_booking(customer.id, BookingCreate(
+            maid_id=uuid.uuid4(), service_type="Deep Cleaning",
+            booking_date=datetime(2030, 1, 1, 9), time_slot="09:00-12:00",
+            notes="Proposed Hourly Rate: $30.00",
+        ))
+    assert raised.value.status_code == 404
+
+
+def test_other_booking_integrity_errors_propagate(db, customer, maid):
+    with pytest.raises(IntegrityError):
+        # service_type is NOT NULL
+        BookingService(db).create_booking(customer.id, BookingCreate.model_construct(
+            maid_id=maid.id, service_type=None,
+            booking_date=datetime(2030, 1, 1, 9), time_slot="09:00-12:00", notes=None,
+        ))
+
+
+@pytest.mark.parametrize("read", ["list", "detail"])
+def test_booking_reads_load_only_the_response_columns(engine, db, customer, maid, read):
+    booking = make_booking(db, customer, maid)
+    db.expunge_all()
+    service = BookingService(db)
+
+    with _statements(engine) as statements:
+        if read == "list":
+            [loaded] = service.get_user_bookings(customer.id, UserRole.CUSTOMER)
+        else:
+            loaded = service.get_booking_detail(booking.id, customer)
+        response = BookingResponse.model_validate(loaded)
+
+    # One query, customer and maid joined in; serializing lazy-loads nothing
+    [sql] = statements
+    assert sql.count("JOIN users") == 2
+    for column in ("hashed_password", "bio", "skills", "availability_schedule", "email"):
+        assert f".{column}" not in sql
+    assert (response.customer.full_name, response.maid.full_name) == (customer.full_name, maid.full_name)
+
+
+def _bulk_status(client, user, booking_ids, status):
+    return client.post(
+        "/api/v1/bookings/bulk-status",
+        json={"booking_ids": [str(booking_id) for booking_id in booking_ids], "status": status},
+        headers=auth_headers(user),
+    )
+
+
+def test_bulk_status_reports_each_booking_in_request_order(client, db, customer, maid):
+    pending = [make_booking(db, customer, maid) for _ in range(2)]
+    completed = make_booking(db, customer, maid, status=BookingStatus.COMPLETED)
+    others = make_booking(db, customer, make_user(db, UserRole.MAID))
+    unknown = uuid.uuid4()
+
+    response = _bulk_status(
+        client, maid, [completed.id, pending[0].id, unknown, others.id, pending[1].id, pending[0].id], "accepted"
+    )
+    assert response.status_code == 200
+    results = [
+        (result["booking_id"], result["updated"], result["status"], result["detail"])
+        for result in response.json()["results"]
+    ]
+    assert results == [
+        (str(completed.id), False, "completed", "Cannot change status from 'completed' to 'accepted'"),
+        (str(pending[0].id), True, "accepted", None),
+        (str(unknown), False, None, "Booking not found"),
+        (str(others.id), False, None, "Not authorized"),
+        (str(pending[1].id), True, "accepted", None),
+    ]
+
+    db.expire_all()
+    assert [db.get(Booking, (b.id, b.booking_date)).status for b in (*pending, completed, others)] == [
+        BookingStatus.ACCEPTED, BookingStatus.ACCEPTED, BookingStatus.COMPLETED, BookingStatus.PENDING
+    ]
+    # Only the two transitions count (make_booking doesn't record creation)
+    stats = MaidStatsService(db).get_stats(maid.id)
+    assert (stats["pending_bookings"], stats["accepted_bookings"], stats["acceptance_rate"]) == (-2, 2, 1.0)
+
+
+def test_bulk_status_only_allows_maid_transitions(client, db, customer, maid):
+    booking = make_booking(db, customer, maid)
+    assert _bulk_status(client, customer, [booking.id], "canceled").status_code == 403
+    assert _bulk_status(client, maid, [booking.id], "pending").status_code == 400
+    # Completing needs an accepted booking
+    [result] = _bulk_status(client, maid, [booking.id], "completed").json()["results"]
+    assert (result["updated"], result["status"]) == (False, "pending")
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    DatabaseUnavailable,
+)
+
+
+def _breaker(**kwargs):
+    options = {
+        "failure_rate": 0.5, "min_calls": 4, "window_seconds": 10,
+        "open_seconds": 0.1, "probe_interval": 0.05, "probe_successes": 2,
+    }
+    return CircuitBreaker(**{**options, **kwargs})
+
+
+def _open(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.record_failure(OSError("connection refused"))
+    assert breaker.state == OPEN
+
+
+def test_stays_closed_below_min_calls_or_failure_rate():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_failure(OSError("connection refused"))
+    assert breaker.state == CLOSED
+
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record_success()
+    breaker.record_failure(OSError("connection refused"))
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_open_breaker_rejects_with_retry_after():
+    breaker = _breaker(open_seconds=5)
+    _open(breaker)
+    with pytest.raises(DatabaseUnavailable) as raised:
+        breaker.before_call()
+    assert raised.value.status_code == 503
+    assert raised.value.headers["Retry-After"] == "5"
+
+    stats = breaker.get_stats()
+    assert (stats["times_opened"], stats["rejected"]) == (1, 1)
+    assert stats["last_error"] == "OSError: connection refused"
+
+
+def test_half_open_lets_one_probe_through_per_interval():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(breaker.open_seconds)
+    assert breaker.state == HALF_OPEN
+
+    breaker.before_call()  # the probe
+    with pytest.raises(DatabaseUnavailable):
+        breaker.before_call()
+    time.sleep(breaker.probe_interval)
+    breaker.before_call()
+
+
+def test_successful_probes_close_the_breaker():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(breaker.open_seconds)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.get_stats()["window"] == {"calls": 0, "failures": 0}
+    breaker.before_call()
+
+
+def test_failed_probe_opens_the_breaker_again():
+    breaker = _breaker()
+    _open(breaker)
+    time.sleep(breaker.open_seconds)
+    breaker.before_call()
+    breaker.record_failure(OSError("connection refused"))
+    assert breaker.state == OPEN
+    assert breaker.get_stats()["times_opened"] == 2
+
+
+def test_disabled_breaker_never_opens():
+    breaker = _breaker(enabled=False)
+    for _ in range(10):
+        breaker.record_failure(OSError("connection refused"))
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_installed_breaker_counts_engine_outcomes():
+    engine = create_engine("sqlite://")
+    breaker = _breaker(min_calls=2)
+    breaker.install(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert breaker.get_stats()["window"] == {"calls": 1, "failures": 0}
+        # SQLite reports a missing table as an OperationalError
+        for _ in range(2):
+            with pytest.raises(exc.OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+    assert breaker.state == OPEN
+    engine.dispose()
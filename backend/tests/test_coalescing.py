@@ -0,0 +1,147 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.core.coalescing import SingleFlight
+from app.core.deadlines import DeadlineExceeded
+from app.database import Base, SessionLocal
+from app.services import maid_service
+from app.services.maid_service import MaidService
+from tests.conftest import request_deadline
+
+
+def _blocking(release: threading.Event, calls: list, result="rows"):
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return result
+    return fn
+
+
+def _wait_until(condition) -> None:
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError("condition never became true")
+
+
+def _wait_for_waiters(group: SingleFlight, count: int) -> None:
+    _wait_until(lambda: group.get_stats()["waiting"] >= count)
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    group, release, calls = SingleFlight(), threading.Event(), []
+    fn = _blocking(release, calls)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(group.do, "maids.search", ("q", 1), fn) for _ in range(4)]
+        _wait_for_waiters(group, 3)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["rows"] * 4
+    assert len(calls) == 1
+    assert group.get_stats()["by_name"]["maids.search"]["coalesced"] == 3
+    assert group.get_stats()["in_flight"] == 0
+
+
+def test_followers_get_the_leaders_exception():
+    group, release = SingleFlight(), threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("database went away")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(group.do, "reviews.maid", "m1", failing) for _ in range(2)]
+        _wait_for_waiters(group, 1)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+    assert group.get_stats()["by_name"]["reviews.maid"]["errors"] == 1
+
+
+def test_different_keys_and_scopes_are_not_shared():
+    group, calls = SingleFlight(), []
+
+    def fn():
+        calls.append(1)
+        return len(calls)
+
+    group.do("bookings", "page1", fn, scope="user-a")
+    group.do("bookings", "page1", fn, scope="user-b")
+    group.do("bookings", "page2", fn, scope="user-a")
+    assert len(calls) == 3
+
+
+def test_nothing_is_cached_after_completion():
+    group, calls = SingleFlight(), []
+    group.do("maids.search", "q", lambda: calls.append(1))
+    group.do("maids.search", "q", lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_follower_runs_itself_when_the_leader_is_stuck():
+    group, release, calls = SingleFlight(wait_timeout=0.05), threading.Event(), []
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(group.do, "maids.search", "q", _blocking(release, calls))
+        _wait_until(lambda: calls)
+        follower = group.do("maids.search", "q", lambda: "own result")
+        release.set()
+        assert leader.result() == "rows"
+    assert follower == "own result"
+    assert group.get_stats()["by_name"]["maids.search"]["timeouts"] == 1
+
+
+def test_follower_wait_ends_at_the_request_deadline():
+    group, release, calls = SingleFlight(wait_timeout=30), threading.Event(), []
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(group.do, "maids.search", "q", _blocking(release, calls))
+        _wait_until(lambda: calls)
+        started = time.monotonic()
+        with request_deadline(0.1):
+            with pytest.raises(DeadlineExceeded):
+                group.do("maids.search", "q", lambda: "own result")
+        release.set()
+        leader.result()
+    assert time.monotonic() - started < 1
+    assert group.get_stats()["by_name"]["maids.search"]["timeouts"] == 1
+
+
+def test_waiting_searches_hold_no_pooled_connection(tmp_path, monkeypatch, maid):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=5)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(**{**SessionLocal.kw, "bind": engine})
+    group, release = SingleFlight(), threading.Event()
+    monkeypatch.setattr(maid_service, "read_coalescer", group)
+
+    search_maids = MaidService.search_maids
+
+    def slow_search(self, *args):
+        maids = search_maids(self, *args)
+        release.wait(5)
+        return maids
+
+    monkeypatch.setattr(MaidService, "search_maids", slow_search)
+
+    def request():
+        with factory() as db:
+            db.execute(text("SELECT 1"))  # as the auth dependency does
+            return MaidService(db).search_maids_json(skill="cleaning")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(request) for _ in range(4)]
+        _wait_for_waiters(group, 3)
+        checked_out = engine.pool.checkedout()
+        release.set()
+        results = {future.result() for future in futures}
+
+    assert checked_out == 1  # the leader's
+    assert len(results) == 1
+    engine.dispose()
@@ -0,0 +1,71 @@
+import gzip
+import threading
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, Compressor
+
+
+def _client(compressor: Compressor, body: bytes, etag: str = None) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/data")
+    def data():
+        return Response(content=body, media_type="application/json", headers={"ETag": etag} if etag else None)
+
+    app.add_middleware(CompressionMiddleware, compressor=compressor)
+    return TestClient(app)
+
+
+def test_negotiates_the_client_encoding():
+    compressor = Compressor()
+    assert compressor.choose_encoding("gzip, deflate") == "gzip"
+    assert compressor.choose_encoding("gzip;q=0, identity") is None
+    assert compressor.choose_encoding("") is None
+
+
+def test_small_bodies_are_not_compressed():
+    response = _client(Compressor(min_size=1024), b'{"a": 1}').get("/data", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_large_bodies_are_compressed_off_the_event_loop():
+    compressor = Compressor(min_size=1024, thread_min_size=64 * 1024)
+    compress = compressor.compress
+    threads = []
+
+    def recording_compress(*args):
+        threads.append(threading.current_thread())
+        return compress(*args)
+
+    compressor.compress = recording_compress
+    body = b'[' + b'{"name": "Maria Example", "rating": 4.5},' * 4000 + b'{}]'
+    medium = body[:8 * 1024]
+
+    response = _client(compressor, medium).get("/data", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == medium
+
+    response = _client(compressor, body).get("/data", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == body
+    assert int(response.headers["content-length"]) == len(gzip.compress(body, compresslevel=6, mtime=0))
+
+    loop_thread, worker_thread = threads
+    assert worker_thread is not loop_thread
+    stats = compressor.get_stats()
+    assert (stats["responses_compressed"], stats["compressed_in_thread"]) == (2, 1)
+
+
+def test_responses_with_the_same_etag_keep_their_own_bodies():
+    compressor = Compressor(min_size=16)
+    maids = b'[' + b'{"name": "Maria Example"},' * 50 + b'{}]'
+    reviews = b'[' + b'{"rating": 5, "comment": "Spotless"},' * 50 + b'{}]'
+    for body in (maids, reviews, maids):
+        response = _client(compressor, body, etag='W/"1"').get("/data", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == body
+    assert compressor.get_stats()["cache"]["hits"] == 1
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.core.deadlines import (
+    DeadlineExceeded,
+    DeadlineMiddleware,
+    DeadlinePolicy,
+    DeadlineQueuePool,
+    deadline_exempt,
+    deadline_policy,
+    remaining,
+)
+from tests.conftest import request_deadline
+
+
+def _expired_in_test():
+    return deadline_policy.get_stats()["expired_by_route"].get("test", {})
+
+
+def test_longest_prefix_and_method_pick_the_budget():
+    policy = DeadlinePolicy(10, {
+        "/api/v1/bookings": 5,
+        "POST /api/v1/bookings": 8,
+        "/api/v1/bookings/events": 0,
+    })
+    assert policy.budget_for("GET", "/api/v1/bookings/123") == ("/api/v1/bookings", 5)
+    assert policy.budget_for("POST", "/api/v1/bookings") == ("POST /api/v1/bookings", 8)
+    assert policy.budget_for("GET", "/api/v1/bookings/events") == ("/api/v1/bookings/events", 0)
+    # Prefixes match whole path segments only
+    assert policy.budget_for("GET", "/api/v1/bookingsx") == ("default", 10)
+
+
+def test_middleware_sets_the_deadline_for_the_request():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(remaining())
+
+    middleware = DeadlineMiddleware(app, DeadlinePolicy(3, {"/stream": 0}))
+    asyncio.run(middleware({"type": "http", "method": "GET", "path": "/x"}, None, None))
+    asyncio.run(middleware({"type": "http", "method": "GET", "path": "/stream"}, None, None))
+    assert 2.9 < seen[0] <= 3
+    assert seen[1] is None
+    assert remaining() is None
+
+
+def test_statement_after_the_deadline_is_not_sent(db):
+    before = _expired_in_test().get("db.query", 0)
+    with request_deadline(-1):
+        with pytest.raises(DeadlineExceeded) as raised:
+            db.execute(text("SELECT 1"))
+    assert raised.value.status_code == 504
+    assert _expired_in_test()["db.query"] == before + 1
+
+
+def test_exempt_block_runs_past_the_deadline(db):
+    with request_deadline(-1):
+        with deadline_exempt():
+            assert remaining() is None
+            assert db.execute(text("SELECT 1")).scalar() == 1
+        # The request's own deadline applies again after the block
+        assert remaining() < 0
+        with pytest.raises(DeadlineExceeded):
+            db.execute(text("SELECT 1"))
+
+
+def test_pool_wait_is_capped_by_the_remaining_budget():
+    pool = DeadlineQueuePool(lambda: None, pool_size=1, max_overflow=0, timeout=30)
+    assert pool._timeout == 30
+    with request_deadline(2.0):
+        assert 1.9 < pool._timeout <= 2.0
+    with request_deadline(-1):
+        assert pool._timeout == 0.0
+        recreated = pool.recreate()
+    # A pool recreated mid-request keeps the configured timeout
+    assert recreated._timeout == 30
+
+
+def test_expired_pool_checkout_raises_before_waiting():
+    pool = DeadlineQueuePool(lambda: None, pool_size=1, max_overflow=0, timeout=30)
+    started = time.monotonic()
+    with request_deadline(-1):
+        with pytest.raises(DeadlineExceeded):
+            pool.connect()
+    assert time.monotonic() - started < 1
@@ -0,0 +1,47 @@
+import json
+
+from app.core.events import MAX_PAYLOAD_BYTES, BookingEventBroker, booking_events
+from app.schemas.booking import BookingCreate
+from app.services.booking_service import BookingService
+
+
+def _history(user_id):
+    return list(booking_events._history.get(str(user_id), ()))
+
+
+def test_small_event_keeps_its_data():
+    payload = BookingEventBroker._payload("booking.updated", {"id": "b1", "status": "accepted"}, ["u1"])
+    assert payload["type"] == "booking.updated"
+    assert payload["data"] == {"id": "b1", "status": "accepted"}
+
+
+def test_oversized_event_is_sent_as_changed():
+    data = {"id": "b1", "notes": "x" * MAX_PAYLOAD_BYTES}
+    payload = BookingEventBroker._payload("booking.created", data, ["u1", "u2"])
+    assert payload["type"] == "booking.changed"
+    assert payload["data"] == {"id": "b1"}
+    assert len(json.dumps(payload)) < MAX_PAYLOAD_BYTES
+
+
+def test_events_are_delivered_after_commit_only(db, customer, maid):
+    booking = BookingService(db).create_booking(customer.id, BookingCreate(
+        maid_id=maid.id, service_type="Deep Cleaning",
+        booking_date="2030-01-01T09:00:00", time_slot="09:00-12:00",
+    ))
+    assert [e["type"] for e in _history(customer.id)] == ["booking.created"]
+    assert _history(maid.id)[0]["data"]["id"] == str(booking.id)
+
+    booking_events.publish(db, "booking.updated", {"id": str(booking.id)}, [customer.id])
+    db.rollback()
+    assert len(_history(customer.id)) == 1
+
+
+def test_booking_with_long_notes_is_created(db, customer, maid):
+    booking = BookingService(db).create_booking(customer.id, BookingCreate(
+        maid_id=maid.id, service_type="Deep Cleaning",
+        booking_date="2030-01-01T09:00:00", time_slot="09:00-12:00",
+        notes="Please bring eco-friendly products. " * 400,
+    ))
+    event = _history(customer.id)[-1]
+    assert event["type"] == "booking.changed"
+    assert event["data"] == {"id": str(booking.id)}
@@ -0,0 +1,191 @@
+import asyncio
+import time
+import uuid
+
+import anyio.to_thread
+import pytest
+from fastapi import HTTPException, Response
+
+from app.core.idempotency import REPLAYED_HEADER, IdempotencyStore, _Entry, idempotency_store
+from app.models import IdempotencyKey
+from tests.conftest import auth_headers, request_deadline
+
+FINGERPRINT = "a" * 64
+
+
+@pytest.fixture
+def make_store(session_factory):
+    def make(**kwargs):
+        store = IdempotencyStore(**kwargs)
+        store.configure(session_factory)
+        return store
+    return make
+
+
+def _endpoint(calls, status_code=201, body=b'{"id": 1}', delay=0.0):
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return Response(content=body, status_code=status_code, media_type="application/json")
+    return call
+
+
+def test_retry_replays_the_stored_response(make_store):
+    store, user_id, calls = make_store(), uuid.uuid4(), []
+
+    async def scenario():
+        first = await store.run(user_id, "k1", FINGERPRINT, _endpoint(calls))
+        second = await store.run(user_id, "k1", FINGERPRINT, _endpoint(calls))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert (second.status_code, second.body) == (201, first.body)
+    assert second.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+
+
+def test_other_worker_replays_from_the_database(make_store):
+    user_id, calls = uuid.uuid4(), []
+    asyncio.run(make_store().run(user_id, "k1", FINGERPRINT, _endpoint(calls)))
+
+    replay = asyncio.run(make_store().run(user_id, "k1", FINGERPRINT, _endpoint(calls)))
+    assert len(calls) == 1
+    assert replay.status_code == 201
+    assert replay.headers[REPLAYED_HEADER] == "true"
+
+
+def test_key_reused_with_another_request_conflicts(make_store):
+    store, user_id, calls = make_store(), uuid.uuid4(), []
+    asyncio.run(store.run(user_id, "k1", FINGERPRINT, _endpoint(calls)))
+
+    conflict = asyncio.run(store.run(user_id, "k1", "b" * 64, _endpoint(calls)))
+    assert conflict.status_code == 422
+    assert len(calls) == 1
+    assert store.get_stats()["key_conflicts"] == 1
+
+
+def test_keys_are_scoped_per_user(make_store):
+    store, calls = make_store(), []
+    asyncio.run(store.run(uuid.uuid4(), "k1", FINGERPRINT, _endpoint(calls)))
+    asyncio.run(store.run(uuid.uuid4(), "k1", FINGERPRINT, _endpoint(calls)))
+    assert len(calls) == 2
+
+
+def test_server_error_releases_the_key(make_store, db):
+    store, user_id, calls = make_store(), uuid.uuid4(), []
+    failed = asyncio.run(store.run(user_id, "k1", FINGERPRINT, _endpoint(calls, status_code=503)))
+    assert failed.status_code == 503
+    assert db.get(IdempotencyKey, (user_id, "k1")) is None
+
+    retried = asyncio.run(store.run(user_id, "k1", FINGERPRINT, _endpoint(calls)))
+    assert retried.status_code == 201
+    assert len(calls) == 2
+
+
+def test_exception_releases_the_key(make_store, db):
+    store, user_id = make_store(), uuid.uuid4()
+
+    async def failing():
+        raise HTTPException(status_code=504)
+
+    with pytest.raises(HTTPException):
+        asyncio.run(store.run(user_id, "k1", FINGERPRINT, failing))
+    assert db.get(IdempotencyKey, (user_id, "k1")) is None
+
+
+def test_concurrent_duplicate_waits_for_the_original(make_store):
+    store, user_id, calls = make_store(), uuid.uuid4(), []
+
+    async def scenario():
+        return await asyncio.gather(
+            store.run(user_id, "k1", FINGERPRINT, _endpoint(calls, delay=0.1)),
+            store.run(user_id, "k1", FINGERPRINT, _endpoint(calls, delay=0.1)),
+        )
+
+    first, second = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert first.body == second.body
+    assert second.headers[REPLAYED_HEADER] == "true"
+
+
+def test_claim_held_by_another_worker_answers_409(make_store):
+    user_id = uuid.uuid4()
+    owner = make_store()
+    assert owner._try_claim(user_id, "k1", FINGERPRINT) is None
+
+    calls = []
+    duplicate = make_store(wait_seconds=0.2, poll_interval=0.05)
+    response = asyncio.run(duplicate.run(user_id, "k1", FINGERPRINT, _endpoint(calls)))
+    assert response.status_code == 409
+    assert calls == []
+
+
+def test_duplicate_polls_another_workers_claim_without_holding_a_thread(make_store):
+    user_id, calls = uuid.uuid4(), []
+    owner = make_store()
+    assert owner._try_claim(user_id, "k1", FINGERPRINT) is None
+    duplicate = make_store(wait_seconds=2, poll_interval=0.02)
+
+    async def scenario():
+        waiting = asyncio.ensure_future(duplicate.run(user_id, "k1", FINGERPRINT, _endpoint(calls)))
+        threads = []
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            threads.append(anyio.to_thread.current_default_thread_limiter().borrowed_tokens)
+        entry = _Entry(FINGERPRINT, 201, b'{"id": 1}', time.time() + 60)
+        await anyio.to_thread.run_sync(owner._complete, user_id, "k1", entry)
+        return await waiting, threads
+
+    response, threads = asyncio.run(scenario())
+    assert (response.status_code, response.headers[REPLAYED_HEADER]) == (201, "true")
+    assert calls == []
+    # Between polls the duplicate waits on the event loop
+    assert 0 in threads
+
+
+def test_deactivated_user_cannot_replay(client, db, customer, maid, session_factory, monkeypatch):
+    monkeypatch.setattr(idempotency_store, "_session_factory", session_factory)
+    headers = {**auth_headers(customer), "Idempotency-Key": str(uuid.uuid4())}
+    booking = {
+        "maid_id": str(maid.id),
+        "service_type": "Deep Cleaning",
+        "booking_date": "2030-01-01T09:00:00",
+        "time_slot": "09:00-12:00",
+    }
+    assert client.post("/api/v1/bookings", json=booking, headers=headers).status_code == 201
+    replay = client.post("/api/v1/bookings", json=booking, headers=headers)
+    assert replay.headers[REPLAYED_HEADER] == "true"
+
+    customer.is_active = False
+    db.commit()
+    refused = client.post("/api/v1/bookings", json=booking, headers=headers)
+    assert refused.status_code == 400
+    assert REPLAYED_HEADER not in refused.headers
+
+
+def test_wait_ends_before_the_request_deadline(make_store):
+    store = make_store(wait_seconds=4)
+    assert store._wait_budget() == 4
+    with request_deadline(2.0):
+        assert 1.4 < store._wait_budget() <= 1.5
+        # The owner's claim outlives its own deadline-bound run
+        assert store._claim_seconds() == 4
+    with request_deadline(10.0):
+        assert store._claim_seconds() > 9
+
+
+def test_response_is_stored_after_the_deadline_expires(make_store, db):
+    store, user_id = make_store(), uuid.uuid4()
+
+    async def slow_endpoint():
+        await asyncio.sleep(0.1)
+        return Response(content=b'{"id": 1}', status_code=201, media_type="application/json")
+
+    async def scenario():
+        with request_deadline(0.05):
+            return await store.run(user_id, "k1", FINGERPRINT, slow_endpoint)
+
+    assert asyncio.run(scenario()).status_code == 201
+    row = db.get(IdempotencyKey, (user_id, "k1"))
+    assert (row.status_code, row.response_body) == (201, '{"id": 1}')
@@ -0,0 +1,21 @@
+"""
+Cold-start import budget: app.main must import within IMPORT_TIME_BUDGET_MS
+(default 2500) in a fresh interpreter, median of three runs. On failure,
+`python -m benchmarks.import_time` shows which modules got slower.
+"""
+import os
+import statistics
+
+from benchmarks.import_time import import_times
+
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 2500))
+
+
+def _total_ms(module: str) -> float:
+    rows = import_times(module)
+    return next(cumulative for name, _, cumulative, _ in rows if name == module) / 1000
+
+
+def test_app_imports_within_budget():
+    totals = [_total_ms("app.main") for _ in range(3)]
+    assert statistics.median(totals) <= BUDGET_MS, f"import app.main took {sorted(totals)} ms"
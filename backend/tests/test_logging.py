@@ -0,0 +1,68 @@
+import json
+import logging
+import queue
+
+from app.core import logging_config
+from app.core.logging_config import (
+    JsonFormatter,
+    RateLimitFilter,
+    SamplingFilter,
+    TextFormatter,
+    _NonBlockingQueueHandler,
+    log_stats,
+)
+
+
+def _record(name="app.services.booking_service", level=logging.INFO, lineno=10, msg="booked %s", args=("x",)):
+    return logging.LogRecord(name, level, "booking_service.py", lineno, msg, args, None)
+
+
+def test_sampling_applies_to_configured_loggers_below_warning(monkeypatch):
+    monkeypatch.setattr(logging_config.random, "random", lambda: 0.5)
+    sampling = SamplingFilter({"app.services": 0.25, "app.api": 0.75})
+    sampled_out = log_stats.sampled_out
+
+    assert not sampling.filter(_record())
+    assert sampling.filter(_record(name="app.api.v1.bookings"))
+    assert sampling.filter(_record(level=logging.WARNING))
+    assert sampling.filter(_record(name="uvicorn.access"))
+    assert log_stats.sampled_out == sampled_out + 1
+
+
+def test_warnings_are_rate_limited_per_call_site(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(logging_config.time, "monotonic", lambda: now[0])
+    limiter = RateLimitFilter(limit=2, window_seconds=60)
+
+    warnings = [_record(level=logging.WARNING) for _ in range(5)]
+    assert [limiter.filter(record) for record in warnings] == [True, True, False, False, False]
+    assert limiter.filter(_record(level=logging.WARNING, lineno=11))
+    assert limiter.filter(_record(level=logging.INFO))
+
+    # The first record of the next window reports what was dropped
+    now[0] += 60
+    record = _record(level=logging.WARNING)
+    assert limiter.filter(record)
+    assert record.suppressed == 3
+    assert TextFormatter("%(message)s").format(record) == "booked x [3 similar suppressed]"
+
+
+def test_json_lines_carry_extra_fields():
+    record = _record()
+    record.booking_id = "b-1"
+    record.trace_id = "t-1"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "booked x"
+    assert (entry["level"], entry["logger"]) == ("INFO", "app.services.booking_service")
+    assert (entry["booking_id"], entry["trace_id"]) == ("b-1", "t-1")
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    dropped = log_stats.dropped
+    handler.handle(_record())
+    handler.handle(_record())
+    assert handler.queue.qsize() == 1
+    assert log_stats.dropped == dropped + 1
+    # Formatting is left to the listener thread
+    assert handler.queue.get_nowait().args == ("x",)
@@ -0,0 +1,142 @@
+from datetime import date, datetime, timedelta
+
+from app.models import BookingStatus, MaidStats, UserRole
+from app.schemas.booking import BookingCreate, BookingUpdate
+from app.services.booking_service import BookingService
+from app.services.maid_stats_service import MaidStatsService
+from tests.conftest import make_booking, make_user
+
+
+def _book(db, customer, maid, booking_date, notes="Proposed Hourly Rate: $30.00"):
+    return BookingService(db).create_booking(customer.id, BookingCreate(
+        maid_id=maid.id, service_type="Deep Cleaning",
+        booking_date=booking_date, time_slot="09:00-12:00", notes=notes,
+    ))
+
+
+def _set_status(db, booking, user, status):
+    return BookingService(db).update_booking(booking.id, user, BookingUpdate(status=status))
+
+
+def _counts(stats):
+    return {
+        key: stats[key]
+        for key in ("total_bookings", "pending_bookings", "accepted_bookings",
+                    "completed_jobs", "canceled_bookings", "total_earnings")
+    }
+
+
+def _earnings(stats, period):
+    return [
+        (row.period_start, row.completed_bookings, row.earnings)
+        for row in stats[f"earnings_by_{period}"]
+    ]
+
+
+def test_created_bookings_count_as_pending(db, customer, maid):
+    _book(db, customer, maid, datetime(2030, 1, 2, 9))
+    _book(db, customer, maid, datetime(2030, 1, 3, 9))
+
+    stats = MaidStatsService(db).get_stats(maid.id)
+    assert stats["total_bookings"] == 2
+    assert stats["pending_bookings"] == 2
+    assert stats["acceptance_rate"] is None
+
+
+def test_transitions_move_counts_and_earnings(db, customer, maid):
+    # Wednesday 2030-01-02: week of Monday 2029-12-31, month of 2030-01-01
+    booking = _book(db, customer, maid, datetime(2030, 1, 2, 9))
+    declined = _book(db, customer, maid, datetime(2030, 1, 9, 9))
+
+    _set_status(db, booking, maid, BookingStatus.ACCEPTED)
+    _set_status(db, booking, maid, BookingStatus.COMPLETED)
+    _set_status(db, declined, maid, BookingStatus.CANCELED)
+
+    stats = MaidStatsService(db).get_stats(maid.id)
+    assert _counts(stats) == {
+        "total_bookings": 2, "pending_bookings": 0, "accepted_bookings": 0,
+        "completed_jobs": 1, "canceled_bookings": 1, "total_earnings": 30.0,
+    }
+    assert stats["acceptance_rate"] == 0.5
+    assert _earnings(stats, "week") == [(date(2029, 12, 31), 1, 30.0)]
+    assert _earnings(stats, "month") == [(date(2030, 1, 1), 1, 30.0)]
+
+
+def test_undoing_completion_reverses_earnings(db, customer, maid):
+    booking = _book(db, customer, maid, datetime(2030, 1, 2, 9))
+    _set_status(db, booking, maid, BookingStatus.COMPLETED)
+    _set_status(db, booking, maid, BookingStatus.ACCEPTED)
+
+    stats = MaidStatsService(db).get_stats(maid.id)
+    assert stats["completed_jobs"] == 0
+    assert stats["accepted_bookings"] == 1
+    assert stats["total_earnings"] == 0.0
+    assert stats["earnings_by_week"] == []
+
+
+def test_customer_cancellation_is_not_a_maid_decision(db, customer, maid):
+    booking = _book(db, customer, maid, datetime(2030, 1, 2, 9))
+    _set_status(db, booking, customer, BookingStatus.CANCELED)
+
+    stats = MaidStatsService(db).get_stats(maid.id)
+    assert stats["canceled_bookings"] == 1
+    assert stats["acceptance_rate"] is None
+
+
+def test_unchanged_status_is_not_counted_again(db, customer, maid):
+    booking = _book(db, customer, maid, datetime(2030, 1, 2, 9))
+    _set_status(db, booking, maid, BookingStatus.ACCEPTED)
+    _set_status(db, booking, maid, BookingStatus.ACCEPTED)
+
+    stats = MaidStatsService(db).get_stats(maid.id)
+    assert stats["accepted_bookings"] == 1
+    assert stats["pending_bookings"] == 0
+
+
+def test_rebuild_matches_incremental_aggregates(db, customer, maid):
+    dates = [datetime(2030, 1, day, 9) for day in (2, 6, 7, 15)] + [datetime(2030, 2, 3, 9)]
+    bookings = [_book(db, customer, maid, d) for d in dates]
+    for booking in bookings[:4]:
+        _set_status(db, booking, maid, BookingStatus.ACCEPTED)
+    for booking in bookings[:3]:
+        _set_status(db, booking, maid, BookingStatus.COMPLETED)
+    _set_status(db, bookings[4], maid, BookingStatus.CANCELED)
+    incremental = MaidStatsService(db).get_stats(maid.id)
+
+    MaidStatsService(db).rebuild()
+    db.expire_all()
+    rebuilt = MaidStatsService(db).get_stats(maid.id)
+
+    assert _counts(rebuilt) == _counts(incremental)
+    assert rebuilt["acceptance_rate"] == incremental["acceptance_rate"] == 0.8
+    assert _earnings(rebuilt, "week") == _earnings(incremental, "week")
+    assert _earnings(rebuilt, "month") == _earnings(incremental, "month")
+    # Week buckets start on Monday: Jan 2 in Dec 31's week, Jan 6 (Sunday) too
+    assert _earnings(rebuilt, "week") == [(date(2030, 1, 7), 1, 30.0), (date(2029, 12, 31), 2, 60.0)]
+
+
+def test_rebuild_one_maid_leaves_others(db, customer, maid):
+    other = make_user(db, UserRole.MAID)
+    _book(db, customer, maid, datetime(2030, 1, 2, 9))
+    _book(db, customer, other, datetime(2030, 1, 2, 9))
+
+    MaidStatsService(db).rebuild(other.id)
+    db.expire_all()
+    assert MaidStatsService(db).get_stats(maid.id)["total_bookings"] == 1
+    assert MaidStatsService(db).get_stats(other.id)["total_bookings"] == 1
+
+
+def test_rebuild_counts_every_decision_as_a_response(db, customer, maid):
+    created = datetime(2030, 1, 1, 9)
+    for status, hours in ((BookingStatus.ACCEPTED, 1), (BookingStatus.CANCELED, 3),
+                          (BookingStatus.COMPLETED, 48), (BookingStatus.PENDING, 0)):
+        make_booking(db, customer, maid, status=status, created_at=created,
+                     updated_at=created + timedelta(hours=hours))
+
+    MaidStatsService(db).rebuild(maid.id)
+    stats = db.get(MaidStats, maid.id)
+    # As record_transitions: responses are acceptances plus declines
+    assert (stats.acceptances, stats.declines, stats.responses) == (2, 1, 3)
+    # The completed booking's updated_at is its completion, not the response;
+    # it gets the average of the other two (1h and 3h)
+    assert MaidStatsService(db).get_stats(maid.id)["average_response_seconds"] == 7200.0
@@ -0,0 +1,163 @@
+import json
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+from app.core.pg_listener import PostgresListener
+
+
+class _FakeConnection:
+    """psycopg2-like connection whose notifications are fed through a socket."""
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self.autocommit = False
+        self.listening = []
+        self.notifies = []
+        self._queued = []
+        self._lock = threading.Lock()
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def cursor(self):
+        connection = self
+
+        class _Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql):
+                connection.listening.append(sql)
+
+        return _Cursor()
+
+    def notify(self, channel, payload):
+        with self._lock:
+            self._queued.append(SimpleNamespace(channel=channel, payload=payload))
+        self._writer.send(b"x")
+
+    def poll(self):
+        self._reader.recv(1024)
+        with self._lock:
+            self.notifies.extend(self._queued)
+            self._queued.clear()
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+
+class _FakeEngine:
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(self):
+        self.connections = []
+
+    def raw_connection(self):
+        connection = _FakeConnection()
+        self.connections.append(connection)
+        return SimpleNamespace(
+            driver_connection=connection, detach=lambda: None, close=connection.close
+        )
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_one_connection_dispatches_by_channel():
+    received = {"a": [], "b": []}
+    connects = []
+    listener = PostgresListener(poll_seconds=0.05)
+    listener.register("a", received["a"].append, on_connect=connects.append)
+    listener.register("b", lambda payload: received["b"].append(json.loads(payload)))
+
+    engine = _FakeEngine()
+    listener.start(engine)
+    listener.start(engine)  # second user shares the same thread
+    try:
+        _wait_for(lambda: listener.listening)
+        (connection,) = engine.connections
+        assert connection.autocommit is True
+        assert connection.listening == ["LISTEN a", "LISTEN b"]
+        assert connects == [False]
+
+        connection.notify("a", "first")
+        connection.notify("b", '{"n": 1}')
+        connection.notify("unknown", "ignored")
+        _wait_for(lambda: received["a"] and received["b"])
+        assert received == {"a": ["first"], "b": [{"n": 1}]}
+    finally:
+        listener.stop()
+        assert listener.running  # still used by the other caller
+        listener.stop()
+    assert not listener.running
+    assert listener.get_stats()["state"] == "stopped"
+
+
+def test_handler_error_keeps_the_connection():
+    received = []
+
+    def handle(payload):
+        if payload == "bad":
+            raise ValueError(payload)
+        received.append(payload)
+
+    listener = PostgresListener(poll_seconds=0.05)
+    listener.register("a", handle)
+    engine = _FakeEngine()
+    listener.start(engine)
+    try:
+        _wait_for(lambda: listener.listening)
+        engine.connections[0].notify("a", "bad")
+        engine.connections[0].notify("a", "good")
+        _wait_for(lambda: received)
+        assert received == ["good"]
+        assert len(engine.connections) == 1
+        assert listener.get_stats()["handler_errors"] == 1
+    finally:
+        listener.stop()
+
+
+def test_non_postgresql_engine_does_not_listen(engine):
+    listener = PostgresListener()
+    listener.start(engine)
+    assert not listener.running
+
+
+def test_events_and_invalidation_share_the_global_listener():
+    from app.core import events, invalidation
+    from app.core.pg_listener import pg_listener
+
+    assert {events.NOTIFY_CHANNEL, invalidation.NOTIFY_CHANNEL} <= set(pg_listener.get_stats()["channels"])
+
+
+def test_reconnect_notifies_every_channel():
+    def connection_lost():
+        raise OSError("server closed the connection")
+
+    connects, disconnects = [], []
+    listener = PostgresListener(poll_seconds=0.05)
+    listener.register("a", lambda payload: None, on_connect=connects.append,
+                      on_disconnect=lambda: disconnects.append(True))
+    engine = _FakeEngine()
+    listener.start(engine)
+    try:
+        _wait_for(lambda: listener.listening)
+        engine.connections[0].poll = connection_lost
+        engine.connections[0].notify("a", "lost")
+        _wait_for(lambda: len(connects) == 2, timeout=3.0)
+        assert connects == [False, True]
+        assert disconnects == [True]
+        assert len(engine.connections) == 2
+        assert listener.get_stats()["reconnects"] == 1
+    finally:
+        listener.stop()
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from app.api.v1 import profiling
+from app.core.config import settings
+from app.core.profiling import PROFILED_HEADER, ProfilingMiddleware, RequestProfiler, request_profiler
+from app.core.security import create_access_token, create_profiling_token, decode_profiling_token
+
+
+@pytest.fixture
+def profiling_secret(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_SECRET", "test-profiling-secret")
+
+
+def test_profiling_tokens_need_the_profiling_secret(profiling_secret, monkeypatch):
+    token = create_profiling_token()
+    assert decode_profiling_token(token)["token_type"] == "profiling"
+    assert decode_profiling_token(create_profiling_token(timedelta(seconds=-1))) is None
+    # Access tokens are signed with SECRET_KEY and have another token_type
+    assert decode_profiling_token(create_access_token({"user_id": "x"})) is None
+
+    monkeypatch.setattr(settings, "PROFILING_SECRET", None)
+    assert decode_profiling_token(token) is None
+
+
+def test_token_profiles_a_request_regardless_of_sample_rate(profiling_secret):
+    profiler = RequestProfiler(sample_rate=0.0)
+    assert profiler.should_profile(Headers({"X-Profile-Token": create_profiling_token()}))
+    assert not profiler.should_profile(Headers({"X-Profile-Token": "forged"}))
+    assert not profiler.should_profile(Headers({}))
+
+
+@pytest.fixture
+def profiled_client():
+    app = FastAPI()
+
+    @app.get("/api/v1/items/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    app.include_router(profiling.router, prefix=settings.API_V1_PREFIX)
+    app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+    request_profiler.reset()
+    yield TestClient(app)
+    request_profiler.reset()
+
+
+def test_admin_endpoints_require_a_profiling_token(profiling_secret, profiled_client):
+    assert profiled_client.get("/api/v1/admin/profiling").status_code == 403
+    forged = {"X-Profile-Token": create_access_token({"user_id": "x"})}
+    assert profiled_client.get("/api/v1/admin/profiling", headers=forged).status_code == 403
+
+    headers = {"X-Profile-Token": create_profiling_token()}
+    response = profiled_client.get("/api/v1/admin/profiling", headers=headers)
+    assert response.status_code == 200
+    # The admin endpoints themselves are never profiled
+    assert PROFILED_HEADER not in response.headers
+
+
+def test_profiled_requests_are_aggregated_per_route(profiling_secret, profiled_client):
+    headers = {"X-Profile-Token": create_profiling_token()}
+    assert PROFILED_HEADER not in profiled_client.get("/api/v1/items/1").headers
+    for item_id in (1, 2):
+        assert profiled_client.get(f"/api/v1/items/{item_id}", headers=headers).headers[PROFILED_HEADER] == "true"
+
+    [route] = profiled_client.get("/api/v1/admin/profiling", headers=headers).json()["routes"]
+    assert (route["route"], route["requests"]) == ("GET /api/v1/items/{item_id}", 2)
+    assert profiled_client.delete("/api/v1/admin/profiling", headers=headers).status_code == 204
+    assert request_profiler.routes() == []
@@ -0,0 +1,54 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.rate_limiter import RateLimiter, RateLimitMiddleware
+
+
+def _client(limiter: RateLimiter) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/data")
+    def data():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b"]), media_type="text/plain")
+
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return TestClient(app)
+
+
+def test_responses_carry_rate_limit_headers():
+    client = _client(RateLimiter(requests_per_window=3, window_seconds=60))
+    first = client.get("/data")
+    assert first.status_code == 200
+    assert (first.headers["X-RateLimit-Limit"], first.headers["X-RateLimit-Remaining"]) == ("3", "2")
+    assert first.headers["X-RateLimit-Reset"] == "60"
+
+    # Streaming responses pass through unbuffered, with the same headers
+    streamed = client.get("/stream")
+    assert streamed.text == "ab"
+    assert streamed.headers["X-RateLimit-Remaining"] == "1"
+
+
+def test_client_over_the_limit_gets_429():
+    client = _client(RateLimiter(requests_per_window=2, window_seconds=60))
+    assert [client.get("/data").status_code for _ in range(2)] == [200, 200]
+
+    rejected = client.get("/data")
+    assert rejected.status_code == 429
+    assert rejected.json() == {"detail": "Rate limit exceeded. Please try again later."}
+    assert rejected.headers["X-RateLimit-Remaining"] == "0"
+    assert 1 <= int(rejected.headers["Retry-After"]) <= 60
+    assert rejected.headers["Retry-After"] == rejected.headers["X-RateLimit-Reset"]
+
+    # Health checks are exempt, and other clients have their own window
+    assert client.get("/health").status_code == 200
+    assert "X-RateLimit-Limit" not in client.get("/health").headers
+    assert client.get("/data", headers={"X-Forwarded-For": "203.0.113.7"}).status_code == 200
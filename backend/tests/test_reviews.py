@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import BookingStatus, User, UserRole
+from app.schemas.review import ReviewCreate
+from app.services.review_service import ReviewService
+from tests.conftest import auth_headers, make_booking, make_user
+
+
+def _review(db, customer, booking, rating=5, comment=None):
+    return ReviewService(db).create_review(
+        customer.id, ReviewCreate(booking_id=booking.id, rating=rating, comment=comment)
+    )
+
+
+def test_second_review_for_a_booking_is_rejected(db, customer, maid):
+    booking = make_booking(db, customer, maid, status=BookingStatus.COMPLETED)
+    _review(db, customer, booking)
+    with pytest.raises(HTTPException) as raised:
+        _review(db, customer, booking, rating=1)
+    assert (raised.value.status_code, raised.value.detail) == (400, "Review already exists for this booking")
+
+
+def _rating(db, maid):
+    db.expire_all()
+    maid = db.get(User, maid.id)
+    return maid.rating_count, maid.rating_sum, maid.average_rating
+
+
+def test_reviews_update_the_rating_aggregate(db, customer, maid):
+    for rating in (5, 4.5, 3):
+        _review(db, customer, make_booking(db, customer, maid, status=BookingStatus.COMPLETED), rating=rating)
+    assert _rating(db, maid) == (3, 12.5, 4.17)
+
+    # A rejected duplicate leaves the aggregate alone
+    booking = make_booking(db, customer, maid, status=BookingStatus.COMPLETED)
+    _review(db, customer, booking, rating=1)
+    with pytest.raises(HTTPException):
+        _review(db, customer, booking, rating=1)
+    assert _rating(db, maid) == (4, 13.5, 3.38)
+
+
+def test_rebuild_matches_the_incremental_rating(db, customer, maid):
+    for rating in (2, 4, 5, 5):
+        _review(db, customer, make_booking(db, customer, maid, status=BookingStatus.COMPLETED), rating=rating)
+    incremental = _rating(db, maid)
+    db.get(User, maid.id).rating_sum = 0
+    db.commit()
+
+    ReviewService(db).rebuild_ratings()
+    assert _rating(db, maid) == incremental == (4, 16.0, 4.0)
+
+
+def test_maid_reviews_page_by_keyset_cursor(client, db, customer, maid):
+    reviews = [
+        _review(db, customer, make_booking(db, customer, maid, status=BookingStatus.COMPLETED), rating=rating)
+        for rating in (5, 4.5, 4, 2, 1)
+    ]
+    # Ties on created_at are broken by id
+    for review, day in zip(reviews, (1, 2, 2, 3, 3)):
+        review.created_at = datetime(2030, 1, day, 9)
+    db.commit()
+    newest_first = [
+        str(review.id) for review in sorted(reviews, key=lambda r: (r.created_at, r.id), reverse=True)
+    ]
+
+    url = f"/api/v1/reviews/maid/{maid.id}"
+    pages, cursor = [], None
+    while True:
+        page = client.get(url, params={"limit": 2, **({"cursor": cursor} if cursor else {})}).json()
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page["items"]) for page in pages] == [2, 2, 1]
+    assert [item["id"] for page in pages for item in page["items"]] == newest_first
+    assert pages[0]["summary"] == {
+        "count": 5, "average_rating": 3.3, "histogram": {"1": 1, "2": 1, "3": 0, "4": 2, "5": 1},
+    }
+    assert all(page["summary"] is None for page in pages[1:])
+
+
+def test_maid_reviews_reject_a_bad_cursor_and_unknown_maid(client, customer):
+    assert client.get(f"/api/v1/reviews/maid/{customer.id}").status_code == 404
+    assert client.get(f"/api/v1/reviews/maid/{customer.id}", params={"cursor": "bm90LWEtY3Vyc29y"}).status_code == 400
+
+
+def _check_batch(client, booking_ids, user=None):
+    headers = auth_headers(user) if user else {}
+    return client.post("/api/v1/reviews/check-batch", json={"booking_ids": booking_ids}, headers=headers)
+
+
+def test_check_batch_reports_only_the_callers_reviews(client, db, customer, maid):
+    reviewed, unreviewed = (make_booking(db, customer, maid, status=BookingStatus.COMPLETED) for _ in range(2))
+    _review(db, customer, reviewed)
+    other = make_user(db, UserRole.CUSTOMER)
+
+    ids = [str(unreviewed.id), str(reviewed.id), str(uuid.uuid4())]
+    response = _check_batch(client, ids, customer)
+    assert response.status_code == 200
+    assert response.json()["exists"] == {ids[0]: False, ids[1]: True, ids[2]: False}
+    # Someone else's review doesn't count
+    assert not any(_check_batch(client, ids, other).json()["exists"].values())
+
+
+def test_check_batch_limits(client, customer):
+    assert _check_batch(client, [], customer).status_code == 422
+    assert _check_batch(client, [str(uuid.uuid4()) for _ in range(101)], customer).status_code == 422
+    assert _check_batch(client, [str(uuid.uuid4())]).status_code == 401
@@ -0,0 +1,133 @@
+import threading
+import time
+
+import anyio
+import pytest
+from fastapi import APIRouter, BackgroundTasks, FastAPI, Response, status
+from fastapi.exceptions import ResponseValidationError
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, field_validator
+
+from app.core.threadpool import AUTH, IO, ThreadLimiter, cpu_bound, thread_limiters
+from app.core.tracing import TracedRoute
+
+
+def test_limiter_records_waits_and_occupancy():
+    limiter = ThreadLimiter("test", size=1)
+
+    async def scenario():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(limiter.run_sync, time.sleep, 0.05)
+            await anyio.sleep(0.01)  # the first call holds the only thread
+            for _ in range(2):
+                tg.start_soon(limiter.run_sync, time.sleep, 0.05)
+
+    anyio.run(scenario)
+    stats = limiter.get_stats()
+    assert stats["calls"] == 3
+    assert (stats["busy"], stats["peak_busy"], stats["waiting"]) == (0, 1, 0)
+    assert stats["saturated_calls"] == 2
+    # The last call queued behind the other two
+    assert stats["wait_ms"]["max"] >= 80
+
+
+def test_cpu_bound_endpoints_use_the_auth_limiter():
+    @cpu_bound
+    def login():
+        pass
+
+    def list_bookings():
+        pass
+
+    assert thread_limiters.for_endpoint(login).name == AUTH
+    assert thread_limiters.for_endpoint(list_bookings).name == IO
+
+
+validated_on = []
+
+
+class _Item(BaseModel):
+    id: int
+    name: str
+
+    @field_validator("name")
+    @classmethod
+    def _record_thread(cls, value):
+        validated_on.append(threading.current_thread())
+        return value
+
+
+@pytest.fixture
+def traced_client():
+    router = APIRouter(prefix="/items", route_class=TracedRoute)
+    seen = {"tasks": []}
+
+    @router.post("", response_model=_Item, status_code=status.HTTP_201_CREATED)
+    def create_item(response: Response, background_tasks: BackgroundTasks):
+        seen["endpoint"] = threading.current_thread()
+        response.headers["X-Item"] = "created"
+        background_tasks.add_task(seen["tasks"].append, "io")
+        return {"id": 1, "name": "mop", "secret": "not in the model"}
+
+    @router.post("/hashed", response_model=_Item)
+    @cpu_bound
+    def hash_item(response: Response, background_tasks: BackgroundTasks):
+        seen["auth_endpoint"] = threading.current_thread()
+        response.headers["X-Item"] = "hashed"
+        background_tasks.add_task(seen["tasks"].append, "auth")
+        return {"id": 2, "name": "broom"}
+
+    @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+    def delete_item(item_id: int):
+        return None
+
+    @router.get("/broken", response_model=_Item)
+    def broken():
+        return {"id": "not a number", "name": "mop"}
+
+    @router.get("/loop")
+    async def loop_thread():
+        seen["loop"] = threading.current_thread()
+        return thread_limiters.get_stats()
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    validated_on.clear()
+    with TestClient(app) as client:
+        yield client, seen
+
+
+def test_sync_endpoints_run_on_the_default_limiter(traced_client):
+    client, seen = traced_client
+    calls = client.get("/api/items/loop").json()[IO]["calls"]
+
+    response = client.post("/api/items")
+    assert response.status_code == 201
+    assert response.json() == {"id": 1, "name": "mop"}
+    stats = client.get("/api/items/loop").json()
+    assert stats[IO]["calls"] == calls + 1
+    assert "threads_in_use" in stats[IO]
+    # Neither the endpoint nor FastAPI's response validation ran on the event loop
+    assert seen["endpoint"] is not seen["loop"]
+    assert validated_on and seen["loop"] not in validated_on
+
+
+def test_cpu_bound_endpoints_run_on_the_auth_limiter(traced_client):
+    client, seen = traced_client
+    calls = client.get("/api/items/loop").json()[AUTH]["calls"]
+
+    assert client.post("/api/items/hashed").json() == {"id": 2, "name": "broom"}
+    assert client.get("/api/items/loop").json()[AUTH]["calls"] == calls + 1
+    assert seen["auth_endpoint"] is not seen["loop"]
+
+
+def test_fastapi_response_handling_is_kept(traced_client):
+    client, seen = traced_client
+    assert client.post("/api/items").headers["X-Item"] == "created"
+    assert client.post("/api/items/hashed").headers["X-Item"] == "hashed"
+    assert seen["tasks"] == ["io", "auth"]
+
+    response = client.delete("/api/items/1")
+    assert (response.status_code, response.content) == (204, b"")
+    with pytest.raises(ResponseValidationError):
+        client.get("/api/items/broken")
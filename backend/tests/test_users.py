@@ -0,0 +1,75 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.core.cache import profile_cache
+from app.models import UserRole
+from app.services.user_service import UserService
+from tests.conftest import auth_headers, make_user
+
+CONTACT_FIELDS = {"email", "phone_number"}
+
+
+def test_public_profile_has_no_contact_details(client, customer, maid):
+    response = client.get(f"/api/v1/users/{maid.id}")
+    assert response.status_code == 200
+    assert response.json()["full_name"] == maid.full_name
+    assert not CONTACT_FIELDS & response.json().keys()
+
+    response = client.get(f"/api/v1/maids/{maid.id}", headers=auth_headers(customer))
+    assert response.status_code == 200
+    assert not CONTACT_FIELDS & response.json().keys()
+
+
+def test_own_profile_keeps_contact_details(client, customer):
+    response = client.get("/api/v1/users/me", headers=auth_headers(customer))
+    assert response.status_code == 200
+    assert response.json()["email"] == customer.email
+
+
+def test_batch_returns_public_profiles_in_request_order(client, db, customer, maid):
+    other = make_user(db, UserRole.MAID)
+    unknown = uuid.uuid4()
+    response = client.post(
+        "/api/v1/users/batch",
+        json={"ids": [str(other.id), str(unknown), str(maid.id), str(other.id)]},
+        headers=auth_headers(customer),
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [user["id"] for user in body["users"]] == [str(other.id), str(maid.id)]
+    assert body["missing"] == [str(unknown)]
+    assert all(not CONTACT_FIELDS & user.keys() for user in body["users"])
+
+
+def test_batch_loads_cache_misses_in_one_query(engine, db, maid):
+    maids = [maid] + [make_user(db, UserRole.MAID) for _ in range(3)]
+    profile_cache.clear()
+    UserService(db).get_public_profiles([maids[2].id])  # cached from here on
+
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        ids = [maids[3].id, maids[2].id, uuid.uuid4(), maids[0].id, maids[1].id]
+        found, missing = UserService(db).get_public_profiles(ids)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+        profile_cache.clear()
+
+    assert [profile.id for profile in found] == [maids[3].id, maids[2].id, maids[0].id, maids[1].id]
+    assert missing == [ids[2]]
+    [sql] = statements
+    assert " IN (" in sql and "hashed_password" not in sql
+
+
+def test_batch_limits(client, customer):
+    def batch(ids, headers):
+        return client.post("/api/v1/users/batch", json={"ids": ids}, headers=headers).status_code
+
+    assert batch([], auth_headers(customer)) == 422
+    assert batch([str(uuid.uuid4()) for _ in range(101)], auth_headers(customer)) == 422
+    assert batch([str(customer.id)], {}) == 401
@@ -23,13 +23,22 @@ CREATE TABLE IF NOT EXISTS users (
     hourly_rate FLOAT,
     availability_schedule TEXT,
     average_rating FLOAT DEFAULT 0.0,
+    rating_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum FLOAT NOT NULL DEFAULT 0,
+    rating_1_count INTEGER NOT NULL DEFAULT 0,
+    rating_2_count INTEGER NOT NULL DEFAULT 0,
+    rating_3_count INTEGER NOT NULL DEFAULT 0,
+    rating_4_count INTEGER NOT NULL DEFAULT 0,
+    rating_5_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Create bookings table
+-- Create bookings table, range-partitioned by booking_date.
+-- Monthly/yearly partitions are managed by backend/partition_maintenance.py;
+-- bookings_default holds rows until their partition exists.
 CREATE TABLE IF NOT EXISTS bookings (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     customer_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     maid_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     service_type VARCHAR(255) NOT NULL,
@@ -39,13 +48,17 @@ CREATE TABLE IF NOT EXISTS bookings (
     total_amount FLOAT,
     notes TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, booking_date)
+) PARTITION BY RANGE (booking_date);
+
+CREATE TABLE IF NOT EXISTS bookings_default PARTITION OF bookings DEFAULT;
 
 -- Create reviews table
+-- (booking_id can't reference the partitioned bookings(id); see the triggers below)
 CREATE TABLE IF NOT EXISTS reviews (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    booking_id UUID NOT NULL UNIQUE REFERENCES bookings(id) ON DELETE CASCADE,
+    booking_id UUID NOT NULL UNIQUE,
     customer_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     maid_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     rating FLOAT NOT NULL CHECK (rating >= 1 AND rating <= 5),
@@ -53,23 +66,71 @@ CREATE TABLE IF NOT EXISTS reviews (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Per-maid booking aggregates (maintained by the backend on booking writes)
+CREATE TABLE IF NOT EXISTS maid_stats (
+    maid_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    total_bookings INTEGER NOT NULL DEFAULT 0,
+    pending_bookings INTEGER NOT NULL DEFAULT 0,
+    accepted_bookings INTEGER NOT NULL DEFAULT 0,
+    completed_bookings INTEGER NOT NULL DEFAULT 0,
+    canceled_bookings INTEGER NOT NULL DEFAULT 0,
+    total_earnings FLOAT NOT NULL DEFAULT 0,
+    acceptances INTEGER NOT NULL DEFAULT 0,
+    declines INTEGER NOT NULL DEFAULT 0,
+    responses INTEGER NOT NULL DEFAULT 0,
+    response_seconds_total FLOAT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS maid_earnings (
+    maid_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    period VARCHAR(10) NOT NULL CHECK (period IN ('week', 'month')),
+    period_start DATE NOT NULL,
+    completed_bookings INTEGER NOT NULL DEFAULT 0,
+    earnings FLOAT NOT NULL DEFAULT 0,
+    PRIMARY KEY (maid_id, period, period_start)
+);
+
+-- Stored responses for POST requests made with an Idempotency-Key header
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id UUID NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    status_code INTEGER,
+    response_body TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (user_id, key)
+);
+
+-- Single-use tickets for opening the booking event stream (SHA-256 of the ticket)
+CREATE TABLE IF NOT EXISTS stream_tickets (
+    ticket_hash VARCHAR(64) PRIMARY KEY,
+    user_id UUID NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
 CREATE INDEX IF NOT EXISTS idx_users_is_active ON users(is_active);
 CREATE INDEX IF NOT EXISTS idx_users_role_active ON users(role, is_active);
 CREATE INDEX IF NOT EXISTS idx_users_average_rating ON users(average_rating DESC);
-CREATE INDEX IF NOT EXISTS idx_bookings_customer ON bookings(customer_id);
-CREATE INDEX IF NOT EXISTS idx_bookings_maid ON bookings(maid_id);
-CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings(status);
-CREATE INDEX IF NOT EXISTS idx_bookings_date ON bookings(booking_date);
-CREATE INDEX IF NOT EXISTS idx_bookings_customer_status ON bookings(customer_id, status);
+CREATE INDEX IF NOT EXISTS idx_bookings_customer_date ON bookings(customer_id, booking_date DESC);
+CREATE INDEX IF NOT EXISTS idx_bookings_maid_date ON bookings(maid_id, booking_date DESC);
 CREATE INDEX IF NOT EXISTS idx_bookings_maid_status ON bookings(maid_id, status);
-CREATE INDEX IF NOT EXISTS idx_bookings_created_at ON bookings(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_bookings_id ON bookings(id);
+-- Open bookings stay visible past the archive horizon; these partial indexes
+-- keep that lookup cheap (they are empty on archived partitions)
+CREATE INDEX IF NOT EXISTS idx_bookings_customer_open ON bookings(customer_id) WHERE status IN ('pending', 'accepted');
+CREATE INDEX IF NOT EXISTS idx_bookings_maid_open ON bookings(maid_id) WHERE status IN ('pending', 'accepted');
 CREATE INDEX IF NOT EXISTS idx_reviews_customer ON reviews(customer_id);
 CREATE INDEX IF NOT EXISTS idx_reviews_maid ON reviews(maid_id);
 CREATE INDEX IF NOT EXISTS idx_reviews_maid_rating ON reviews(maid_id, rating);
 CREATE INDEX IF NOT EXISTS idx_reviews_created_at ON reviews(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_reviews_maid_created ON reviews(maid_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+CREATE INDEX IF NOT EXISTS idx_stream_tickets_expires_at ON stream_tickets(expires_at);
 
 -- Enable Row Level Security (optional - recommended for security)
 -- ALTER TABLE users ENABLE ROW LEVEL SECURITY;
@@ -92,3 +153,36 @@ CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users
 -- Create trigger for bookings table
 CREATE TRIGGER update_bookings_updated_at BEFORE UPDATE ON bookings
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- reviews.booking_id can't reference the partitioned bookings(id) (its unique
+-- key is (id, booking_date)), so triggers stand in for the foreign key: a
+-- review must name an existing booking, and deleting a booking deletes its
+-- review. partition_maintenance.py deletes and re-inserts rows when it moves
+-- them between partitions; it sets maidease.moving_bookings so their reviews
+-- are kept.
+CREATE OR REPLACE FUNCTION check_review_booking_exists()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM bookings WHERE id = NEW.booking_id) THEN
+        RAISE EXCEPTION 'booking % does not exist', NEW.booking_id
+            USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER check_reviews_booking BEFORE INSERT OR UPDATE OF booking_id ON reviews
+    FOR EACH ROW EXECUTE FUNCTION check_review_booking_exists();
+
+CREATE OR REPLACE FUNCTION delete_booking_review()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF current_setting('maidease.moving_bookings', true) IS DISTINCT FROM 'on' THEN
+        DELETE FROM reviews WHERE booking_id = OLD.id;
+    END IF;
+    RETURN OLD;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER delete_bookings_review AFTER DELETE ON bookings
+    FOR EACH ROW EXECUTE FUNCTION delete_booking_review();
@@ -0,0 +1,27 @@
+-- Per-maid booking aggregates served by GET /api/v1/maids/me/stats
+-- After applying, backfill from existing bookings:
+--   cd backend && python rebuild_maid_stats.py
+
+CREATE TABLE IF NOT EXISTS maid_stats (
+    maid_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    total_bookings INTEGER NOT NULL DEFAULT 0,
+    pending_bookings INTEGER NOT NULL DEFAULT 0,
+    accepted_bookings INTEGER NOT NULL DEFAULT 0,
+    completed_bookings INTEGER NOT NULL DEFAULT 0,
+    canceled_bookings INTEGER NOT NULL DEFAULT 0,
+    total_earnings FLOAT NOT NULL DEFAULT 0,
+    acceptances INTEGER NOT NULL DEFAULT 0,
+    declines INTEGER NOT NULL DEFAULT 0,
+    responses INTEGER NOT NULL DEFAULT 0,
+    response_seconds_total FLOAT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS maid_earnings (
+    maid_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    period VARCHAR(10) NOT NULL CHECK (period IN ('week', 'month')),
+    period_start DATE NOT NULL,
+    completed_bookings INTEGER NOT NULL DEFAULT 0,
+    earnings FLOAT NOT NULL DEFAULT 0,
+    PRIMARY KEY (maid_id, period, period_start)
+);
@@ -0,0 +1,130 @@
+-- Range-partition bookings by booking_date
+--
+-- Hot data lives in monthly partitions (bookings_pYYYY_MM); years that are
+-- entirely older than BOOKING_ARCHIVE_HORIZON_MONTHS and hold only completed
+-- or canceled bookings are rolled up into cold yearly partitions
+-- (bookings_yYYYY) by the maintenance job. bookings_default catches dates
+-- without a partition until the job creates one.
+--
+-- Notes:
+--   * The primary key becomes (id, booking_date): a partitioned table's unique
+--     keys must include the partition key. Booking ids remain UUIDv4.
+--   * reviews.booking_id can no longer reference bookings(id) with a foreign
+--     key; the unique index stays and triggers check the booking exists and
+--     delete a booking's review with it.
+--   * Copies all rows inside one transaction; run during a maintenance window.
+--
+-- After applying, create upcoming partitions and archive old years:
+--   cd backend && python partition_maintenance.py
+
+BEGIN;
+
+ALTER TABLE reviews DROP CONSTRAINT IF EXISTS reviews_booking_id_fkey;
+
+ALTER TABLE bookings RENAME TO bookings_unpartitioned;
+ALTER INDEX IF EXISTS bookings_pkey RENAME TO bookings_unpartitioned_pkey;
+DROP INDEX IF EXISTS idx_bookings_customer;
+DROP INDEX IF EXISTS idx_bookings_maid;
+DROP INDEX IF EXISTS idx_bookings_status;
+DROP INDEX IF EXISTS idx_bookings_date;
+DROP INDEX IF EXISTS idx_bookings_customer_status;
+DROP INDEX IF EXISTS idx_bookings_maid_status;
+DROP INDEX IF EXISTS idx_bookings_created_at;
+
+CREATE TABLE bookings (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    customer_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    maid_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    service_type VARCHAR(255) NOT NULL,
+    booking_date TIMESTAMP NOT NULL,
+    time_slot VARCHAR(100),
+    status booking_status DEFAULT 'pending',
+    total_amount FLOAT,
+    notes TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, booking_date)
+) PARTITION BY RANGE (booking_date);
+
+CREATE TABLE bookings_default PARTITION OF bookings DEFAULT;
+
+-- Monthly partitions from the oldest booking through three months ahead
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR month_start IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE((SELECT min(booking_date) FROM bookings_unpartitioned), now())),
+            date_trunc('month', now()) + interval '3 months',
+            interval '1 month'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF bookings FOR VALUES FROM (%L) TO (%L)',
+            'bookings_p' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            (month_start + interval '1 month')::date
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO bookings (
+    id, customer_id, maid_id, service_type, booking_date, time_slot,
+    status, total_amount, notes, created_at, updated_at
+)
+SELECT
+    id, customer_id, maid_id, service_type, booking_date, time_slot,
+    status, total_amount, notes, created_at, updated_at
+FROM bookings_unpartitioned;
+
+DROP TABLE bookings_unpartitioned;
+
+-- Partitioned indexes (created on every partition); history queries filter
+-- by customer/maid and a booking_date window, which also prunes partitions
+CREATE INDEX IF NOT EXISTS idx_bookings_customer_date ON bookings(customer_id, booking_date DESC);
+CREATE INDEX IF NOT EXISTS idx_bookings_maid_date ON bookings(maid_id, booking_date DESC);
+CREATE INDEX IF NOT EXISTS idx_bookings_maid_status ON bookings(maid_id, status);
+CREATE INDEX IF NOT EXISTS idx_bookings_id ON bookings(id);
+-- Open bookings stay visible past the archive horizon; these partial indexes
+-- keep that lookup cheap (they are empty on archived partitions)
+CREATE INDEX IF NOT EXISTS idx_bookings_customer_open ON bookings(customer_id) WHERE status IN ('pending', 'accepted');
+CREATE INDEX IF NOT EXISTS idx_bookings_maid_open ON bookings(maid_id) WHERE status IN ('pending', 'accepted');
+
+CREATE TRIGGER update_bookings_updated_at BEFORE UPDATE ON bookings
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- reviews.booking_id can't reference the partitioned bookings(id) (its unique
+-- key is (id, booking_date)), so triggers stand in for the foreign key: a
+-- review must name an existing booking, and deleting a booking deletes its
+-- review. partition_maintenance.py deletes and re-inserts rows when it moves
+-- them between partitions; it sets maidease.moving_bookings so their reviews
+-- are kept.
+CREATE OR REPLACE FUNCTION check_review_booking_exists()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM bookings WHERE id = NEW.booking_id) THEN
+        RAISE EXCEPTION 'booking % does not exist', NEW.booking_id
+            USING ERRCODE = 'foreign_key_violation';
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER check_reviews_booking BEFORE INSERT OR UPDATE OF booking_id ON reviews
+    FOR EACH ROW EXECUTE FUNCTION check_review_booking_exists();
+
+CREATE OR REPLACE FUNCTION delete_booking_review()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF current_setting('maidease.moving_bookings', true) IS DISTINCT FROM 'on' THEN
+        DELETE FROM reviews WHERE booking_id = OLD.id;
+    END IF;
+    RETURN OLD;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER delete_bookings_review AFTER DELETE ON bookings
+    FOR EACH ROW EXECUTE FUNCTION delete_booking_review();
+
+COMMIT;
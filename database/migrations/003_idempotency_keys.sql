@@ -0,0 +1,16 @@
+-- Stored responses for POST requests made with an Idempotency-Key header
+-- (POST /api/v1/bookings, POST /api/v1/reviews). Rows expire after
+-- IDEMPOTENCY_TTL_SECONDS and are purged by the backend.
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id UUID NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    fingerprint VARCHAR(64) NOT NULL,
+    status_code INTEGER,
+    response_body TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (user_id, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
@@ -0,0 +1,7 @@
+-- Running rating totals for maids. average_rating is kept equal to
+-- rating_sum / rating_count by ReviewService in the review's transaction.
+-- Follow-up: backfill from existing reviews (backend directory):
+--     python rebuild_maid_stats.py
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS rating_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS rating_sum FLOAT NOT NULL DEFAULT 0;
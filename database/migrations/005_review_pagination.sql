@@ -0,0 +1,12 @@
+-- Keyset pagination for GET /reviews/maid/{id} (newest first) and the
+-- per-maid star histogram served with the first page.
+-- Follow-up: backfill the histogram from existing reviews (backend directory):
+--     python rebuild_maid_stats.py
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS rating_1_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS rating_2_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS rating_3_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS rating_4_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS rating_5_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_reviews_maid_created ON reviews(maid_id, created_at DESC, id DESC);
@@ -0,0 +1,13 @@
+-- Single-use tickets for GET /api/v1/bookings/events. EventSource can't send
+-- an Authorization header, so clients POST /api/v1/bookings/events/ticket and
+-- open the stream with ?ticket=... instead of putting the access token in the
+-- URL. Tickets live SSE_TICKET_TTL_SECONDS; only their SHA-256 is stored and
+-- the row is deleted on use. Expired rows are purged by the backend.
+
+CREATE TABLE IF NOT EXISTS stream_tickets (
+    ticket_hash VARCHAR(64) PRIMARY KEY,
+    user_id UUID NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_stream_tickets_expires_at ON stream_tickets(expires_at);
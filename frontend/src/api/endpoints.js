@@ -1,4 +1,4 @@
-import { api, setTokens, clearTokens } from './client';
+import { api, setTokens, clearTokens, getTokens, API_URL } from './client';
 
 // Auth endpoints
 export const authAPI = {
@@ -25,28 +25,108 @@ export const userAPI = {
   getProfile: () => api.get('/users/me'),
   updateProfile: (data) => api.put('/users/me', data),
   getUserById: (userId) => api.get(`/users/${userId}`),
+  // Up to 100 profiles per call, in request order; unknown ids in `missing`
+  getUsersBatch: (userIds) => api.post('/users/batch', { ids: userIds }),
 };
 
 // Maid endpoints
 export const maidAPI = {
   getAvailableMaids: (params) => api.get('/maids', { params }),
   getMaidProfile: (maidId) => api.get(`/maids/${maidId}`),
+  getMyStats: () => api.get('/maids/me/stats'),
 };
 
+const idempotencyHeaders = (key) => (key ? { 'Idempotency-Key': key } : {});
+
 // Booking endpoints
 export const bookingAPI = {
-  createBooking: (bookingData) => api.post('/bookings', bookingData),
+  // Reuse the same key when retrying after a network error so the server
+  // answers with the original response instead of creating a duplicate
+  createBooking: (bookingData, idempotencyKey) =>
+    api.post('/bookings', bookingData, { headers: idempotencyHeaders(idempotencyKey) }),
   getMyBookings: () => api.get('/bookings/my-bookings'),
   getMaidBookings: () => api.get('/bookings/my-bookings'),
   getBookingDetail: (bookingId) => api.get(`/bookings/${bookingId}`),
   updateBookingStatus: (bookingId, status) =>
     api.put(`/bookings/${bookingId}`, { status }),
+  bulkUpdateStatus: (bookingIds, status) =>
+    api.post('/bookings/bulk-status', { booking_ids: bookingIds, status }),
+
+  // Single-use ticket for opening the event stream (valid for `expires_in` seconds)
+  createEventsTicket: () => api.post('/bookings/events/ticket'),
+
+  // Server-Sent Events stream of booking changes. Returns an unsubscribe function.
+  // EventSource cannot send headers, so each connection first trades the access
+  // token for a short-lived single-use ticket and puts that in the URL. A used
+  // ticket can't reopen the stream, so instead of letting EventSource retry on
+  // its own we close it on error and reconnect with a new ticket, resuming from
+  // the last event id we saw.
+  subscribeToEvents: (onEvent) => {
+    let source = null;
+    let lastEventId = null;
+    let retryTimer = null;
+    let closed = false;
+
+    const handle = (e) => {
+      if (e.lastEventId) lastEventId = e.lastEventId;
+      onEvent({ type: e.type, data: JSON.parse(e.data || '{}') });
+    };
+
+    const retry = () => {
+      if (!closed) retryTimer = setTimeout(connect, 5000);
+    };
+
+    const connect = async () => {
+      if (!getTokens().accessToken || closed) return;
+      let ticket;
+      try {
+        const { data } = await bookingAPI.createEventsTicket();
+        ticket = data.ticket;
+      } catch {
+        retry();
+        return;
+      }
+      if (closed) return;
+      const params = new URLSearchParams({ ticket });
+      if (lastEventId) params.set('last_event_id', lastEventId);
+      source = new EventSource(`${API_URL}/bookings/events?${params}`);
+      ['booking.created', 'booking.updated', 'booking.changed', 'resync'].forEach((type) =>
+        source.addEventListener(type, handle)
+      );
+      source.onerror = () => {
+        source.close();
+        retry();
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (source) source.close();
+    };
+  },
+};
+
+// Apply a booking event to a list of bookings (as returned by /bookings/my-bookings)
+export const applyBookingEvent = (bookings, { type, data }) => {
+  if (type === 'booking.created') {
+    return bookings.some((b) => b.id === data.id) ? bookings : [data, ...bookings];
+  }
+  if (type === 'booking.updated') {
+    return bookings.map((b) => (b.id === data.id ? { ...b, ...data } : b));
+  }
+  return bookings;
 };
 
 // Review endpoints
 export const reviewAPI = {
-  createReview: (reviewData) => api.post('/reviews', reviewData),
-  getReviewsForMaid: (maidId) => api.get(`/reviews/maid/${maidId}`),
+  createReview: (reviewData, idempotencyKey) =>
+    api.post('/reviews', reviewData, { headers: idempotencyHeaders(idempotencyKey) }),
+  getReviewsForMaid: (maidId, cursor) =>
+    api.get(`/reviews/maid/${maidId}`, { params: cursor ? { cursor } : {} }),
   getReviewsByBooking: (bookingId) => api.get(`/reviews/booking/${bookingId}`),
   checkReviewExists: (bookingId) => api.get(`/reviews/check/${bookingId}`),
+  // Up to 100 booking ids per call
+  checkReviewsBatch: (bookingIds) => api.post('/reviews/check-batch', { booking_ids: bookingIds }),
 };
@@ -25,6 +25,7 @@ export const BookingForm = () => {
   const [submitting, setSubmitting] = useState(false);
   const [error, setError] = useState(null);
   const [success, setSuccess] = useState(false);
+  const [idempotencyKey, setIdempotencyKey] = useState(() => crypto.randomUUID());
 
   useEffect(() => {
     fetchMaidDetails();
@@ -84,10 +85,12 @@ export const BookingForm = () => {
         notes: notes.join('\n'),
       });
 
-      await bookingAPI.createBooking(payload);
+      await bookingAPI.createBooking(payload, idempotencyKey);
       setSuccess(true);
       setTimeout(() => navigate('/bookings'), 2500);
     } catch (err) {
+      // Keep the key only when the request may not have reached the server
+      if (err.response) setIdempotencyKey(crypto.randomUUID());
       setError(err.message || getApiErrorMessage(err));
     } finally {
       setSubmitting(false);
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useAuth } from '../contexts/AuthContext';
-import { bookingAPI, reviewAPI } from '../api/endpoints';
+import { bookingAPI, reviewAPI, applyBookingEvent } from '../api/endpoints';
 import { getApiErrorMessage } from '../utils/payloadValidator';
 import '../styles/BookingsList.css';
 
@@ -18,6 +18,17 @@ export const BookingsList = () => {
     fetchBookings();
   }, [user?.role]);
 
+  // Live status changes pushed by the server instead of refetching the list
+  useEffect(() => {
+    return bookingAPI.subscribeToEvents((event) => {
+      if (event.type === 'resync' || event.type === 'booking.changed') {
+        fetchBookings();
+      } else {
+        setBookings((prev) => applyBookingEvent(prev, event));
+      }
+    });
+  }, [user?.id]);
+
   useEffect(() => {
     applyFilter();
   }, [filter, bookings]);
@@ -39,20 +50,19 @@ export const BookingsList = () => {
 
       setBookings(response.data || []);
 
-      // Check which bookings have reviews (for customers)
+      // Check which bookings have reviews (for customers), 100 per request
       if (user?.role === 'customer' && response.data) {
-        const completedBookings = response.data.filter(b => b.status === 'completed');
+        const completedIds = response.data.filter(b => b.status === 'completed').map(b => b.id);
         const reviewStatus = new Set();
 
-        for (const booking of completedBookings) {
+        for (let i = 0; i < completedIds.length; i += 100) {
           try {
-            const checkRes = await reviewAPI.checkReviewExists(booking.id);
-            // Check if review exists based on response data
-            if (checkRes.data?.exists) {
-              reviewStatus.add(booking.id);
-            }
+            const checkRes = await reviewAPI.checkReviewsBatch(completedIds.slice(i, i + 100));
+            Object.entries(checkRes.data.exists).forEach(([bookingId, exists]) => {
+              if (exists) reviewStatus.add(bookingId);
+            });
           } catch (err) {
-            console.warn(`Error checking review for booking ${booking.id}:`, err);
+            console.warn('Error checking reviews:', err);
           }
         }
 
@@ -83,8 +93,8 @@ export const BookingsList = () => {
       setActionLoading(bookingId);
       // Map frontend status to backend status enum values
       const backendStatus = newStatus === 'confirmed' ? 'accepted' : newStatus === 'cancelled' ? 'canceled' : newStatus;
-      await bookingAPI.updateBookingStatus(bookingId, backendStatus);
-      fetchBookings();
+      const response = await bookingAPI.updateBookingStatus(bookingId, backendStatus);
+      setBookings((prev) => applyBookingEvent(prev, { type: 'booking.updated', data: response.data }));
     } catch (err) {
       const errorMessage = getApiErrorMessage(err);
       setError(errorMessage);
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
-import { maidAPI, bookingAPI, reviewAPI } from '../api/endpoints';
+import { maidAPI, bookingAPI, reviewAPI, applyBookingEvent } from '../api/endpoints';
 import { getApiErrorMessage } from '../utils/payloadValidator';
 import '../styles/Dashboard.css';
 
@@ -23,11 +23,25 @@ export const Dashboard = () => {
     }
   }, [user?.role]);
 
+  // Live status changes pushed by the server instead of refetching the list
+  useEffect(() => {
+    return bookingAPI.subscribeToEvents((event) => {
+      if (event.type === 'resync' || event.type === 'booking.changed') {
+        user?.role === 'maid' ? fetchMaidStats() : fetchCustomerData();
+      } else {
+        setUpcomingBookings((prev) => applyBookingEvent(prev, event));
+      }
+    });
+  }, [user?.id]);
+
   const fetchMaidStats = async () => {
     try {
       setLoading(true);
-      const bookingsRes = await bookingAPI.getMaidBookings();
-      setMaidStats(user);
+      const [bookingsRes, statsRes] = await Promise.all([
+        bookingAPI.getMaidBookings(),
+        maidAPI.getMyStats(),
+      ]);
+      setMaidStats(statsRes.data);
       setUpcomingBookings(bookingsRes.data || []);
     } catch (err) {
       setError('Failed to load dashboard data');
@@ -56,9 +70,9 @@ export const Dashboard = () => {
         decline: 'canceled',
         complete: 'completed'
       };
-      await bookingAPI.updateBookingStatus(bookingId, statusMap[action]);
+      const response = await bookingAPI.updateBookingStatus(bookingId, statusMap[action]);
       setSelectedBooking(null);
-      fetchMaidStats();
+      setUpcomingBookings((prev) => applyBookingEvent(prev, { type: 'booking.updated', data: response.data }));
     } catch (err) {
       alert(getApiErrorMessage(err));
     } finally {
@@ -105,6 +119,10 @@ export const Dashboard = () => {
                   {user.average_rating ? user.average_rating.toFixed(1) : '-'}★
                 </div>
               </div>
+              <div className="stat-card">
+                <h3>Total Earnings</h3>
+                <div className="stat-value">${(maidStats?.total_earnings || 0).toFixed(2)}</div>
+              </div>
               <div className="stat-card">
                 <h3>Hourly Rate</h3>
                 <div className="stat-value">${user.hourly_rate || 0}</div>
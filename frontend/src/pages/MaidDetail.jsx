@@ -7,6 +7,9 @@ export const MaidDetail = () => {
   const { maidId } = useParams();
   const [maid, setMaid] = useState(null);
   const [reviews, setReviews] = useState([]);
+  const [reviewSummary, setReviewSummary] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -22,7 +25,9 @@ export const MaidDetail = () => {
         reviewAPI.getReviewsForMaid(maidId),
       ]);
       setMaid(maidRes.data);
-      setReviews(reviewsRes.data || []);
+      setReviews(reviewsRes.data.items);
+      setReviewSummary(reviewsRes.data.summary);
+      setNextCursor(reviewsRes.data.next_cursor);
     } catch (err) {
       setError('Failed to load profile');
     } finally {
@@ -30,6 +35,19 @@ export const MaidDetail = () => {
     }
   };
 
+  const loadMoreReviews = async () => {
+    try {
+      setLoadingMore(true);
+      const res = await reviewAPI.getReviewsForMaid(maidId, nextCursor);
+      setReviews((prev) => [...prev, ...res.data.items]);
+      setNextCursor(res.data.next_cursor);
+    } catch (err) {
+      console.error('Failed to load more reviews:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const renderStars = (rating) => {
     return Array.from({ length: 5 }, (_, i) => (
       <span key={i} className={`star ${i < Math.round(rating) ? 'filled' : 'empty'}`}>★</span>
@@ -70,7 +88,7 @@ export const MaidDetail = () => {
             <span style={{fontWeight: 700, color: 'var(--slate-900)'}}>
               {maid.average_rating ? maid.average_rating.toFixed(1) : 'New'}
             </span>
-            <span>({reviews.length} reviews)</span>
+            <span>({reviewSummary?.count ?? maid.rating_count ?? reviews.length} reviews)</span>
           </div>
           <div className="meta-item">
             <span>{maid.availability_schedule || 'Flexible Schedule'}</span>
@@ -102,6 +120,24 @@ export const MaidDetail = () => {
 
           <div className="section-card">
             <h2 className="section-title">Client Reviews</h2>
+            {reviewSummary?.count > 0 && (
+              <div style={{marginBottom: '1.5rem'}}>
+                {[5, 4, 3, 2, 1].map((stars) => (
+                  <div key={stars} style={{display: 'flex', alignItems: 'center', gap: '0.5rem', fontSize: '0.85rem'}}>
+                    <span style={{width: '2.5rem'}}>{stars}★</span>
+                    <div style={{flex: 1, height: '0.5rem', background: 'var(--slate-200)', borderRadius: '9999px'}}>
+                      <div style={{
+                        width: `${(100 * reviewSummary.histogram[stars]) / reviewSummary.count}%`,
+                        height: '100%',
+                        background: 'var(--slate-500)',
+                        borderRadius: '9999px',
+                      }} />
+                    </div>
+                    <span style={{width: '2rem', textAlign: 'right'}}>{reviewSummary.histogram[stars]}</span>
+                  </div>
+                ))}
+              </div>
+            )}
             {reviews.length > 0 ? (
               <div className="reviews-list">
                 {reviews.map((review) => (
@@ -116,6 +152,11 @@ export const MaidDetail = () => {
                     <p className="review-text">"{review.comment}"</p>
                   </div>
                 ))}
+                {nextCursor && (
+                  <button className="btn btn-secondary" onClick={loadMoreReviews} disabled={loadingMore}>
+                    {loadingMore ? 'Loading...' : 'Show More Reviews'}
+                  </button>
+                )}
               </div>
             ) : (
               <p style={{color: 'var(--slate-500)', fontStyle: 'italic'}}>No reviews yet for this professional.</p>
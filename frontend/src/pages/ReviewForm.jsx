@@ -16,6 +16,7 @@ export const ReviewForm = () => {
   const [submitting, setSubmitting] = useState(false);
   const [error, setError] = useState(null);
   const [success, setSuccess] = useState(false);
+  const [idempotencyKey, setIdempotencyKey] = useState(() => crypto.randomUUID());
 
   useEffect(() => {
     fetchBookingDetails();
@@ -65,13 +66,15 @@ export const ReviewForm = () => {
       });
 
       console.log('Submitting review:', reviewPayload);
-      const response = await reviewAPI.createReview(reviewPayload);
+      const response = await reviewAPI.createReview(reviewPayload, idempotencyKey);
       console.log('Review created successfully:', response.data);
       setSuccess(true);
       setTimeout(() => {
         navigate('/bookings');
       }, 2000);
     } catch (err) {
+      // Keep the key only when the request may not have reached the server
+      if (err.response) setIdempotencyKey(crypto.randomUUID());
       const errorMessage = err.message || getApiErrorMessage(err);
       setError(errorMessage);
       console.error('Review error:', err);